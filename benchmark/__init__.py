@@ -0,0 +1,3 @@
+"""
+性能基准测试，用生成的数据代替数据库查询结果，不需要连接数据库。
+"""
@@ -0,0 +1,138 @@
+"""
+基准测试的命令行入口，在项目根目录中运行。
+
+例如::
+
+    python -m benchmark pipeline
+    python -m benchmark pipeline --shapes nacos --sizes 10000 100000 1000000 --yaml-depth 5
+    python -m benchmark pipeline --save-baseline
+    python -m benchmark gui --sizes 10000 50000
+    python -m benchmark fetch --latency 0.02 --bandwidth 2000000 --ssh
+
+`pipeline` 测试查询结果处理流程，`gui` 在无窗口模式下测试表格填充、着色、过滤和导出等界面操作，`fetch` 用本地的 MySQL 替身测试连接、查询和取结果，可以模拟网络延迟和带宽。`--save-baseline` 把本次结果写入基准文件。不带这个参数时，与基准文件对比，有阶段耗时或内存增量超过阈值时退出码为 1。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+from benchmark.baseline import load_baseline, save_baseline, compare_with_baseline, Results
+from benchmark.bench_fetch import bench_fetch
+from benchmark.bench_gui import bench_gui
+from benchmark.bench_pipeline import bench_pipeline
+from benchmark.dataset import SHAPES
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_REGRESSION = 1
+EXIT_ERROR = 3
+DEFAULT_BASELINE = 'benchmark/baseline.json'
+# 各测试集的执行函数和测试用例名前缀，前缀用来在同一个基准文件中区分测试集
+SUITES = {
+    'pipeline': (bench_pipeline, ''),
+    'gui': (bench_gui, 'gui-'),
+    'fetch': (bench_fetch, 'fetch-'),
+}
+# 只有部分测试集支持的参数，存在时传给执行函数
+SUITE_OPTIONS = ['latency', 'bandwidth', 'ssh']
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    解析参数，执行基准测试并与基准对比。
+
+    :param argv: 命令行参数，不含程序名。为 None 时读取 sys.argv。
+    :type argv: Optional[List[str]]
+    :rtype: int
+    :return: 退出码。
+    """
+    args = _parse_args(argv)
+    # 只输出警告以上的日志，避免日志影响计时
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(name)s - %(message)s')
+    try:
+        bench, prefix = SUITES[args.suite]
+        suite_options = {name: getattr(args, name) for name in SUITE_OPTIONS if hasattr(args, name)}
+        results: Results = {}
+        for shape in args.shapes:
+            for items in args.sizes:
+                case = f'{prefix}{shape}-{items}'
+                timings, row_count = bench(shape, items, repeat=args.repeat, drift_ratio=args.drift, missing_ratio=args.missing,
+                                           yaml_depth=args.yaml_depth, seed=args.seed, **suite_options)
+                results[case] = timings
+                print(f"{case} ({row_count} rows)")
+                for stage, value in timings.items():
+                    unit = 'MB' if stage.endswith('_mb') else 's'
+                    print(f"  {stage:<24}{value:>10.4f} {unit}")
+
+        if args.save_baseline:
+            if not save_baseline(args.baseline, results):
+                return EXIT_ERROR
+            print(f"Baseline saved to '{args.baseline}'")
+            return EXIT_OK
+
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f"No baseline at '{args.baseline}', run with --save-baseline to create one")
+            return EXIT_OK
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return EXIT_REGRESSION if regressions else EXIT_OK
+    except Exception:
+        logger.exception("Error occurred while running benchmarks")
+        return EXIT_ERROR
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    """
+    解析命令行参数。
+
+    :param argv: 命令行参数。
+    :type argv: Optional[List[str]]
+    :rtype: argparse.Namespace
+    :return: 解析结果。
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmark', description='Run offline benchmarks on generated datasets.')
+    subparsers = parser.add_subparsers(dest='suite', required=True)
+    pipeline = subparsers.add_parser('pipeline', help='format, skip, consistency, table rows, compare and export')
+    gui = subparsers.add_parser('gui', help='table fill, color, filter, comparison dialog and export collection, offscreen')
+    fetch = subparsers.add_parser('fetch', help='connect, query and fetch against a local MySQL stand-in')
+    fetch.add_argument('--latency', type=float, default=0.0,
+                       help='seconds per round trip (default: 0)')
+    fetch.add_argument('--bandwidth', type=float, default=0.0,
+                       help='bytes per second, 0 for unlimited (default: 0)')
+    fetch.add_argument('--ssh', action='store_true',
+                       help='query through the SSH tunnel path')
+    for sub, shapes, sizes, repeat in [(pipeline, SHAPES, [10000, 100000], 3), (gui, ['apollo_id'], [10000, 50000], 2), (fetch, SHAPES, [10000, 100000], 3)]:
+        sub.add_argument('--shapes', nargs='+', choices=SHAPES, default=shapes,
+                         help=f"query result shapes to generate (default: {' '.join(shapes)})")
+        sub.add_argument('--sizes', nargs='+', type=int, default=sizes,
+                         help=f"items per environment (default: {' '.join(map(str, sizes))})")
+        sub.add_argument('--drift', type=float, default=0.1,
+                         help='ratio of values differing from PRO_CONFIG (default: 0.1)')
+        sub.add_argument('--missing', type=float, default=0.05,
+                         help='ratio of items missing from each non-PRO environment (default: 0.05)')
+        sub.add_argument('--yaml-depth', type=int, default=3,
+                         help='nesting depth of generated Nacos YAML (default: 3)')
+        sub.add_argument('--repeat', type=int, default=repeat,
+                         help=f'runs per case, the fastest is kept (default: {repeat})')
+        sub.add_argument('--seed', type=int, default=0,
+                         help='random seed of the generated datasets (default: 0)')
+    for sub in [pipeline, gui, fetch]:
+        sub.add_argument('--baseline', default=DEFAULT_BASELINE,
+                         help=f'baseline file (default: {DEFAULT_BASELINE})')
+        sub.add_argument('--save-baseline', action='store_true',
+                         help='write results to the baseline file instead of comparing')
+        sub.add_argument('--threshold', type=float, default=0.2,
+                         help='allowed increase ratio before a stage counts as a regression (default: 0.2)')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
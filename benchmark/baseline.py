@@ -0,0 +1,109 @@
+"""
+这个模块提供了基准测试结果的保存和对比。
+
+基准文件是一个 JSON 文件，按测试用例保存各阶段的耗时，以及生成基准的机器信息。`compare_with_baseline` 把本次结果与基准逐项对比，超出阈值的阶段视为性能退化。耗时很短的阶段波动比例大，绝对差值低于 `min_seconds` 时不计入退化。名称以 `_mb` 结尾的项是内存增量，单位为 MB，绝对差值低于 `min_megabytes` 时不计入退化。
+
+基准与机器有关，应当在同一台机器上生成和对比。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 基准结果，键为测试用例名，值为各阶段的测量值
+Results = Dict[str, Dict[str, float]]
+
+
+def load_baseline(path: str) -> Optional[Results]:
+    """
+    读取基准文件。
+
+    :param path: 基准文件路径。
+    :type path: str
+    :rtype: Optional[Results]
+    :return: 各测试用例的测量值。文件不存在或读取失败时返回 None。
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)['results']
+    except Exception:
+        logger.exception(f"Failed to read baseline '{path}'")
+        return None
+
+
+def save_baseline(path: str, results: Results) -> bool:
+    """
+    保存基准文件。已有的文件中其他测试用例的结果会保留。
+
+    :param path: 基准文件路径。
+    :type path: str
+    :param results: 各测试用例的测量值。
+    :type results: Results
+    :rtype: bool
+    :return: 保存成功返回 True，否则返回 False。
+    """
+    try:
+        merged = load_baseline(path) or {}
+        merged.update(results)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({
+                'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'results': merged,
+            }, file, ensure_ascii=False, indent=2)
+        return True
+    except Exception:
+        logger.exception(f"Failed to save baseline '{path}'")
+        return False
+
+
+def compare_with_baseline(results: Results,
+                          baseline: Results,
+                          threshold: float,
+                          min_seconds: float = 0.005,
+                          min_megabytes: float = 5.0) -> List[str]:
+    """
+    对比本次结果与基准，列出退化的阶段。基准中没有的测试用例和阶段不参与对比。
+
+    :param results: 本次的测量值。
+    :type results: Results
+    :param baseline: 基准的测量值。
+    :type baseline: Results
+    :param threshold: 允许增加的比例，例如 0.2 表示增加超过 20% 视为退化。
+    :type threshold: float
+    :param min_seconds: 耗时的绝对差值低于此值时不视为退化。
+    :type min_seconds: float
+    :param min_megabytes: 内存增量的绝对差值低于此值时不视为退化。
+    :type min_megabytes: float
+    :rtype: List[str]
+    :return: 退化说明，没有退化时为空列表。
+
+    :example:
+    >>> compare_with_baseline({'apollo_id-10000': {'format': 0.30, 'skip': 0.003}},
+    ...                       {'apollo_id-10000': {'format': 0.20, 'skip': 0.001}}, threshold=0.2)
+    ['apollo_id-10000 format: 0.3000 vs 0.2000 (+50%)']
+    """
+    regressions = []
+    for case, stages in results.items():
+        for stage, value in stages.items():
+            base = baseline.get(case, {}).get(stage)
+            min_delta = min_megabytes if stage.endswith('_mb') else min_seconds
+            if not base or value - base < min_delta:
+                continue
+            if value > base * (1 + threshold):
+                regressions.append(f"{case} {stage}: {value:.4f} vs {base:.4f} ({(value / base - 1) * 100:+.0f}%)")
+    return regressions
@@ -0,0 +1,97 @@
+"""
+这个模块提供了查询路径的基准测试。
+
+主要功能是 `bench_fetch` 函数。它把 `generate_dataset` 生成的数据写入各环境的 SQLite 文件，由 `FakeMySQL` 代替数据库服务器，经过 `get_query_result`、`lib.mysql_query`（或 `lib.mysql_query_with_ssh`）完整执行一次 `execute_queries`，可以设置每次往返的延迟和带宽来模拟远程数据库或 SSH 隧道。分别计时：
+
+- execute_queries：一次完整的查询和处理。
+- tunnel、connect、query、fetch：建立隧道、连接、执行查询和取结果，取自 `metrics` 的阶段耗时，为各环境合计。
+- cached_rerun：带查询缓存再次运行。数据没有变化，各环境只执行数据指纹查询并沿用缓存的查询结果，格式化等步骤照常执行，与监视模式相同。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import os
+import time
+from typing import Dict, Any, Tuple
+
+from benchmark.bench_pipeline import empty_skip_list, shape_config_main
+from benchmark.dataset import generate_dataset
+from benchmark.fake_mysql import FakeMySQL, seed_database
+from lib.run_metrics import metrics
+from module.execute_queries import execute_queries
+
+logger = logging.getLogger(__name__)
+
+# 从 metrics 中取出的阶段
+METRIC_STAGES = ['tunnel', 'connect', 'query', 'fetch']
+
+
+def bench_fetch(shape: str,
+                items: int,
+                repeat: int = 3,
+                latency: float = 0.0,
+                bandwidth: float = 0.0,
+                ssh: bool = False,
+                **dataset_options: Any) -> Tuple[Dict[str, float], int]:
+    """
+    对一种查询结果格式和规模执行查询路径基准测试。
+
+    :param shape: 查询结果格式，'apollo_id'、'apollo_name' 或 'nacos'。
+    :type shape: str
+    :param items: 每个环境的配置项数。
+    :type items: int
+    :param repeat: 重复次数，每个阶段取最短耗时。
+    :type repeat: int
+    :param latency: 每次往返的秒数。
+    :type latency: float
+    :param bandwidth: 每秒传输的字节数，0 表示不限制。
+    :type bandwidth: float
+    :param ssh: 是否经过 SSH 隧道查询。
+    :type ssh: bool
+    :param dataset_options: 传给 `generate_dataset` 的其他参数。
+    :type dataset_options: Any
+    :rtype: Tuple[Dict[str, float], int]
+    :return: 各阶段的耗时秒数，以及结果行数。
+    """
+    dataset = generate_dataset(shape, items, **dataset_options)
+    config_main = shape_config_main(shape)
+    with empty_skip_list() as temp_dir:
+        databases = {}
+        for env_name, rows in dataset.items():
+            databases[env_name] = os.path.join(temp_dir, f'{env_name}.db')
+            seed_database(databases[env_name], shape, rows)
+        config_connection = {env_name: {
+            'mysql_on': True,
+            'ssh_on': ssh,
+            'mysql': {'host': '127.0.0.1', 'port': '3306', 'user': 'bench', 'password': 'bench', 'db': env_name},
+            'ssh': {'hostname': '127.0.0.1', 'port': '22', 'username': 'bench', 'password': 'bench'},
+        } for env_name in dataset}
+
+        timings: Dict[str, float] = {}
+        row_count = 0
+        with FakeMySQL(databases, latency, bandwidth).patch():
+            for _ in range(repeat):
+                run = {}
+                metrics.reset()
+                start = time.perf_counter()
+                formatted_results, _ = execute_queries(config_connection, config_main)
+                run['execute_queries'] = time.perf_counter() - start
+                spans = metrics.summary()['spans']
+                for stage in METRIC_STAGES:
+                    if stage in spans:
+                        run[stage] = spans[stage]['seconds']
+
+                # 第一次带缓存运行填充缓存，第二次只查询数据指纹
+                query_cache: Dict[str, Dict[str, Any]] = {}
+                execute_queries(config_connection, config_main, query_cache)
+                start = time.perf_counter()
+                execute_queries(config_connection, config_main, query_cache)
+                run['cached_rerun'] = time.perf_counter() - start
+
+                for stage, seconds in run.items():
+                    timings[stage] = min(timings.get(stage, seconds), seconds)
+                row_count = len(formatted_results)
+    return timings, row_count
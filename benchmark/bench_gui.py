@@ -0,0 +1,163 @@
+"""
+这个模块提供了界面操作的基准测试。
+
+主要功能是 `bench_gui` 函数。它在 `QT_QPA_PLATFORM=offscreen` 下创建主表格、过滤栏和导出动作，不显示窗口，用 `generate_table_rows` 生成的数据测量最耗时的界面操作：
+
+- add_row：逐行调用 `TableMain.add_row` 填充主表格。
+- color：`TableMain.apply_color_to_table` 整表着色。
+- filter_options：`FilterBar.filter_options_add` 生成服务列表。
+- filter_search：`FilterBar.filter_table` 全局搜索并高亮单元格。
+- reset_styles：`FilterBar._reset_styles` 清除高亮。
+- comparison_dialog：按查重结果创建 `DialogComparison` 并展开所有标签页。
+- export_collect、export_rows：`ActionSave._collect_export_source` 收集可见行，再逐行产生导出数据，不写文件。
+
+每个操作记录耗时，以及操作期间常驻内存的峰值比操作前增加了多少（`<操作>_rss_mb`）。内存由后台线程每隔几毫秒采样一次，很短的峰值可能测不到。耗时取多次中的最短值，内存增量取最大值。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Tuple, Iterator, List
+from unittest import mock
+
+from benchmark.bench_pipeline import generate_table_rows
+from config.settings import DEFAULT_CONFIG_MAIN, DEFAULT_CONFIG_CONNECTION
+from lib.get_process_rss import get_process_rss
+from module.compare_groups import compare_groups
+
+logger = logging.getLogger(__name__)
+
+# 内存采样间隔秒数
+SAMPLE_INTERVAL = 0.005
+MEGABYTE = 1024 * 1024
+# 全局搜索使用的文字，大约匹配十分之一的配置值
+SEARCH_TEXT = 'value-1'
+
+
+def bench_gui(shape: str,
+              items: int,
+              repeat: int = 2,
+              **dataset_options: Any) -> Tuple[Dict[str, float], int]:
+    """
+    对一种查询结果格式和规模执行界面基准测试。
+
+    :param shape: 查询结果格式，'apollo_id'、'apollo_name' 或 'nacos'。
+    :type shape: str
+    :param items: 每个环境的配置项数。
+    :type items: int
+    :param repeat: 重复次数。
+    :type repeat: int
+    :param dataset_options: 传给 `generate_dataset` 的其他参数。
+    :type dataset_options: Any
+    :rtype: Tuple[Dict[str, float], int]
+    :return: 各操作的耗时秒数和内存增量 MB，以及表格行数。
+    """
+    # 必须在创建 QApplication 之前设置
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    from ui.action_save import ActionSave
+    from ui.config_manager import ConfigManager
+    from ui.dialog_comparison import DialogComparison
+    from ui.filter_bar import FilterBar
+    from ui.lang_manager import LangManager
+    from ui.table_main import TableMain
+
+    app = QApplication.instance() or QApplication([])
+    table_rows = generate_table_rows(shape, items, **dataset_options)
+
+    # 使用默认主配置和空的忽略列表，结果不受本机配置影响
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skip_path = os.path.join(temp_dir, 'config_skip.txt')
+        open(skip_path, 'w', encoding='utf-8').close()
+        default_config = (dict(DEFAULT_CONFIG_MAIN), DEFAULT_CONFIG_CONNECTION, DEFAULT_CONFIG_CONNECTION)
+        with mock.patch('ui.config_manager.read_config_all', return_value=default_config), \
+                mock.patch('module.get_lang_dict.read_config_all', return_value=default_config), \
+                mock.patch('ui.config_manager.CONFIG_SKIP_PATH', skip_path):
+            config_manager = ConfigManager()
+            lang_manager = LangManager()
+    table = TableMain(lang_manager, config_manager)
+    filter_bar = FilterBar(lang_manager, config_manager, table)
+    action_save = ActionSave(lang_manager, table)
+
+    results: Dict[str, float] = {}
+
+    def record(name: str, seconds: float, peak_bytes: int) -> None:
+        results[name] = min(results.get(name, seconds), seconds)
+        results[f'{name}_rss_mb'] = max(results.get(f'{name}_rss_mb', 0.0), round(peak_bytes / MEGABYTE, 1))
+
+    for _ in range(repeat):
+        table.clear()
+        filter_bar.filter_value_box.clear()
+        app.processEvents()
+
+        with _measure(record, 'add_row'):
+            table.setUpdatesEnabled(False)
+            for row in table_rows:
+                table.add_row(row)
+            table.setUpdatesEnabled(True)
+        with _measure(record, 'color'):
+            table.apply_color_to_table()
+        with _measure(record, 'filter_options'):
+            filter_bar.filter_options_add()
+
+        filter_bar.filter_value_box.setText(SEARCH_TEXT)
+        with _measure(record, 'filter_search'):
+            filter_bar.filter_table()
+        with _measure(record, 'reset_styles'):
+            filter_bar._reset_styles()
+        filter_bar.filter_value_box.clear()
+        filter_bar.filter_table()
+
+        with _measure(record, 'comparison_dialog'):
+            groups = compare_groups(table.result_store)
+            dialog = DialogComparison(lang_manager, config_manager, table.result_store, groups)
+            for index in range(dialog.tab_widget.count()):
+                dialog._ensure_tab(index)
+        dialog.deleteLater()
+
+        with _measure(record, 'export_collect'):
+            store, row_ids, columns, _, text_mappings = action_save._collect_export_source()
+        with _measure(record, 'export_rows'):
+            for _ in store.iter_rows(row_ids, columns, text_mappings):
+                pass
+        app.processEvents()
+
+    return results, table.rowCount()
+
+
+@contextmanager
+def _measure(record: Any, name: str) -> Iterator[None]:
+    """
+    测量上下文中操作的耗时和常驻内存峰值增量，结果交给 `record`。
+
+    :param record: 接收操作名、秒数和内存增量字节数的函数。
+    :type record: Callable[[str, float, int], None]
+    :param name: 操作名。
+    :type name: str
+    """
+    baseline = get_process_rss()
+    samples: List[int] = [baseline]
+    stop = threading.Event()
+
+    def sample() -> None:
+        while not stop.wait(SAMPLE_INTERVAL):
+            samples.append(get_process_rss())
+
+    sampler = threading.Thread(target=sample, name='RssSampler', daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        stop.set()
+        sampler.join()
+        samples.append(get_process_rss())
+        record(name, seconds, max(samples) - baseline)
@@ -0,0 +1,200 @@
+"""
+这个模块提供了查询结果处理流程的基准测试。
+
+主要功能是 `bench_pipeline` 函数。它用 `generate_dataset` 生成的数据代替 `get_query_result` 的返回值，完整执行一次与开始运行相同的流程，分别计时：
+
+- format：格式化查询结果，`format_query_results`，其中合并结果的耗时另记为 merge。
+- skip、consistency：`update_skip_status` 和 `update_consistency_status`。
+- execute_queries：以上各步骤合计。
+- prepare_table_rows：`StartWork.prepare_table_rows` 合成表格数据。
+- store：把表格数据放入 `ResultStore`，与主表格填充时相同。
+- compare：对比重复配置时的分组，`compare_groups`。
+- export_csv、export_ndjson_gz：`save_data_to_file` 导出全部结果。
+
+前三项直接取自 `metrics` 的阶段耗时，与实际运行的统计口径一致。整个流程重复多次，每个阶段取最短耗时，减少偶然波动的影响。
+
+`offline_queries` 负责替换查询函数和忽略列表，`generate_table_rows` 用它生成插入主表格的数据，供界面基准测试使用。`empty_skip_list` 只替换忽略列表，供查询路径基准测试使用。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Tuple, List, Iterator
+from unittest import mock
+
+from benchmark.dataset import generate_dataset
+from config.lang_dict_all import LANG_DICTS
+from lib.run_metrics import metrics
+from module.compare_groups import compare_groups
+from module.execute_queries import execute_queries
+from module.result_store import ResultStore, COLUMN_KEYS
+from module.save_data_to_file import save_data_to_file
+
+logger = logging.getLogger(__name__)
+
+# 各查询结果格式对应的主要配置
+CONFIG_MAINS = {
+    'apollo_id': {'config_center': 'Apollo', 'apollo_name': 'AppId'},
+    'apollo_name': {'config_center': 'Apollo', 'apollo_name': 'Name'},
+    'nacos': {'config_center': 'Nacos', 'apollo_name': 'AppId'},
+}
+# 从 metrics 中取出的阶段
+METRIC_STAGES = ['format', 'merge', 'skip', 'consistency']
+
+
+def bench_pipeline(shape: str,
+                   items: int,
+                   repeat: int = 3,
+                   **dataset_options: Any) -> Tuple[Dict[str, float], int]:
+    """
+    对一种查询结果格式和规模执行流程基准测试。
+
+    :param shape: 查询结果格式，'apollo_id'、'apollo_name' 或 'nacos'。
+    :type shape: str
+    :param items: 每个环境的配置项数。
+    :type items: int
+    :param repeat: 重复次数，每个阶段取最短耗时。
+    :type repeat: int
+    :param dataset_options: 传给 `generate_dataset` 的其他参数，例如差异比例和 YAML 深度。
+    :type dataset_options: Any
+    :rtype: Tuple[Dict[str, float], int]
+    :return: 各阶段的耗时秒数，以及结果行数。
+    """
+    # PyQt 只在需要合成表格数据时导入
+    from ui.action_start import StartWork
+
+    dataset = generate_dataset(shape, items, **dataset_options)
+    worker = StartWork(LANG_DICTS['English'], None)
+    with offline_queries(dataset) as (config_connection, temp_dir):
+        return _run_pipeline(config_connection, shape_config_main(shape), worker, temp_dir, repeat)
+
+
+def generate_table_rows(shape: str,
+                        items: int,
+                        **dataset_options: Any) -> List[List[List[str]]]:
+    """
+    生成插入主表格的数据，与开始运行时 `table_insert_signal` 发出的数据相同。
+
+    :param shape: 查询结果格式。
+    :type shape: str
+    :param items: 每个环境的配置项数。
+    :type items: int
+    :param dataset_options: 传给 `generate_dataset` 的其他参数。
+    :type dataset_options: Any
+    :rtype: List[List[List[str]]]
+    :return: 表格数据，每行每列为显示文字和用户数据。
+    """
+    from ui.action_start import StartWork
+
+    dataset = generate_dataset(shape, items, **dataset_options)
+    with offline_queries(dataset) as (config_connection, _):
+        formatted_results, _ = execute_queries(config_connection, shape_config_main(shape))
+    return StartWork(LANG_DICTS['English'], None).prepare_table_rows(formatted_results)
+
+
+@contextmanager
+def offline_queries(dataset: Dict[str, Tuple[Tuple[Any, ...], ...]]) -> Iterator[Tuple[Dict[str, Dict[str, Any]], str]]:
+    """
+    在上下文中用生成的数据代替数据库查询，并使用空的忽略列表，结果不受本机配置影响。
+
+    :param dataset: 以环境名为键的查询结果。
+    :type dataset: Dict[str, Tuple[Tuple[Any, ...], ...]]
+    :return: 生成连接配置和临时目录。连接配置中只记录环境名，由替身函数返回对应的数据。
+    """
+    config_connection = {env_name: {'mysql_on': True, 'ssh_on': False, 'mysql': {'db': env_name}} for env_name in dataset}
+    with empty_skip_list() as temp_dir, \
+            mock.patch('module.execute_queries.get_query_result', side_effect=lambda db_config, _: dataset[db_config['mysql']['db']]):
+        yield config_connection, temp_dir
+
+
+@contextmanager
+def empty_skip_list() -> Iterator[str]:
+    """
+    在上下文中让 `update_skip_status` 读取一个空的忽略列表。
+
+    :return: 生成存放忽略列表的临时目录，可以存放其他临时文件。
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        skip_path = os.path.join(temp_dir, 'config_skip.txt')
+        open(skip_path, 'w', encoding='utf-8').close()
+        with mock.patch('module.update_skip_status.CONFIG_SKIP_PATH', skip_path):
+            yield temp_dir
+
+
+def shape_config_main(shape: str) -> Dict[str, str]:
+    """
+    生成查询结果格式对应的主要配置，不修改服务名。
+
+    :param shape: 查询结果格式。
+    :type shape: str
+    :rtype: Dict[str, str]
+    :return: 主要配置。
+    """
+    return dict(CONFIG_MAINS[shape], fix_name_before='', fix_name_after='', fix_name_left='', fix_name_right='')
+
+
+def _run_pipeline(config_connection: Dict[str, Dict[str, Any]],
+                  config_main: Dict[str, str],
+                  worker: Any,
+                  temp_dir: str,
+                  repeat: int) -> Tuple[Dict[str, float], int]:
+    """
+    重复执行流程并计时。
+
+    :param config_connection: 各环境的连接配置。
+    :type config_connection: Dict[str, Dict[str, Any]]
+    :param config_main: 主要配置。
+    :type config_main: Dict[str, str]
+    :param worker: 用来合成表格数据的 `StartWork` 实例。
+    :type worker: Any
+    :param temp_dir: 导出文件所在的临时目录。
+    :type temp_dir: str
+    :param repeat: 重复次数。
+    :type repeat: int
+    :rtype: Tuple[Dict[str, float], int]
+    :return: 各阶段的最短耗时秒数，以及结果行数。
+    """
+    timings: Dict[str, float] = {}
+    row_count = 0
+    for _ in range(repeat):
+        run = {}
+        metrics.reset()
+        start = time.perf_counter()
+        formatted_results, _ = execute_queries(config_connection, config_main)
+        run['execute_queries'] = time.perf_counter() - start
+        spans = metrics.summary()['spans']
+        for stage in METRIC_STAGES:
+            run[stage] = spans.get(stage, {}).get('seconds', 0.0)
+
+        start = time.perf_counter()
+        table_rows = worker.prepare_table_rows(formatted_results)
+        run['prepare_table_rows'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store = ResultStore()
+        for row in table_rows:
+            store.append([user_data for _, user_data in row])
+        run['store'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compare_groups(store)
+        run['compare'] = time.perf_counter() - start
+
+        for stage, file_type, file_name in [('export_csv', 'csv', 'result.csv'), ('export_ndjson_gz', 'ndjson', 'result.ndjson.gz')]:
+            path = os.path.join(temp_dir, file_name)
+            start = time.perf_counter()
+            save_data_to_file(path, file_type, COLUMN_KEYS, store.iter_rows(range(len(store)), COLUMN_KEYS))
+            run[stage] = time.perf_counter() - start
+
+        for stage, seconds in run.items():
+            timings[stage] = min(timings.get(stage, seconds), seconds)
+        row_count = len(store)
+        # 释放本轮结果，避免大数据量时两轮结果同时占用内存
+        del formatted_results, table_rows, store
+    return timings, row_count
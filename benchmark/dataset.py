@@ -0,0 +1,212 @@
+"""
+这个模块提供了基准测试用的合成数据。
+
+主要功能是 `generate_dataset` 函数，它按查询语句的结果格式生成各环境的查询结果，格式与 `SQL_CONFIG_APOLLO_ID`、`SQL_CONFIG_APOLLO_NAME` 和 `SQL_CONFIG_NACOS` 的查询结果相同，可以直接代替 `get_query_result` 的返回值。
+
+数据的规模和形状都可以调整：
+
+- 配置项数：Apollo 是 Item 表的行数，Nacos 是 YAML 打平后的配置键数。
+- 差异比例：每个环境中，配置值与生产环境不同的配置项所占比例。
+- 缺失比例：每个非生产环境中，缺少的配置项（Nacos 为整个配置文件）所占比例。
+- YAML 深度：Nacos 配置键的层数。
+
+相同的参数和随机种子总是生成相同的数据，不同机器上的测试结果可以相互比较。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import datetime
+import random
+from typing import Dict, List, Tuple, Any
+
+# 生成的环境，第一个环境是对比的基准
+ENV_NAMES = ['PRO_CONFIG', 'PRE_CONFIG', 'TEST_CONFIG', 'DEV_CONFIG']
+# 支持的查询结果格式
+SHAPES = ['apollo_id', 'apollo_name', 'nacos']
+# 每个服务的配置项数
+ITEMS_PER_APP = 200
+NAMESPACES = ['application', 'datasource', 'redis', 'mq']
+KEY_PREFIXES = ['spring', 'server', 'logging', 'feign', 'management', 'custom']
+BASE_TIME = datetime.datetime(2023, 1, 1)
+
+
+def generate_dataset(shape: str,
+                     items: int,
+                     drift_ratio: float = 0.1,
+                     missing_ratio: float = 0.05,
+                     yaml_depth: int = 3,
+                     keys_per_file: int = 50,
+                     seed: int = 0) -> Dict[str, Tuple[Tuple[Any, ...], ...]]:
+    """
+    生成各环境的查询结果。
+
+    :param shape: 查询结果格式，'apollo_id'、'apollo_name' 或 'nacos'。
+    :type shape: str
+    :param items: 每个环境的配置项数。
+    :type items: int
+    :param drift_ratio: 配置值与生产环境不同的比例。
+    :type drift_ratio: float
+    :param missing_ratio: 非生产环境缺少配置的比例。
+    :type missing_ratio: float
+    :param yaml_depth: Nacos 配置键的层数，至少为 1。
+    :type yaml_depth: int
+    :param keys_per_file: 每个 Nacos 配置文件的配置键数。
+    :type keys_per_file: int
+    :param seed: 随机种子。
+    :type seed: int
+    :rtype: Dict[str, Tuple[Tuple[Any, ...], ...]]
+    :return: 以环境名为键，值为查询结果。
+    :raise ValueError: 查询结果格式不受支持。
+
+    :example:
+    >>> dataset = generate_dataset('apollo_id', 1000, drift_ratio=0.2, seed=1)
+    >>> sorted(dataset) == sorted(ENV_NAMES), len(dataset['PRO_CONFIG'])
+    (True, 1000)
+    >>> dataset['PRO_CONFIG'][0][:3]
+    ('service-00000', 'application', 'spring.k0.name')
+    >>> nacos = generate_dataset('nacos', 100, yaml_depth=3, keys_per_file=50)
+    >>> len(nacos['PRO_CONFIG']), nacos['PRO_CONFIG'][0][2].splitlines()[:3]
+    (2, ['spring:', '  s0:', '    key0: value-0-0'])
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unsupported shape: {shape}")
+    rng = random.Random(seed)
+    if shape == 'nacos':
+        return _generate_nacos(rng, items, drift_ratio, missing_ratio, max(yaml_depth, 1), keys_per_file)
+    return _generate_apollo(rng, items, drift_ratio, missing_ratio, use_name=shape == 'apollo_name')
+
+
+def _generate_apollo(rng: random.Random,
+                     items: int,
+                     drift_ratio: float,
+                     missing_ratio: float,
+                     use_name: bool) -> Dict[str, Tuple[Tuple[Any, ...], ...]]:
+    """
+    生成 Apollo 的查询结果，每行为服务、命名空间、配置键、配置值和修改时间。
+
+    :param rng: 随机数生成器。
+    :type rng: random.Random
+    :param items: 配置项数。
+    :type items: int
+    :param drift_ratio: 配置值与生产环境不同的比例。
+    :type drift_ratio: float
+    :param missing_ratio: 非生产环境缺少配置的比例。
+    :type missing_ratio: float
+    :param use_name: 第一列是否为服务名称，否则为服务编号。
+    :type use_name: bool
+    :rtype: Dict[str, Tuple[Tuple[Any, ...], ...]]
+    :return: 以环境名为键，值为查询结果。
+    """
+    rows: Dict[str, List[Tuple[Any, ...]]] = {env_name: [] for env_name in ENV_NAMES}
+    for i in range(items):
+        app_index, offset = divmod(i, ITEMS_PER_APP)
+        app = f'Service {app_index:05d}' if use_name else f'service-{app_index:05d}'
+        namespace = NAMESPACES[offset % len(NAMESPACES)]
+        key = f'{KEY_PREFIXES[offset % len(KEY_PREFIXES)]}.k{offset}.name'
+        value = f'value-{i}'
+        modified_time = BASE_TIME + datetime.timedelta(seconds=rng.randrange(86400 * 365))
+        for env_index, env_name in enumerate(ENV_NAMES):
+            if env_index and rng.random() < missing_ratio:
+                continue
+            env_value = f'{value}-{env_name}' if env_index and rng.random() < drift_ratio else value
+            rows[env_name].append((app, namespace, key, env_value, modified_time))
+    return {env_name: tuple(env_rows) for env_name, env_rows in rows.items()}
+
+
+def _generate_nacos(rng: random.Random,
+                    items: int,
+                    drift_ratio: float,
+                    missing_ratio: float,
+                    yaml_depth: int,
+                    keys_per_file: int) -> Dict[str, Tuple[Tuple[Any, ...], ...]]:
+    """
+    生成 Nacos 的查询结果，每行为配置编号、分组、YAML 内容和修改时间。
+
+    :param rng: 随机数生成器。
+    :type rng: random.Random
+    :param items: 打平后的配置键数。
+    :type items: int
+    :param drift_ratio: 配置值与生产环境不同的比例。
+    :type drift_ratio: float
+    :param missing_ratio: 非生产环境缺少配置文件的比例。
+    :type missing_ratio: float
+    :param yaml_depth: 配置键的层数。
+    :type yaml_depth: int
+    :param keys_per_file: 每个配置文件的配置键数。
+    :type keys_per_file: int
+    :rtype: Dict[str, Tuple[Tuple[Any, ...], ...]]
+    :return: 以环境名为键，值为查询结果。
+    """
+    rows: Dict[str, List[Tuple[Any, ...]]] = {env_name: [] for env_name in ENV_NAMES}
+    for file_index, start in enumerate(range(0, items, keys_per_file)):
+        key_count = min(keys_per_file, items - start)
+        data_id = f'service-{file_index:05d}.yaml'
+        group_id = 'DEFAULT_GROUP'
+        modified_time = BASE_TIME + datetime.timedelta(seconds=rng.randrange(86400 * 365))
+        for env_index, env_name in enumerate(ENV_NAMES):
+            if env_index and rng.random() < missing_ratio:
+                continue
+            values = [f'value-{file_index}-{k}-{env_name}' if env_index and rng.random() < drift_ratio else f'value-{file_index}-{k}'
+                      for k in range(key_count)]
+            rows[env_name].append((data_id, group_id, _build_yaml(values, yaml_depth), modified_time))
+    return {env_name: tuple(env_rows) for env_name, env_rows in rows.items()}
+
+
+def _build_yaml(values: List[str], depth: int) -> str:
+    """
+    生成嵌套的 YAML 文本。第 k 个值的配置键由 k 决定，不同环境的同一个 k 对应同一个配置键。
+
+    :param values: 各配置键的值。
+    :type values: List[str]
+    :param depth: 配置键的层数。
+    :type depth: int
+    :rtype: str
+    :return: YAML 文本。
+
+    :example:
+    >>> print(_build_yaml(['a', 'b', 'c'], 2))
+    spring:
+      key0: a
+    server:
+      key1: b
+    logging:
+      key2: c
+    <BLANKLINE>
+    """
+    # 按路径分组，同一父节点下的键写在一起
+    tree: Dict[str, Any] = {}
+    for k, value in enumerate(values):
+        # 第一层是常见前缀，中间各层按 k 分成三支，最后一层是配置键
+        path = [KEY_PREFIXES[k % len(KEY_PREFIXES)]] + [f's{(k // 3 ** level) % 3}' for level in range(depth - 2)] if depth > 1 else []
+        node = tree
+        for segment in path:
+            node = node.setdefault(segment, {})
+        node[f'key{k}'] = value
+    lines: List[str] = []
+    _emit_yaml(tree, 0, lines)
+    return '\n'.join(lines) + '\n'
+
+
+def _emit_yaml(node: Dict[str, Any],
+               indent: int,
+               lines: List[str]) -> None:
+    """
+    把嵌套字典写成 YAML 行。值都是不需要加引号的简单字符串。
+
+    :param node: 嵌套字典。
+    :type node: Dict[str, Any]
+    :param indent: 当前缩进空格数。
+    :type indent: int
+    :param lines: 输出的行列表，就地追加。
+    :type lines: List[str]
+    :rtype: None
+    :return: 无返回值。
+    """
+    for key, value in node.items():
+        if isinstance(value, dict):
+            lines.append(f"{' ' * indent}{key}:")
+            _emit_yaml(value, indent + 2, lines)
+        else:
+            lines.append(f"{' ' * indent}{key}: {value}")
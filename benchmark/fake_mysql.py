@@ -0,0 +1,334 @@
+"""
+这个模块提供了一个本地的 MySQL 替身，用来在没有数据库和网络的机器上测量查询路径。
+
+`seed_database` 把 `generate_dataset` 生成的查询结果写入 SQLite 文件，表结构按 Apollo 的 `App`、`Namespace`、`Item` 表和 Nacos 的 `config_info` 表建立，只包含查询语句用到的字段。`SQL_CONFIG_*` 和 `SQL_FINGERPRINT_*` 查询语句可以原样在这些表上执行。
+
+`FakeMySQL` 按连接配置中的 `db` 把查询转给对应的 SQLite 文件。`patch` 上下文中，`lib.mysql_query` 使用的 `pymysql`，以及 `lib.mysql_query_with_ssh` 使用的 `paramiko` 和 `sshtunnel` 都被替换，调用方代码不需要任何修改，`metrics` 记录的 tunnel、connect、query、fetch 阶段也与真实查询一致。
+
+网络条件用两个参数模拟：
+
+- latency：每次往返的秒数。建立连接计 3 次往返，建立 SSH 隧道计 4 次，执行查询计 1 次。
+- bandwidth：每秒传输的字节数，0 表示不限制。取结果时按结果的文本长度等待相应时间。
+
+等待使用 `time.sleep`，不占用 CPU，也不持有 GIL，多个线程同时查询时的表现与真实网络相近。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import datetime
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Dict, Tuple, Any, Iterator, Optional, Sequence, List
+from unittest import mock
+
+logger = logging.getLogger(__name__)
+
+# 建立连接和隧道的往返次数
+CONNECT_ROUND_TRIPS = 3
+TUNNEL_ROUND_TRIPS = 4
+# 表结构，时间字段声明为 DATETIME，读取时转换为 datetime，与 pymysql 一致
+APOLLO_SCHEMA = """
+CREATE TABLE App (Id INTEGER PRIMARY KEY, AppId TEXT, Name TEXT, DataChange_LastTime DATETIME);
+CREATE TABLE Namespace (Id INTEGER PRIMARY KEY, AppId TEXT, NamespaceName TEXT, DataChange_LastTime DATETIME);
+CREATE TABLE Item (Id INTEGER PRIMARY KEY, NamespaceId INTEGER, `Key` TEXT, `Value` TEXT, IsDeleted INTEGER, DataChange_LastTime DATETIME);
+"""
+NACOS_SCHEMA = """
+CREATE TABLE config_info (id INTEGER PRIMARY KEY, data_id TEXT, group_id TEXT, content TEXT, gmt_modified DATETIME);
+"""
+
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(' '))
+sqlite3.register_converter('DATETIME', lambda value: datetime.datetime.fromisoformat(value.decode()))
+
+
+def seed_database(path: str,
+                  shape: str,
+                  rows: Sequence[Tuple[Any, ...]],
+                  deleted_ratio: float = 0.05) -> None:
+    """
+    把一个环境的查询结果写入 SQLite 文件，已有的表会被覆盖。
+
+    :param path: SQLite 文件路径。
+    :type path: str
+    :param shape: 查询结果格式，'apollo_id'、'apollo_name' 或 'nacos'。
+    :type shape: str
+    :param rows: `generate_dataset` 生成的一个环境的查询结果。
+    :type rows: Sequence[Tuple[Any, ...]]
+    :param deleted_ratio: Apollo 中额外写入的已删除配置项比例，查询时会被过滤掉。
+    :type deleted_ratio: float
+    :rtype: None
+
+    :example:
+    >>> import os, tempfile
+    >>> from benchmark.dataset import generate_dataset
+    >>> from config.settings import SQL_CONFIG_APOLLO_NAME
+    >>> from lib.mysql_query import mysql_query
+    >>> rows = generate_dataset('apollo_name', 100)['PRO_CONFIG']
+    >>> mysql_config = {'host': '127.0.0.1', 'port': '3306', 'user': 'bench', 'password': 'bench', 'db': 'pro'}
+    >>> with tempfile.TemporaryDirectory() as temp_dir:
+    ...     seed_database(os.path.join(temp_dir, 'pro.db'), 'apollo_name', rows)
+    ...     with FakeMySQL({'pro': os.path.join(temp_dir, 'pro.db')}).patch():
+    ...         result = mysql_query(mysql_config, SQL_CONFIG_APOLLO_NAME)
+    >>> sorted(result) == sorted(rows)
+    True
+    """
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            tables = ['App', 'Namespace', 'Item'] if shape != 'nacos' else ['config_info']
+            conn.executescript(''.join(f'DROP TABLE IF EXISTS {table};' for table in tables))
+            if shape == 'nacos':
+                conn.executescript(NACOS_SCHEMA)
+                conn.executemany("INSERT INTO config_info (data_id, group_id, content, gmt_modified) VALUES (?, ?, ?, ?)", rows)
+                return
+            conn.executescript(APOLLO_SCHEMA)
+            app_ids: Dict[str, str] = {}
+            namespace_ids: Dict[Tuple[str, str], int] = {}
+            items: List[Tuple[Any, ...]] = []
+            deleted_every = int(1 / deleted_ratio) if deleted_ratio > 0 else 0
+            for index, (app, namespace, key, value, modified_time) in enumerate(rows):
+                # 按名称查询时第一列是服务名称，另外生成服务编号
+                app_id = app_ids.setdefault(app, app if shape == 'apollo_id' else f'app-{len(app_ids):05d}')
+                namespace_id = namespace_ids.setdefault((app_id, namespace), len(namespace_ids) + 1)
+                items.append((namespace_id, key, value, 0, modified_time))
+                if deleted_every and index % deleted_every == 0:
+                    items.append((namespace_id, key, f'{value}-deleted', 1, modified_time))
+            conn.executemany("INSERT INTO App (AppId, Name, DataChange_LastTime) VALUES (?, ?, ?)",
+                             [(app_id, app, None) for app, app_id in app_ids.items()])
+            conn.executemany("INSERT INTO Namespace (Id, AppId, NamespaceName, DataChange_LastTime) VALUES (?, ?, ?, ?)",
+                             [(namespace_id, app_id, namespace, None) for (app_id, namespace), namespace_id in namespace_ids.items()])
+            conn.executemany("INSERT INTO Item (NamespaceId, `Key`, `Value`, IsDeleted, DataChange_LastTime) VALUES (?, ?, ?, ?, ?)", items)
+    finally:
+        conn.close()
+
+
+class FakeMySQL:
+    """
+    用 SQLite 文件模拟的 MySQL 服务器。
+
+    :param databases: 数据库名到 SQLite 文件路径的映射。
+    :type databases: Dict[str, str]
+    :param latency: 每次往返的秒数。
+    :type latency: float
+    :param bandwidth: 每秒传输的字节数，0 表示不限制。
+    :type bandwidth: float
+    """
+
+    def __init__(self,
+                 databases: Dict[str, str],
+                 latency: float = 0.0,
+                 bandwidth: float = 0.0):
+        self.databases = databases
+        self.latency = latency
+        self.bandwidth = bandwidth
+
+    def connect(self, db: Optional[str] = None, database: Optional[str] = None, **_: Any) -> '_FakeConnection':
+        """
+        打开一个连接，参数与 `pymysql.connect` 相同，只使用数据库名。
+
+        :param db: 数据库名。
+        :type db: Optional[str]
+        :param database: 数据库名，`db` 的别名。
+        :type database: Optional[str]
+        :rtype: _FakeConnection
+        :return: 连接对象。
+        :raise sqlite3.OperationalError: 数据库不存在。
+        """
+        name = db or database
+        if name not in self.databases:
+            raise sqlite3.OperationalError(f"Unknown database '{name}'")
+        self.wait(CONNECT_ROUND_TRIPS)
+        conn = sqlite3.connect(self.databases[name], detect_types=sqlite3.PARSE_DECLTYPES)
+        conn.create_function('VERSION', 0, lambda: '8.0.0-fake')
+        return _FakeConnection(self, conn)
+
+    def wait(self, round_trips: int = 1, size: int = 0) -> None:
+        """
+        按往返次数和传输字节数等待。
+
+        :param round_trips: 往返次数。
+        :type round_trips: int
+        :param size: 传输的字节数。
+        :type size: int
+        :rtype: None
+        """
+        seconds = self.latency * round_trips + (size / self.bandwidth if self.bandwidth else 0.0)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    @contextmanager
+    def patch(self) -> Iterator['FakeMySQL']:
+        """
+        在上下文中把 `lib.mysql_query` 和 `lib.mysql_query_with_ssh` 的数据库和 SSH 依赖替换为本对象。
+
+        :return: 生成本对象。
+        """
+        server = self
+
+        class FakeSSHClient:
+            """`paramiko.SSHClient` 的替身，连接时等待 SSH 握手的往返。"""
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *_):
+                return None
+
+            def load_system_host_keys(self):
+                pass
+
+            def set_missing_host_key_policy(self, _):
+                pass
+
+            def connect(self, **_):
+                server.wait(TUNNEL_ROUND_TRIPS)
+
+        @contextmanager
+        def open_tunnel(*_, **__):
+            # 打开转发通道需要一次往返
+            server.wait()
+            yield SimpleNamespace(local_bind_port=3306)
+
+        with mock.patch('lib.mysql_query.pymysql', SimpleNamespace(connect=self.connect, cursors=SimpleNamespace(SSCursor=None))), \
+                mock.patch('lib.mysql_query_with_ssh.paramiko', SimpleNamespace(SSHClient=FakeSSHClient, AutoAddPolicy=lambda: None)), \
+                mock.patch('lib.mysql_query_with_ssh.sshtunnel', SimpleNamespace(open_tunnel=open_tunnel)):
+            yield self
+
+
+class _FakeConnection:
+    """
+    `FakeMySQL.connect` 返回的连接，支持 `with` 语句和 `cursor` 方法。
+
+    :param server: 所属的替身服务器。
+    :type server: FakeMySQL
+    :param conn: SQLite 连接。
+    :type conn: sqlite3.Connection
+    """
+
+    def __init__(self, server: FakeMySQL, conn: sqlite3.Connection):
+        self.server = server
+        self.conn = conn
+
+    def __enter__(self) -> '_FakeConnection':
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def cursor(self, *_: Any) -> '_FakeCursor':
+        """
+        创建游标。参数与 `pymysql` 兼容，全部忽略。
+
+        :rtype: _FakeCursor
+        :return: 游标对象。
+        """
+        return _FakeCursor(self.server, self.conn.cursor())
+
+    def close(self) -> None:
+        """
+        关闭连接。
+
+        :rtype: None
+        """
+        self.conn.close()
+
+
+class _FakeCursor:
+    """
+    `_FakeConnection.cursor` 返回的游标。执行查询时等待一次往返，取结果时按结果大小等待传输时间。
+
+    :param server: 所属的替身服务器。
+    :type server: FakeMySQL
+    :param cursor: SQLite 游标。
+    :type cursor: sqlite3.Cursor
+    """
+
+    def __init__(self, server: FakeMySQL, cursor: sqlite3.Cursor):
+        self.server = server
+        self.cursor = cursor
+
+    def __enter__(self) -> '_FakeCursor':
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        return iter(self.fetchone, None)
+
+    def execute(self, query: str, args: Optional[Sequence[Any]] = None) -> int:
+        """
+        执行查询。MySQL 的 `%s` 占位符会转换为 SQLite 的 `?`。
+
+        :param query: 查询语句。
+        :type query: str
+        :param args: 查询参数。
+        :type args: Optional[Sequence[Any]]
+        :rtype: int
+        :return: 受影响的行数，查询语句为 -1。
+        """
+        self.server.wait()
+        if args is None:
+            self.cursor.execute(query)
+        else:
+            self.cursor.execute(query.replace('%s', '?'), args)
+        return self.cursor.rowcount
+
+    def fetchone(self) -> Optional[Tuple[Any, ...]]:
+        """
+        取一行结果。
+
+        :rtype: Optional[Tuple[Any, ...]]
+        :return: 一行结果，没有更多结果时返回 None。
+        """
+        row = self.cursor.fetchone()
+        if row is not None:
+            self._transfer([row])
+        return row
+
+    def fetchmany(self, size: int = 1) -> Tuple[Tuple[Any, ...], ...]:
+        """
+        取多行结果。
+
+        :param size: 最多取的行数。
+        :type size: int
+        :rtype: Tuple[Tuple[Any, ...], ...]
+        :return: 结果行。
+        """
+        rows = tuple(self.cursor.fetchmany(size))
+        self._transfer(rows)
+        return rows
+
+    def fetchall(self) -> Tuple[Tuple[Any, ...], ...]:
+        """
+        取剩余的全部结果，返回类型与 `pymysql` 一致。
+
+        :rtype: Tuple[Tuple[Any, ...], ...]
+        :return: 结果行。
+        """
+        rows = tuple(self.cursor.fetchall())
+        self._transfer(rows)
+        return rows
+
+    def close(self) -> None:
+        """
+        关闭游标。
+
+        :rtype: None
+        """
+        self.cursor.close()
+
+    def _transfer(self, rows: Sequence[Tuple[Any, ...]]) -> None:
+        """
+        按结果的文本长度等待传输时间。不限制带宽时不计算长度。
+
+        :param rows: 结果行。
+        :type rows: Sequence[Tuple[Any, ...]]
+        :rtype: None
+        """
+        if self.server.bandwidth:
+            self.server.wait(0, sum(len(str(value)) for row in rows for value in row))
@@ -12,17 +12,24 @@ LANG_DICTS = {
         'ui.action_exit_1': 'Quit',
         'ui.action_exit_2': 'Quit the application',
         'ui.action_debug_1': 'Debug',
-        'ui.action_debug_2': 'Debugging in progress...',
+        'ui.action_debug_2': 'Profile the next run or filter operation',
         'ui.action_compare_1': 'Compare',
         'ui.action_compare_2': 'Find duplicate configurations within the same environment',
         'ui.action_compare_3': 'Value',
         'ui.action_compare_4': 'Please run data retrieval first',
+        'ui.action_compare_5': 'Comparing...',
+        'ui.action_compare_6': 'duplicate groups found',
+        'ui.action_compare_7': 'Find Similar',
+        'ui.action_compare_8': 'Find near-duplicate values shared across apps',
+        'ui.action_compare_9': 'similar groups found',
         'ui.action_save_1': 'Export',
         'ui.action_save_2': 'Export table data to file',
         'ui.action_save_3': 'Choose a file to save',
         'ui.action_save_5': 'File saved successfully.',
         'ui.action_save_7': 'Failed to save file.',
         'ui.action_save_8': 'Failed to extract data from the table.',
+        'ui.action_save_9': 'Exporting...',
+        'ui.action_save_10': 'Export cancelled.',
         'ui.action_update_1': 'Check Updates',
         'ui.action_update_2': 'Check for Updates Online',
         'ui.action_update_3': 'Failed to Check for Updates!',
@@ -71,6 +78,7 @@ LANG_DICTS = {
         'ui.action_start_11': 'No',
         'ui.action_start_12': 'Yes',
         'ui.action_start_13': 'Unknown',
+        'ui.action_start_14': 'Showing result saved at {}, querying database in background...',
         'ui.table_main_1': 'Name',
         'ui.table_main_2': 'Group',
         'ui.table_main_3': 'Key',
@@ -88,18 +96,42 @@ LANG_DICTS = {
         'ui.filter_bar_9': 'Search',
         'ui.filter_bar_10': 'Reset',
         'ui.filter_bar_11': 'Entries',
+        'ui.status_bar_1': 'Last run {:.2f} s',
+        'ui.status_bar_2': 'Memory {:.0f} MB, CPU {:.0f}%',
+        'ui.status_bar_3': '{} {:.0f} rows/s',
+        'ui.status_bar_4': 'peak memory {:.0f} MB',
+        'ui.status_bar_5': 'Memory usage is high, consider narrowing the query or closing other programs',
         'ui.dialog_logs_1': 'View Logs',
         'ui.dialog_logs_2': 'Log Level:',
         'ui.dialog_logs_4': 'Feedback',
         'ui.dialog_logs_5': 'Clear',
         'ui.dialog_logs_6': 'Close',
         'ui.dialog_logs_7': 'Refresh',
+        'ui.dialog_profile_1': 'Profiler',
+        'ui.dialog_profile_2': 'Function time (cProfile)',
+        'ui.dialog_profile_3': 'Memory allocations (tracemalloc)',
+        'ui.dialog_profile_4': 'Profile Next Run',
+        'ui.dialog_profile_5': 'Waiting for the next Start or filter operation...',
+        'ui.dialog_profile_6': 'Profiled {} in {:.2f} s',
+        'ui.dialog_profile_7': 'Top Functions',
+        'ui.dialog_profile_8': 'Top Allocations',
+        'ui.dialog_profile_9': 'Function',
+        'ui.dialog_profile_10': 'Calls',
+        'ui.dialog_profile_11': 'Own Time (s)',
+        'ui.dialog_profile_12': 'Cumulative (s)',
+        'ui.dialog_profile_13': 'Location',
+        'ui.dialog_profile_14': 'Size (KiB)',
+        'ui.dialog_profile_15': 'Blocks',
+        'ui.dialog_profile_16': 'Export .pstats',
+        'ui.dialog_profile_17': 'Close',
+        'ui.dialog_profile_18': 'Profile stats exported',
         'ui.dialog_comparison_1': 'Comparison Results',
         'ui.dialog_comparison_2': 'Public Namespace:',
         'ui.dialog_comparison_3': 'Set',
         'ui.dialog_comparison_4': 'Search Configuration:',
         'ui.dialog_comparison_5': 'Public namespaces styled red to highlight global properties',
         'ui.dialog_comparison_6': 'Search configuration keys and values',
+        'ui.dialog_comparison_7': 'Similar Values',
         'ui.dialog_settings_main_1': 'Settings',
         'ui.dialog_settings_main_2': 'Select Language:',
         'ui.dialog_settings_main_3': 'Select Configuration Center Type:',
@@ -169,17 +201,24 @@ LANG_DICTS = {
         'ui.action_exit_1': '退出程序',
         'ui.action_exit_2': '立即退出程序',
         'ui.action_debug_1': '调试程序',
-        'ui.action_debug_2': '调试程序...',
+        'ui.action_debug_2': '分析下一次运行或过滤的耗时和内存',
         'ui.action_compare_1': '配置查重',
         'ui.action_compare_2': '查找相同环境内重复配置',
         'ui.action_compare_3': '值',
         'ui.action_compare_4': '请先运行获取数据',
+        'ui.action_compare_5': '查重中...',
+        'ui.action_compare_6': '组重复配置',
+        'ui.action_compare_7': '相似配置',
+        'ui.action_compare_8': '查找不同服务间相近的配置值',
+        'ui.action_compare_9': '组相似配置',
         'ui.action_save_1': '导出列表',
         'ui.action_save_2': '导出当前列表到文件',
         'ui.action_save_3': '保存到文件',
         'ui.action_save_5': '文件保存成功',
         'ui.action_save_7': '文件保存失败。',
         'ui.action_save_8': '获取表格数据失败。',
+        'ui.action_save_9': '导出中...',
+        'ui.action_save_10': '导出已取消。',
         'ui.action_update_1': '检查更新',
         'ui.action_update_2': '在线检查更新',
         'ui.action_update_3': '检查更新失败！',
@@ -228,6 +267,7 @@ LANG_DICTS = {
         'ui.action_start_11': '否',
         'ui.action_start_12': '是',
         'ui.action_start_13': '未知状态',
+        'ui.action_start_14': '正在显示 {} 保存的结果，后台查询数据库中...',
         'ui.table_main_1': '服务',
         'ui.table_main_2': '分组',
         'ui.table_main_3': '配置键',
@@ -245,18 +285,42 @@ LANG_DICTS = {
         'ui.filter_bar_9': '搜索',
         'ui.filter_bar_10': '重置',
         'ui.filter_bar_11': '条配置',
+        'ui.status_bar_1': '上次运行 {:.2f} 秒',
+        'ui.status_bar_2': '内存 {:.0f} MB，CPU {:.0f}%',
+        'ui.status_bar_3': '{} {:.0f} 行/秒',
+        'ui.status_bar_4': '内存峰值 {:.0f} MB',
+        'ui.status_bar_5': '内存占用过高，可以缩小查询范围或关闭其他程序',
         'ui.dialog_logs_1': '查看日志',
         'ui.dialog_logs_2': '日志等级：',
         'ui.dialog_logs_4': '提交反馈',
         'ui.dialog_logs_5': '清空',
         'ui.dialog_logs_6': '关闭',
         'ui.dialog_logs_7': '刷新',
+        'ui.dialog_profile_1': '性能分析',
+        'ui.dialog_profile_2': '函数耗时（cProfile）',
+        'ui.dialog_profile_3': '内存分配（tracemalloc）',
+        'ui.dialog_profile_4': '分析下一次运行',
+        'ui.dialog_profile_5': '等待下一次开始运行或过滤...',
+        'ui.dialog_profile_6': '已分析 {}，用时 {:.2f} 秒',
+        'ui.dialog_profile_7': '耗时函数',
+        'ui.dialog_profile_8': '内存分配',
+        'ui.dialog_profile_9': '函数',
+        'ui.dialog_profile_10': '调用次数',
+        'ui.dialog_profile_11': '自身耗时（秒）',
+        'ui.dialog_profile_12': '累计耗时（秒）',
+        'ui.dialog_profile_13': '位置',
+        'ui.dialog_profile_14': '新增内存（KiB）',
+        'ui.dialog_profile_15': '新增块数',
+        'ui.dialog_profile_16': '导出 .pstats',
+        'ui.dialog_profile_17': '关闭',
+        'ui.dialog_profile_18': '性能分析结果已导出',
         'ui.dialog_comparison_1': '配置环境比较结果',
         'ui.dialog_comparison_2': '公共配置：',
         'ui.dialog_comparison_3': '设置',
         'ui.dialog_comparison_4': '搜索配置：',
         'ui.dialog_comparison_5': '设置公共配置字体为红色，以方便查看',
         'ui.dialog_comparison_6': '搜索配置键和值',
+        'ui.dialog_comparison_7': '相似配置查找结果',
         'ui.dialog_settings_main_1': '设置页面',
         'ui.dialog_settings_main_2': '选择语言：',
         'ui.dialog_settings_main_3': '选择配置中心类型：',
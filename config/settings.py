@@ -7,6 +7,15 @@ CONFIG_APOLLO_PATH = r'config/config_apollo.json'
 CONFIG_NACOS_PATH = r'config/config_nacos.json'
 CONFIG_SKIP_PATH = r'config/config_skip.txt'
 LOG_PATH = 'logs/run.log'
+HISTORY_PATH = 'logs/history.sqlite3'
+SNAPSHOT_PATH = 'logs/last_result.snapshot'
+METRICS_PATH = 'logs/run_metrics.json'
+TRACE_PATH = 'logs/trace.json'
+# 性能分析对话框中列出的函数和内存分配位置数
+PROFILE_TOP = 50
+# 运行期间状态栏采样内存和 CPU 占用的间隔毫秒数，以及内存占用的警告阈值 MB
+RESOURCE_SAMPLE_INTERVAL = 500
+RESOURCE_RSS_WARNING_MB = 2048
 # 程序信息
 PROGRAM_NAME = 'ConfigCenterComparer'
 VERSION_INFO = 'v1.1.0'
@@ -144,6 +153,20 @@ SELECT
 FROM
   config_info
 """
+# 监视模式用于判断数据是否变化的查询。行数和最后修改时间都没变时，沿用上一次的查询结果
+SQL_FINGERPRINT_APOLLO = """
+SELECT
+  (SELECT COUNT(*) FROM Item),
+  (SELECT MAX(DataChange_LastTime) FROM Item),
+  (SELECT MAX(DataChange_LastTime) FROM Namespace)
+"""
+SQL_FINGERPRINT_NACOS = """
+SELECT
+  COUNT(*),
+  MAX(gmt_modified)
+FROM
+  config_info
+"""
 # 表头对应关系设置
 COL_INFO = {
     "name": {"col": 0},
@@ -179,5 +202,24 @@ LOG_COLORS = {
 }
 # 日志展示最多行数
 LOG_LINES = 1000
-# 日志定时刷新毫秒数
-LOG_UPDATE_RATE = 200
+# 相似配置查找参数：相似度阈值、签名长度、分段数、字符片段长度、参与查找的最短值长度，以及每个桶最多比较的代表值数
+SIMILAR_THRESHOLD = 0.7
+SIMILAR_NUM_PERM = 64
+SIMILAR_BANDS = 16
+SIMILAR_SHINGLE_SIZE = 4
+SIMILAR_MIN_LENGTH = 8
+SIMILAR_BUCKET_LEADERS = 32
+# 压缩导出时每块未压缩数据的字节数
+EXPORT_COMPRESS_CHUNK_SIZE = 1 << 22
+# 导出文件类型过滤器。类型名决定导出格式和压缩方式
+SAVE_FILE_FILTERS = [
+    'CSV Files (*.csv)',
+    'JSON Files (*.json)',
+    'Compact JSON Files (*.json)',
+    'NDJSON Files (*.ndjson)',
+    'CSV gzip Files (*.csv.gz)',
+    'NDJSON gzip Files (*.ndjson.gz)',
+    'NDJSON xz Files (*.ndjson.xz)',
+]
+# 监视模式默认轮询间隔秒数
+WATCH_INTERVAL = 300
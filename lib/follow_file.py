@@ -0,0 +1,127 @@
+"""
+这是一个Python文件，其中包含一个类：`FileFollower`。
+
+`FileFollower` 记住文件的编号（inode）和已经读取到的位置，每次调用 `read_new` 返回之后新写入的完整行，效果类似 `tail -F`。它能识别两种情况：
+
+- 文件被轮换：路径指向了一个新文件。`RotatingFileHandler` 会把旧文件改名为 `<path>.1`，这时先读完旧文件剩下的内容，再从头读取新文件，轮换前后的行不会遗漏也不会重复。
+- 文件被截断：文件变得比已读取的位置还短，从头读取。
+
+两次读取之间不保持文件打开，避免在 Windows 上阻止日志处理器改名文件。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import os
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class FileFollower:
+    """
+    跟踪读取不断追加的文本文件。
+
+    :param target_path: 文件路径。
+    :type target_path: Union[str, os.PathLike]
+
+    :example:
+    >>> import tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'run.log')
+    >>> with open(path, 'w', encoding='utf-8') as file:
+    ...     _ = file.write('old\\n')
+    >>> follower = FileFollower(path)
+    >>> follower.seek_end()
+    >>> with open(path, 'a', encoding='utf-8') as file:
+    ...     _ = file.write('a\\nb')
+    >>> follower.read_new()
+    'a\\n'
+    >>> with open(path, 'a', encoding='utf-8') as file:
+    ...     _ = file.write('\\nlast before rotation\\n')
+    >>> os.replace(path, path + '.1')
+    >>> with open(path, 'w', encoding='utf-8') as file:
+    ...     _ = file.write('new\\n')
+    >>> follower.read_new()
+    'b\\nlast before rotation\\nnew\\n'
+    """
+
+    def __init__(self, target_path: Union[str, os.PathLike]):
+        self.target_path = os.fspath(target_path)
+        self.position = 0
+        self._inode: Optional[int] = None
+
+    def seek_end(self, position: Optional[int] = None) -> None:
+        """
+        从当前文件的指定位置开始跟踪，之前的内容视为已读取。
+
+        :param position: 开始位置，为 None 时从文件末尾开始。
+        :type position: Optional[int]
+        :rtype: None
+        :return: 无返回值。
+        """
+        try:
+            stat = os.stat(self.target_path)
+            self._inode = stat.st_ino
+            self.position = stat.st_size if position is None else position
+        except FileNotFoundError:
+            self._inode = None
+            self.position = 0
+
+    def read_new(self) -> str:
+        """
+        读取上次读取之后新写入的完整行。未写完的最后一行留到下次读取。
+
+        :rtype: str
+        :return: 新内容，没有新内容时返回空字符串。
+        """
+        try:
+            stat = os.stat(self.target_path)
+        except FileNotFoundError:
+            return ''
+        chunks = []
+        if self._inode is not None and stat.st_ino != self._inode:
+            # 文件被轮换，先读完改名后的旧文件
+            rotated_path = f'{self.target_path}.1'
+            try:
+                if os.stat(rotated_path).st_ino == self._inode:
+                    chunks.append(self._read_from(rotated_path, self.position, complete_lines=False))
+            except FileNotFoundError:
+                pass
+            self.position = 0
+        elif stat.st_size < self.position:
+            # 文件被截断
+            self.position = 0
+        self._inode = stat.st_ino
+        chunks.append(self._read_from(self.target_path, self.position, complete_lines=True))
+        return b''.join(chunks).decode('utf-8', errors='replace')
+
+    def _read_from(self,
+                   path: str,
+                   position: int,
+                   complete_lines: bool) -> bytes:
+        """
+        从指定位置读取文件，并更新读取位置。
+
+        :param path: 文件路径。
+        :type path: str
+        :param position: 开始位置。
+        :type position: int
+        :param complete_lines: 是否只返回完整的行。
+        :type complete_lines: bool
+        :rtype: bytes
+        :return: 读取的内容。
+        """
+        try:
+            with open(path, 'rb') as file:
+                file.seek(position)
+                data = file.read()
+        except FileNotFoundError:
+            return b''
+        if complete_lines:
+            data = data[:data.rfind(b'\n') + 1]
+        elif data and not data.endswith(b'\n'):
+            data += b'\n'
+        self.position = position + len(data)
+        return data
@@ -0,0 +1,65 @@
+"""
+这是一个Python文件，其中包含两个函数：`freeze_data` 和 `thaw_data`。
+
+函数 `freeze_data` 把字典、列表和集合递归转换为只读的 `MappingProxyType`、元组和 `frozenset`。冻结后的数据可以直接按引用分享给多个使用者，不必每次读取都深拷贝，任何使用者都无法修改它。
+
+函数 `thaw_data` 做相反的转换，得到可以修改的普通字典和列表，用于需要编辑配置的地方，例如设置对话框。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+from types import MappingProxyType
+from typing import Any, Mapping
+
+
+def freeze_data(data: Any) -> Any:
+    """
+    把数据递归转换为只读结构。
+
+    :param data: 要冻结的数据，通常是字典、列表或字符串等基本类型。
+    :type data: Any
+    :rtype: Any
+    :return: 只读数据。字典变为 `MappingProxyType`，列表和元组变为元组，集合变为 `frozenset`，其他类型原样返回。
+
+    :example:
+    >>> frozen = freeze_data({'mysql': {'port': '3306'}, 'hosts': ['a', 'b']})
+    >>> frozen['mysql']['port'], frozen['hosts']
+    ('3306', ('a', 'b'))
+    >>> frozen['mysql']['port'] = '3307'
+    Traceback (most recent call last):
+    ...
+    TypeError: 'mappingproxy' object does not support item assignment
+    """
+    if isinstance(data, Mapping):
+        return MappingProxyType({key: freeze_data(value) for key, value in data.items()})
+    if isinstance(data, (list, tuple)):
+        return tuple(freeze_data(value) for value in data)
+    if isinstance(data, (set, frozenset)):
+        return frozenset(data)
+    return data
+
+
+def thaw_data(data: Any) -> Any:
+    """
+    把只读数据递归转换为可以修改的副本。
+
+    :param data: 要转换的数据。
+    :type data: Any
+    :rtype: Any
+    :return: 可修改的副本。映射变为字典，元组和列表变为列表，集合变为 `set`，其他类型原样返回。
+
+    :example:
+    >>> config = thaw_data(freeze_data({'mysql': {'port': '3306'}}))
+    >>> config['mysql']['port'] = '3307'
+    >>> config
+    {'mysql': {'port': '3307'}}
+    """
+    if isinstance(data, Mapping):
+        return {key: thaw_data(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [thaw_data(value) for value in data]
+    if isinstance(data, (set, frozenset)):
+        return set(data)
+    return data
@@ -0,0 +1,138 @@
+"""
+这是一个Python文件，其中包含一个类：`ImportTimer`。
+
+`ImportTimer` 是一个导入钩子，记录每个模块的导入耗时，效果类似 `python -X importtime`，但可以在打包后的程序中使用。安装后，之后导入的每个模块都会记录自身耗时和包含子模块的累计耗时，`report` 方法按累计耗时从高到低输出报告。
+
+计时只包含执行模块代码的时间，不包含查找模块文件的时间。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import importlib.abc
+import sys
+import time
+from types import ModuleType
+from typing import List, Tuple, Optional, Any, Sequence
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    记录模块导入耗时的导入钩子。
+
+    :example:
+    >>> timer = ImportTimer()
+    >>> timer.install()
+    >>> import xml.dom.minidom
+    >>> timer.uninstall()
+    >>> any(name == 'xml.dom.minidom' for name, _, _ in timer.records)
+    True
+    """
+
+    def __init__(self):
+        # 每条记录为 (模块名, 自身耗时微秒, 累计耗时微秒)
+        self.records: List[Tuple[str, int, int]] = []
+        # 正在导入的模块的子模块累计耗时，用于计算自身耗时
+        self._child_times: List[float] = []
+
+    def install(self) -> None:
+        """
+        安装导入钩子。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        """
+        卸载导入钩子。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self,
+                  fullname: str,
+                  path: Optional[Sequence[str]],
+                  target: Optional[ModuleType] = None) -> Optional[Any]:
+        """
+        交给其他查找器查找模块，找到后把加载器换成计时的包装。
+
+        :param fullname: 模块完整名称。
+        :type fullname: str
+        :param path: 父包的路径。
+        :type path: Optional[Sequence[str]]
+        :param target: 重新加载时的目标模块。
+        :type target: Optional[ModuleType]
+        :rtype: Optional[Any]
+        :return: 模块规格，找不到时返回 None。
+        """
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def report(self, limit: int = 30) -> str:
+        """
+        生成导入耗时报告，格式与 `-X importtime` 相同。
+
+        :param limit: 最多列出的模块数。
+        :type limit: int
+        :rtype: str
+        :return: 按累计耗时从高到低排列的报告文本。
+        """
+        # 所有模块的自身耗时之和就是总耗时
+        lines = [f"import time: {sum(record[1] for record in self.records)} us in {len(self.records)} modules",
+                 "import time: self [us] | cumulative | imported package"]
+        for name, self_time, cumulative in sorted(self.records, key=lambda record: record[2], reverse=True)[:limit]:
+            lines.append(f"import time: {self_time:>9} | {cumulative:>10} | {name}")
+        return '\n'.join(lines)
+
+    def _enter(self) -> None:
+        self._child_times.append(0.0)
+
+    def _leave(self, name: str, elapsed: float) -> None:
+        children = self._child_times.pop()
+        if self._child_times:
+            self._child_times[-1] += elapsed
+        self.records.append((name, int((elapsed - children) * 1e6), int(elapsed * 1e6)))
+
+
+class _TimedLoader:
+    """
+    包装原加载器，计时执行模块代码。其他属性都转给原加载器。
+    """
+
+    def __init__(self, loader: Any, timer: ImportTimer):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._loader, item)
+
+    def create_module(self, spec: Any) -> Optional[ModuleType]:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        # 模块上记录的加载器还原为原加载器，不影响资源读取等后续使用
+        module.__loader__ = self._loader
+        if getattr(module, '__spec__', None) is not None and module.__spec__.loader is self:
+            module.__spec__.loader = self._loader
+        self._timer._enter()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer._leave(module.__name__, time.perf_counter() - start)
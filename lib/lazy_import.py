@@ -0,0 +1,48 @@
+"""
+这是一个Python文件，其中包含一个函数：`lazy_import`。
+
+函数 `lazy_import` 返回一个延迟加载的模块对象。导入时只查找模块位置，不执行模块代码，第一次访问模块属性时才真正加载，加载后与普通模块没有区别。适合 pymysql、paramiko、requests 这类体积大、只在用户点击按钮后才用到的依赖，可以缩短程序启动时间。
+
+打包工具通过扫描 import 语句收集依赖，因此调用处应在 `if TYPE_CHECKING:` 中保留一条普通的 import 语句，例如::
+
+    if TYPE_CHECKING:
+        import pymysql
+    pymysql = lazy_import('pymysql')
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    延迟导入模块。模块已经导入过时直接返回已有模块。
+
+    :param name: 模块的完整名称，例如 'paramiko' 或 'yaml'。
+    :type name: str
+    :rtype: ModuleType
+    :return: 模块对象，第一次访问属性时才执行模块代码。
+    :raise ModuleNotFoundError: 找不到模块时抛出。
+
+    :example:
+    >>> json_module = lazy_import('json')
+    >>> json_module.dumps([1])
+    '[1]'
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
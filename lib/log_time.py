@@ -51,11 +51,11 @@ def log_time(func: Callable) -> Callable:
         try:
             result = func(*args, **kwargs)
         except Exception as e:
-            logger.exception(f"Exception occurred in {func.__name__}: {e}")
+            logger.exception("Exception occurred in %s: %s", func.__name__, e)
             return None
         else:
             end_time = time.time()
-            logger.debug(f"{func.__name__} executed in {end_time - start_time:.2f} seconds.")
+            logger.debug("%s executed in %.2f seconds.", func.__name__, end_time - start_time)
             return result
 
     return wrapper
@@ -10,10 +10,15 @@
 - `max_log_size`：最大日志文件大小（MB），默认为10MB。
 - `backup_count`：保留的备份日志文件数量，默认为10。
 - `default_log_format`：日志的默认格式。
+- `use_queue`：是否在单独的写入线程中输出日志。
+- `rate_limit_burst` 和 `rate_limit_window`：同一位置重复日志的限流参数。
+
+默认情况下，根日志记录器只挂一个 `QueueHandler`，产生日志的线程只把记录放进队列，由 `QueueListener` 的写入线程格式化并写入控制台和文件，查询和格式化线程不再等待磁盘。同一进程内的队列不需要序列化，因此记录原样放进队列，消息的格式化也推迟到写入线程。程序退出时会等待队列中的日志全部写完。
 
 此文件依赖于以下Python库：
 - `logging`
 - `os`
+- `queue`
 - `typing`
 
 函数使用了日志记录器记录任何在转换过程中发生的错误。
@@ -22,19 +27,29 @@
 :contact: https://github.com/hxz393
 :copyright: Copyright 2023, hxz393. 保留所有权利。
 """
+import atexit
 import logging
 import os
+import queue
 from logging import getLogger, StreamHandler, Formatter
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from typing import Optional
 
+from .rate_limit_filter import RateLimitFilter
+
+# 当前的写入线程，重新配置时先停止
+_listener: Optional[QueueListener] = None
+
 
 def logging_config(log_file: Optional[str] = None,
                    console_output: bool = False,
                    log_level: str = 'INFO',
                    max_log_size: int = 10,
                    backup_count: int = 10,
-                   default_log_format: str = '%(asctime)s - %(levelname)s - %(module)s::%(funcName)s::%(lineno)d - %(message)s'
+                   default_log_format: str = '%(asctime)s - %(levelname)s - %(module)s::%(funcName)s::%(lineno)d - %(message)s',
+                   use_queue: bool = True,
+                   rate_limit_burst: int = 5,
+                   rate_limit_window: float = 60.0
                    ) -> logging.Logger:
     """
     配置日志记录器，可选在控制台输出，也可选择记录到日志文件。
@@ -51,27 +66,36 @@ def logging_config(log_file: Optional[str] = None,
     :type backup_count: int
     :param default_log_format: 日志的默认格式
     :type default_log_format: str
+    :param use_queue: 是否在单独的写入线程中输出日志，默认为 True
+    :type use_queue: bool
+    :param rate_limit_burst: 同一位置的警告日志，每个时间窗口最多输出的条数
+    :type rate_limit_burst: int
+    :param rate_limit_window: 限流时间窗口秒数
+    :type rate_limit_window: float
     :rtype: logging.Logger
     :return: 配置后的日志记录器实例
     """
     log_levels = ["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"]
     log_level = log_level if log_level.upper() in log_levels else 'INFO'
 
+    global _listener
     logger = getLogger()
 
-    if logger.handlers:
-        for handler in logger.handlers:
-            logger.removeHandler(handler)
-            handler.close()
+    _stop_listener()
+    # 复制列表，避免在遍历时删除元素
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
 
     logger.setLevel(getattr(logging, log_level.upper()))
     formatter = Formatter(default_log_format)
 
+    handlers = []
     if console_output:
         ch = StreamHandler()
         ch.setLevel(getattr(logging, log_level.upper()))
         ch.setFormatter(formatter)
-        logger.addHandler(ch)
+        handlers.append(ch)
 
     if log_file:
         os.makedirs(os.path.dirname(log_file), exist_ok=True) if os.path.dirname(log_file) else None
@@ -79,6 +103,51 @@ def logging_config(log_file: Optional[str] = None,
         fh.close()
         fh.setLevel(getattr(logging, log_level.upper()))
         fh.setFormatter(formatter)
-        logger.addHandler(fh)
+        handlers.append(fh)
+
+    rate_filter = RateLimitFilter(burst=rate_limit_burst, window=rate_limit_window)
+    if use_queue and handlers:
+        log_queue = queue.SimpleQueue()
+        qh = _InProcessQueueHandler(log_queue)
+        # 格式只用于其他处理器参照，队列处理器本身不格式化
+        qh.setFormatter(formatter)
+        qh.addFilter(rate_filter)
+        logger.addHandler(qh)
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+    else:
+        for handler in handlers:
+            handler.addFilter(rate_filter)
+            logger.addHandler(handler)
 
     return logger
+
+
+class _InProcessQueueHandler(QueueHandler):
+    """
+    把日志记录原样放进同一进程内队列的处理器。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 队列不跨进程，记录不需要序列化，消息和异常堆栈留给写入线程格式化
+        return record
+
+
+def _stop_listener() -> None:
+    """
+    停止写入线程，等待队列中的日志写完，并关闭它的处理器。重新配置和程序退出时调用。
+
+    :rtype: None
+    :return: 无返回值。
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+# 在 logging 模块自身的退出处理之前执行，保证日志写完
+atexit.register(_stop_listener)
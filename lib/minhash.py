@@ -0,0 +1,81 @@
+"""
+这是一个Python文件，包含字符串 MinHash 签名的计算函数：`minhash_signature` 和 `signature_similarity`。
+
+签名采用单次排列哈希（One Permutation Hashing）：每个字符片段只计算一次 CRC32，按哈希值分到固定数量的桶中，每个桶保留最小值。空桶从右侧最近的非空桶借值补齐。这样每个字符串的计算量只与片段数量有关，与签名长度无关，适合在没有 numpy 的环境中处理大量字符串。
+
+两个签名相同位置相等的比例，是两个字符串片段集合 Jaccard 相似度的估计值。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import zlib
+from array import array
+from operator import eq
+from typing import Optional
+
+# 补齐空桶时，每跨过一个桶叠加的偏移量，避免借来的值与原桶的值碰撞
+_DENSIFY_OFFSET = 0x9E3779B1
+_MAX_HASH = 0xFFFFFFFF
+
+
+def minhash_signature(text: str,
+                      num_perm: int = 64,
+                      shingle_size: int = 4) -> Optional[array]:
+    """
+    计算字符串的 MinHash 签名。
+
+    :param text: 要计算的字符串。
+    :type text: str
+    :param num_perm: 签名长度，即桶的数量。
+    :type num_perm: int
+    :param shingle_size: 字符片段长度。
+    :type shingle_size: int
+    :rtype: Optional[array]
+    :return: 长度为 num_perm 的无符号整数数组。字符串短于片段长度时返回 None。
+
+    :example:
+    >>> a = minhash_signature('jdbc:mysql://10.0.0.1:3306/order')
+    >>> b = minhash_signature('jdbc:mysql://10.0.0.2:3306/order')
+    >>> signature_similarity(a, b) > 0.5, signature_similarity(a, a)
+    (True, 1.0)
+    >>> minhash_signature('abc') is None
+    True
+    """
+    if len(text) < shingle_size:
+        return None
+    buckets = [_MAX_HASH + 1] * num_perm
+    crc32 = zlib.crc32
+    for shingle in {text[i:i + shingle_size] for i in range(len(text) - shingle_size + 1)}:
+        hash_value = crc32(shingle.encode('utf-8'))
+        bucket, value = hash_value % num_perm, hash_value // num_perm
+        if value < buckets[bucket]:
+            buckets[bucket] = value
+
+    # 补齐空桶：向右循环查找最近的原始非空桶。补齐后的值带上标记位，不会被再次借用
+    if _MAX_HASH + 1 in buckets:
+        for index in range(num_perm):
+            if buckets[index] > _MAX_HASH:
+                distance = 1
+                while buckets[(index + distance) % num_perm] > _MAX_HASH:
+                    distance += 1
+                source = buckets[(index + distance) % num_perm]
+                buckets[index] = ((source + distance * _DENSIFY_OFFSET) & _MAX_HASH) | (_MAX_HASH + 1)
+        # 去掉标记位，得到最终签名
+        buckets = [bucket & _MAX_HASH for bucket in buckets]
+    return array('I', buckets)
+
+
+def signature_similarity(first: array, second: array) -> float:
+    """
+    根据两个签名估算 Jaccard 相似度。
+
+    :param first: 第一个签名。
+    :type first: array
+    :param second: 第二个签名，长度须与第一个相同。
+    :type second: array
+    :rtype: float
+    :return: 0 到 1 之间的相似度。
+    """
+    return sum(map(eq, first, second)) / len(first)
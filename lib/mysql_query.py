@@ -5,28 +5,39 @@
 
 该模块是数据库操作的核心工具，提供了执行查询和处理结果的基础功能。
 
+结果使用不缓冲的游标按批读取，数据在取结果阶段才从服务器传来。每读到一批就把行数计入 `metrics` 的 `fetched_rows`，界面可以在取结果期间显示实时速度。
+
 :author: assassing
 :contact: https://github.com/hxz393
 :copyright: Copyright 2023, hxz393. 保留所有权利。
 """
 
 import logging
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Mapping, List, TYPE_CHECKING
+
+from .lazy_import import lazy_import
+from .run_metrics import metrics
 
-import pymysql
+if TYPE_CHECKING:
+    import pymysql
+# 第一次查询时才加载 pymysql
+pymysql = lazy_import('pymysql')
 
 logger = logging.getLogger(__name__)
 
+# 每批读取的行数
+FETCH_BATCH_SIZE = 5000
+
 
-def mysql_query(mysql_config: Dict[str, Any], query_sql: str) -> Optional[Any]:
+def mysql_query(mysql_config: Mapping[str, Any], query_sql: str) -> Optional[Any]:
     """
     执行 MySQL 查询并返回结果。
 
-    :type mysql_config: Dict[str, Any]
+    :type mysql_config: Mapping[str, Any]
     :param mysql_config: 包含MySQL数据库连接参数的字典。例如：{'host': '127.0.0.1', 'port': '3306', 'user': 'root', 'password': '123456', 'db': 'mysql'}
     :param query_sql: 要执行的 SQL 查询语句。
     :type query_sql: str
-    :rtype:  Optional[tuple[tuple[Any, ...], ...]]
+    :rtype:  Optional[List[tuple[Any, ...]]]
     :return: 查询结果的列表，如果发生异常则返回 None。
     """
     required_keys = ['host', 'port', 'user', 'password', 'db']
@@ -35,11 +46,23 @@ def mysql_query(mysql_config: Dict[str, Any], query_sql: str) -> Optional[Any]:
         return False
 
     try:
-        mysql_config['port'] = int(mysql_config['port'])
-        with pymysql.connect(**mysql_config) as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query_sql)
-                result = cursor.fetchall()
+        # 传入的配置可能是只读的，在副本上转换端口类型
+        mysql_config = {**mysql_config, 'port': int(mysql_config['port'])}
+        with metrics.span('connect'):
+            conn = pymysql.connect(**mysql_config)
+        with conn:
+            # 不缓冲的游标，结果在读取时才传输
+            with conn.cursor(pymysql.cursors.SSCursor) as cursor:
+                with metrics.span('query'):
+                    cursor.execute(query_sql)
+                result: List[tuple] = []
+                with metrics.span('fetch'):
+                    while True:
+                        batch = cursor.fetchmany(FETCH_BATCH_SIZE)
+                        if not batch:
+                            break
+                        result.extend(batch)
+                        metrics.count('fetched_rows', len(batch))
                 return result
     except Exception:
         logger.exception("Unexpected error")
@@ -13,27 +13,33 @@
 """
 
 import logging
-from typing import Optional, Dict, Any
-
-import paramiko
-from paramiko import SSHClient
-from sshtunnel import open_tunnel
+from contextlib import ExitStack
+from typing import Optional, Mapping, Any, TYPE_CHECKING
 
+from .lazy_import import lazy_import
 from .mysql_query import mysql_query
+from .run_metrics import metrics
+
+if TYPE_CHECKING:
+    import paramiko
+    import sshtunnel
+# 第一次查询时才加载 paramiko 和 sshtunnel
+paramiko = lazy_import('paramiko')
+sshtunnel = lazy_import('sshtunnel')
 
 logger = logging.getLogger(__name__)
 # 调整 Paramiko 的日志记录级别
 logging.getLogger("paramiko").setLevel(logging.WARNING)
 
 
-def mysql_query_with_ssh(ssh_config: Dict[str, Any], mysql_config: Dict[str, Any], query_sql: str) -> Optional[Any]:
+def mysql_query_with_ssh(ssh_config: Mapping[str, Any], mysql_config: Mapping[str, Any], query_sql: str) -> Optional[Any]:
     """
     通过SSH隧道执行MySQL查询。
 
     :param ssh_config: 包含 SSH 连接所需配置的字典。例如：{'hostname': '127.0.0.1', 'port': '22', 'username': 'root', 'password': 'abc123'}
-    :type ssh_config: Dict[str, Any]
+    :type ssh_config: Mapping[str, Any]
 
-    :type mysql_config: Dict[str, Any]
+    :type mysql_config: Mapping[str, Any]
     :param mysql_config: 包含MySQL数据库连接参数的字典。例如：{'host': '127.0.0.1', 'port': '3306', 'user': 'root', 'password': '123456', 'db': 'mysql'}
     :type query_sql: str
     :rtype: Optional[Any]
@@ -51,21 +57,24 @@ def mysql_query_with_ssh(ssh_config: Dict[str, Any], mysql_config: Dict[str, Any
         return False
 
     try:
-        with SSHClient() as ssh:
-            ssh.load_system_host_keys()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh.connect(**ssh_config)
-
-            with open_tunnel(
-                (ssh_config['hostname'], int(ssh_config['port'])),
-                ssh_username=ssh_config['username'],
-                ssh_password=ssh_config['password'],
-                remote_bind_address=(mysql_config['host'], int(mysql_config['port']))
-            ) as tunnel:
-                mysql_config['host'] = '127.0.0.1'
-                mysql_config['port'] = tunnel.local_bind_port
-
-                return mysql_query(mysql_config, query_sql)
+        with ExitStack() as stack:
+            # 建立 SSH 连接和隧道的耗时计入 tunnel 阶段
+            with metrics.span('tunnel'):
+                ssh = stack.enter_context(paramiko.SSHClient())
+                ssh.load_system_host_keys()
+                ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+                ssh.connect(**ssh_config)
+
+                tunnel = stack.enter_context(sshtunnel.open_tunnel(
+                    (ssh_config['hostname'], int(ssh_config['port'])),
+                    ssh_username=ssh_config['username'],
+                    ssh_password=ssh_config['password'],
+                    remote_bind_address=(mysql_config['host'], int(mysql_config['port']))
+                ))
+            # 在副本上改为隧道的本地地址，不修改传入的配置
+            local_config = {**mysql_config, 'host': '127.0.0.1', 'port': tunnel.local_bind_port}
+
+            return mysql_query(local_config, query_sql)
     except Exception:
         logger.exception("An error occurred.")
         return False
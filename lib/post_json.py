@@ -0,0 +1,47 @@
+"""
+这是一个Python文件，其中包含一个函数：`post_json`。
+
+函数 `post_json` 用于通过 HTTP POST 请求把数据以 JSON 格式发送到给定 URL。它接受两个参数：`url` 为目标地址，`data` 为要发送的数据。响应状态码不是 2xx 或发生网络请求异常时，函数将记录错误并返回 `False`。
+
+此模块主要用于向本地或内网的 Webhook 推送通知。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+from typing import Any, TYPE_CHECKING
+
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import requests
+# 第一次发送请求时才加载 requests
+requests = lazy_import('requests')
+logger = logging.getLogger(__name__)
+
+
+def post_json(url: str, data: Any) -> bool:
+    """
+    通过 HTTP POST 请求把数据以 JSON 格式发送到给定 URL。
+
+    :param url: 目标 URL
+    :type url: str
+    :param data: 可以序列化为 JSON 的数据
+    :type data: Any
+
+    :rtype: bool
+    :return: 发送成功返回 True，否则返回 False
+    """
+    requests.packages.urllib3.disable_warnings()
+    session = requests.Session()
+    session.trust_env = False
+
+    try:
+        response = session.post(url, json=data, verify=False, timeout=15)
+        response.raise_for_status()
+        return True
+    except Exception:
+        logger.exception(f"Unable to post data to {url}")
+        return False
@@ -0,0 +1,83 @@
+"""
+这是一个Python文件，其中包含一个类：`RateLimitFilter`。
+
+`RateLimitFilter` 是一个日志过滤器，限制同一位置重复产生的日志数量。同一行代码产生的日志，在一个时间窗口内只放行前若干条，其余的计数后丢弃。窗口结束后的第一条日志会注明丢弃了多少条。例如解析失败的配置很多时，不会每条都写一遍日志。
+
+只限制 `level` 级别的日志，默认是警告。调试日志通常由同一行代码输出不同的内容，例如计时装饰器，错误日志必须完整保留，它们都总是放行。
+
+同一条记录可能经过多个处理器。过滤结果记录在日志记录上，后面的处理器直接沿用，计数不会重复。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Tuple, List
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    限制同一位置重复日志数量的过滤器。
+
+    :param burst: 每个时间窗口内同一位置最多放行的日志数。
+    :type burst: int
+    :param window: 时间窗口秒数。
+    :type window: float
+    :param level: 受限制的日志级别。
+    :type level: int
+
+    :example:
+    >>> rate_filter = RateLimitFilter(burst=2, window=60)
+    >>> records = [logging.LogRecord('demo', logging.WARNING, 'demo.py', 10, 'bad value %s', (i,), None) for i in range(5)]
+    >>> [rate_filter.filter(record) for record in records]
+    [True, True, False, False, False]
+    >>> rate_filter.filter(records[0])
+    True
+    """
+
+    def __init__(self,
+                 burst: int = 5,
+                 window: float = 60.0,
+                 level: int = logging.WARNING):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.level = level
+        # 每个位置的窗口开始时间、窗口内日志数和丢弃数
+        self._states: Dict[Tuple[str, int], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        判断是否放行日志记录。
+
+        :param record: 日志记录。
+        :type record: logging.LogRecord
+        :rtype: bool
+        :return: 放行返回 True。
+        """
+        decision = getattr(record, 'rate_limited', None)
+        if decision is not None:
+            return not decision
+        if record.levelno != self.level:
+            return True
+        now = time.monotonic()
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = int(state[2]) if state is not None else 0
+                self._states[key] = [now, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.msg} [{suppressed} similar messages suppressed]"
+                passed = True
+            else:
+                state[1] += 1
+                passed = state[1] <= self.burst
+                if not passed:
+                    state[2] += 1
+        record.rate_limited = not passed
+        return passed
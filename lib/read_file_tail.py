@@ -0,0 +1,67 @@
+"""
+这是一个Python文件，其中包含一个函数：`read_file_tail`。
+
+函数 `read_file_tail` 从文件末尾向前按块读取，直到凑够指定的行数，效果类似 `tail -n`。读取量只与要求的行数有关，与文件大小无关，打开上百 MB 的日志文件也是瞬间完成。
+
+函数同时返回读取时的文件末尾位置，调用方可以从这个位置开始继续读取新写入的内容。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import os
+from typing import Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+def read_file_tail(target_path: Union[str, os.PathLike],
+                   max_lines: int,
+                   block_size: int = 64 * 1024) -> Tuple[str, int]:
+    """
+    读取文本文件的最后若干行。
+
+    :param target_path: 文件路径。
+    :type target_path: Union[str, os.PathLike]
+    :param max_lines: 最多读取的行数。
+    :type max_lines: int
+    :param block_size: 每次向前读取的字节数。
+    :type block_size: int
+    :rtype: Tuple[str, int]
+    :return: 最后若干行的文本和读取时的文件末尾位置。文件不存在或读取出错时返回空字符串和 0。
+
+    :example:
+    >>> import tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'run.log')
+    >>> with open(path, 'w', encoding='utf-8') as file:
+    ...     _ = file.write(''.join(f'line {i}\\n' for i in range(100)))
+    >>> read_file_tail(path, 2, block_size=16)
+    ('line 98\\nline 99\\n', 790)
+    """
+    try:
+        with open(target_path, 'rb') as file:
+            end = file.seek(0, os.SEEK_END)
+            position = end
+            blocks = []
+            newlines = 0
+            # 末尾的换行符不算一行的开始，因此多找一个换行符
+            while position > 0 and newlines <= max_lines:
+                size = min(block_size, position)
+                position -= size
+                file.seek(position)
+                block = file.read(size)
+                newlines += block.count(b'\n')
+                blocks.append(block)
+        data = b''.join(reversed(blocks))
+        # 没有读到文件开头时，第一行可能不完整，丢弃到第一个换行符
+        if position > 0:
+            data = data[data.find(b'\n') + 1:]
+        lines = data.splitlines(keepends=True)[-max_lines:]
+        return b''.join(lines).decode('utf-8', errors='replace'), end
+    except FileNotFoundError:
+        return '', 0
+    except Exception:
+        logger.exception(f"An error occurred while reading the tail of '{target_path}'")
+        return '', 0
@@ -11,11 +11,14 @@
 """
 
 import logging
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
-import requests
+from .lazy_import import lazy_import
 
-requests.packages.urllib3.disable_warnings()
+if TYPE_CHECKING:
+    import requests
+# 第一次发送请求时才加载 requests
+requests = lazy_import('requests')
 logger = logging.getLogger(__name__)
 
 
@@ -29,6 +32,7 @@ def request_url(url: str) -> Optional[str]:
     :rtype: Optional[str]
     :return: 如果请求成功，返回 URL 的响应内容；否则返回 None
     """
+    requests.packages.urllib3.disable_warnings()
     session = requests.Session()
     session.trust_env = False
 
@@ -0,0 +1,116 @@
+"""
+这是一个Python文件，其中包含一个类：`ResourceSampler`。
+
+`ResourceSampler` 在后台线程中按固定间隔采样当前进程的常驻内存和 CPU 占用，保存最近一次的结果，并把每次采样交给回调函数，例如记录峰值。采样线程不依赖界面事件循环，界面线程忙于填充表格时也能照常采样，因此能测到界面操作造成的内存峰值。
+
+CPU 占用是两次采样之间进程 CPU 时间与墙钟时间之比，多个线程同时运行时可能超过 100%。`stop` 会在结束前再采样一次，停止之前的最后状态也会被记录。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from .get_process_rss import get_process_rss
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceSampler:
+    """
+    后台线程资源采样器。
+
+    :param interval: 采样间隔秒数。
+    :type interval: float
+    :param on_sample: 可选，每次采样后在采样线程中调用，参数为常驻内存字节数和 CPU 占用百分比。
+    :type on_sample: Optional[Callable[[int, float], None]]
+
+    :example:
+    >>> samples = []
+    >>> sampler = ResourceSampler(0.01, lambda rss, cpu: samples.append(rss))
+    >>> sampler.start()
+    >>> time.sleep(0.05)
+    >>> sampler.stop()
+    >>> len(samples) > 1, sampler.latest[0] > 0
+    (True, True)
+    """
+
+    def __init__(self,
+                 interval: float,
+                 on_sample: Optional[Callable[[int, float], None]] = None):
+        self.interval = interval
+        self.on_sample = on_sample
+        self.latest: Tuple[int, float] = (0, 0.0)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last = (0.0, 0.0)
+
+    @property
+    def running(self) -> bool:
+        """
+        采样线程是否在运行。
+
+        :rtype: bool
+        :return: 运行中返回 True。
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """
+        开始采样。已经在运行时先停止，重新开始计算 CPU 占用。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        self.stop()
+        self._last = (time.perf_counter(), time.process_time())
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        停止采样，等待采样线程结束，并最后采样一次。没有运行时不做任何事。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        if not self.running:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self.sample()
+
+    def sample(self) -> Tuple[int, float]:
+        """
+        采样一次，更新最近的结果并调用回调函数。
+
+        :rtype: Tuple[int, float]
+        :return: 常驻内存字节数和 CPU 占用百分比。
+        """
+        now, cpu_time = time.perf_counter(), time.process_time()
+        last_now, last_cpu_time = self._last
+        self._last = (now, cpu_time)
+        cpu_percent = (cpu_time - last_cpu_time) / (now - last_now) * 100 if now > last_now else 0.0
+        self.latest = (get_process_rss(), cpu_percent)
+        if self.on_sample is not None:
+            try:
+                self.on_sample(*self.latest)
+            except Exception:
+                logger.exception("Error in resource sample callback")
+        return self.latest
+
+    def _run(self) -> None:
+        """
+        采样线程的主循环。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        while not self._stop_event.wait(self.interval):
+            self.sample()
@@ -0,0 +1,73 @@
+"""
+这是一个Python文件，包含一个稀疏行位图类：`RowBitmap`。
+
+`RowBitmap` 用一个按位存储的 `bytearray` 记录行号是否被标记，并额外保存已标记行号的列表。成员判断是 O(1)，遍历和清空只与已标记的行数有关，不会触及未标记的行。
+
+适用于记录表格中少量被修改过样式的行，在下次操作前只还原这些行。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+from typing import Iterator
+
+
+class RowBitmap:
+    """
+    稀疏行位图。
+
+    位图负责 O(1) 的成员判断，成员列表负责按标记数量遍历和清空。
+
+    :example:
+    >>> bitmap = RowBitmap()
+    >>> bitmap.add(3)
+    >>> bitmap.add(3)
+    >>> 3 in bitmap, 4 in bitmap, len(bitmap)
+    (True, False, 1)
+    >>> bitmap.clear()
+    >>> 3 in bitmap, len(bitmap)
+    (False, 0)
+    """
+
+    def __init__(self):
+        self._bits = bytearray()
+        self._members = []
+
+    def add(self, row_id: int) -> None:
+        """
+        标记行号，重复标记无副作用。
+
+        :param row_id: 非负行号。
+        :type row_id: int
+        :rtype: None
+        :return: 无返回值。
+        """
+        byte_index, mask = row_id >> 3, 1 << (row_id & 7)
+        if byte_index >= len(self._bits):
+            # 按需扩容，一次至少翻倍，避免频繁分配
+            self._bits.extend(bytes(max(byte_index + 1 - len(self._bits), len(self._bits))))
+        if not self._bits[byte_index] & mask:
+            self._bits[byte_index] |= mask
+            self._members.append(row_id)
+
+    def clear(self) -> None:
+        """
+        清空所有标记。只清除已标记的位，耗时与标记数量成正比。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        for row_id in self._members:
+            self._bits[row_id >> 3] = 0
+        self._members.clear()
+
+    def __contains__(self, row_id: int) -> bool:
+        byte_index = row_id >> 3
+        return byte_index < len(self._bits) and bool(self._bits[byte_index] & (1 << (row_id & 7)))
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._members)
+
+    def __len__(self) -> int:
+        return len(self._members)
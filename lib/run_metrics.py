@@ -0,0 +1,445 @@
+"""
+这是一个Python文件，其中包含一个类：`RunMetrics`，以及它的全局实例 `metrics`。
+
+`RunMetrics` 记录一次运行中各阶段的耗时和计数。阶段用 `span` 上下文管理器或 `timed` 装饰器计时，同名阶段的次数和耗时会累加。计数用 `count` 累加，例如行数、字节数和解析失败数。
+
+在 `environment` 上下文中记录的耗时和计数会同时计入该环境的明细，查询线程只需在开始查询某个环境时设置一次，底层的连接和查询函数不需要知道环境名。环境名按线程保存，多个线程可以同时记录。
+
+`peak` 记录一次运行中某个测量值的最大值，例如定时采样的内存和 CPU 占用。`current_stage` 返回最近进入、尚未结束的阶段，`elapsed` 返回某个阶段包括进行中部分在内的耗时，供界面显示运行进度和实时速度。
+
+`summary` 返回可以直接保存为 JSON 的汇总字典，`format_summary` 把汇总转换为按耗时排序的文字。
+
+调用 `enable_trace` 后，每个阶段还会记录一条带线程编号的完整事件（开始时间和持续时间）。`trace` 和 `traced` 只记录事件、不计入汇总，用于标记界面槽函数等外层步骤。`save_trace` 按 Chrome Trace Event 格式保存，可以在 chrome://tracing 或 Perfetto 中打开，查看各线程的阶段如何交错、界面线程在哪里卡住。不启用时这些调用只多一次判断。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Any, Iterator, Callable, List, Tuple, Union, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RunMetrics:
+    """
+    一次运行的阶段耗时和计数。
+
+    :example:
+    >>> run = RunMetrics()
+    >>> with run.environment('PRO_CONFIG'):
+    ...     with run.span('query'):
+    ...         run.count('rows', 10)
+    >>> run.count('rows', 5)
+    >>> summary = run.summary()
+    >>> summary['spans']['query']['count'], summary['counters']['rows']
+    (1, {'total': 15, 'environments': {'PRO_CONFIG': 10}})
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # 跟踪事件列表，为 None 表示没有启用跟踪
+        self._trace_events: Optional[List[Dict[str, Any]]] = None
+        self._thread_names: Dict[int, str] = {}
+        self.reset()
+
+    @property
+    def tracing(self) -> bool:
+        """
+        是否启用了跟踪。
+
+        :rtype: bool
+        :return: 启用时返回 True。
+        """
+        return self._trace_events is not None
+
+    def enable_trace(self, enabled: bool = True) -> None:
+        """
+        启用或停用跟踪。启用后每次 `reset` 都会清空已记录的事件。
+
+        :param enabled: 是否启用。
+        :type enabled: bool
+        :rtype: None
+        :return: 无返回值。
+        """
+        with self._lock:
+            self._trace_events = [] if enabled else None
+            self._thread_names = {}
+
+    def reset(self) -> None:
+        """
+        清空记录，开始新的一次运行。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        with self._lock:
+            self.started_at = time.strftime('%Y-%m-%d %H:%M:%S')
+            self._start = time.perf_counter()
+            # 键为 (阶段名, 环境名)，值为 [次数, 秒数]，环境名为空表示不属于任何环境
+            self._spans: Dict[Tuple[str, str], List[Union[int, float]]] = {}
+            self._counters: Dict[Tuple[str, str], int] = {}
+            self._peaks: Dict[str, float] = {}
+            # 最近进入、尚未结束的阶段，为 (阶段名, 环境名)
+            self._current: Tuple[str, str] = ('', '')
+            # 进行中的阶段的开始时间，键为 (阶段名, 环境名)
+            self._open: Dict[Tuple[str, str], float] = {}
+            if self._trace_events is not None:
+                self._trace_events = []
+                self._thread_names = {}
+
+    @contextmanager
+    def environment(self, env_name: str) -> Iterator[None]:
+        """
+        在当前线程中设置环境名，期间记录的耗时和计数都计入该环境。
+
+        :param env_name: 环境名。
+        :type env_name: str
+        """
+        previous = getattr(self._local, 'env', '')
+        self._local.env = env_name
+        try:
+            yield
+        finally:
+            self._local.env = previous
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """
+        记录一个阶段的耗时。出现异常时同样记录。
+
+        :param name: 阶段名。
+        :type name: str
+        """
+        previous = self._current
+        key = self._current = (name, getattr(self._local, 'env', ''))
+        start = time.perf_counter()
+        with self._lock:
+            self._open[key] = start
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._current = previous
+            with self._lock:
+                self._open.pop(key, None)
+            self.add_time(name, end - start)
+            if self._trace_events is not None:
+                self._add_trace_event(name, start, end)
+
+    @property
+    def current_stage(self) -> Tuple[str, str]:
+        """
+        最近进入、尚未结束的阶段。多个线程同时记录时只反映其中之一，只用于显示。
+
+        :rtype: Tuple[str, str]
+        :return: 阶段名和环境名，没有进行中的阶段时都为空字符串。
+        """
+        return self._current
+
+    def elapsed(self,
+                name: str,
+                env_name: str = '') -> float:
+        """
+        某个阶段在某个环境中的耗时，包括尚未结束的部分。
+
+        :param name: 阶段名。
+        :type name: str
+        :param env_name: 环境名，为空表示不属于任何环境的记录。
+        :type env_name: str
+        :rtype: float
+        :return: 秒数。
+
+        :example:
+        >>> run = RunMetrics()
+        >>> with run.environment('PRO_CONFIG'), run.span('fetch'):
+        ...     time.sleep(0.01)
+        ...     run.elapsed('fetch', 'PRO_CONFIG') > 0
+        True
+        >>> round(run.elapsed('fetch', 'PRO_CONFIG'), 6) == run.summary()['spans']['fetch']['environments']['PRO_CONFIG']['seconds']
+        True
+        """
+        key = (name, env_name)
+        with self._lock:
+            seconds = self._spans.get(key, [0, 0.0])[1]
+            start = self._open.get(key)
+        if start is not None:
+            seconds += time.perf_counter() - start
+        return seconds
+
+    @contextmanager
+    def trace(self, name: str) -> Iterator[None]:
+        """
+        只记录跟踪事件，不计入汇总。没有启用跟踪时不做任何事。
+
+        :param name: 事件名。
+        :type name: str
+        """
+        if self._trace_events is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add_trace_event(name, start, time.perf_counter())
+
+    def traced(self, name: str) -> Callable:
+        """
+        装饰器，把函数的每次调用记录为跟踪事件，不计入汇总。
+
+        :param name: 事件名。
+        :type name: str
+        :rtype: Callable
+        :return: 装饰器。
+        """
+
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs) -> Any:
+                with self.trace(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def save_trace(self, path: str) -> bool:
+        """
+        按 Chrome Trace Event 格式保存跟踪事件。
+
+        :param path: 文件路径。
+        :type path: str
+        :rtype: bool
+        :return: 保存成功返回 True，没有启用跟踪或保存失败返回 False。
+
+        :example:
+        >>> import tempfile
+        >>> run = RunMetrics()
+        >>> run.enable_trace()
+        >>> with run.environment('PRO_CONFIG'), run.trace('start'), run.span('query'):
+        ...     pass
+        >>> path = os.path.join(tempfile.mkdtemp(), 'trace.json')
+        >>> run.save_trace(path)
+        True
+        >>> [(event['ph'], event['name']) for event in json.load(open(path))['traceEvents']]
+        [('M', 'thread_name'), ('X', 'query'), ('X', 'start')]
+        """
+        if self._trace_events is None:
+            return False
+        try:
+            pid = os.getpid()
+            with self._lock:
+                events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                          for tid, name in self._thread_names.items()]
+                events.extend(self._trace_events)
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file, ensure_ascii=False)
+            logger.info(f"Trace with {len(events)} events saved to '{path}'")
+            return True
+        except Exception:
+            logger.exception(f"Failed to save trace to '{path}'")
+            return False
+
+    def _add_trace_event(self,
+                         name: str,
+                         start: float,
+                         end: float) -> None:
+        """
+        记录一条完整事件。时间以本次运行开始为零点，单位为微秒。
+
+        :param name: 事件名。
+        :type name: str
+        :param start: 开始时间，`time.perf_counter` 的值。
+        :type start: float
+        :param end: 结束时间。
+        :type end: float
+        :rtype: None
+        :return: 无返回值。
+        """
+        tid = threading.get_ident()
+        env_name = getattr(self._local, 'env', '')
+        event = {'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': tid,
+                 'ts': round((start - self._start) * 1e6, 1), 'dur': round((end - start) * 1e6, 1)}
+        if env_name:
+            event['args'] = {'env': env_name}
+        with self._lock:
+            if self._trace_events is None:
+                return
+            self._thread_names.setdefault(tid, threading.current_thread().name)
+            self._trace_events.append(event)
+
+    def timed(self, name: str) -> Callable:
+        """
+        装饰器，记录函数每次调用的耗时。
+
+        :param name: 阶段名。
+        :type name: str
+        :rtype: Callable
+        :return: 装饰器。
+        """
+
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs) -> Any:
+                with self.span(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def add_time(self,
+                 name: str,
+                 seconds: float,
+                 count: int = 1) -> None:
+        """
+        直接累加阶段耗时，用于在循环中自行计时的场合。
+
+        :param name: 阶段名。
+        :type name: str
+        :param seconds: 秒数。
+        :type seconds: float
+        :param count: 次数。
+        :type count: int
+        :rtype: None
+        :return: 无返回值。
+        """
+        key = (name, getattr(self._local, 'env', ''))
+        with self._lock:
+            record = self._spans.setdefault(key, [0, 0.0])
+            record[0] += count
+            record[1] += seconds
+
+    def count(self,
+              name: str,
+              value: int = 1) -> None:
+        """
+        累加计数。
+
+        :param name: 计数名。
+        :type name: str
+        :param value: 增加的数量。
+        :type value: int
+        :rtype: None
+        :return: 无返回值。
+        """
+        key = (name, getattr(self._local, 'env', ''))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def peak(self,
+             name: str,
+             value: float) -> None:
+        """
+        记录测量值，只保留本次运行中的最大值。
+
+        :param name: 测量值名称。
+        :type name: str
+        :param value: 测量值。
+        :type value: float
+        :rtype: None
+        :return: 无返回值。
+
+        :example:
+        >>> run = RunMetrics()
+        >>> for value in [120.5, 300.0, 180.2]:
+        ...     run.peak('rss_mb', value)
+        >>> run.summary()['peaks']
+        {'rss_mb': 300.0}
+        """
+        with self._lock:
+            if value > self._peaks.get(name, float('-inf')):
+                self._peaks[name] = value
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        汇总当前记录。
+
+        :rtype: Dict[str, Any]
+        :return: 包含开始时间、总耗时、各阶段、各计数和各测量值峰值的字典。每个阶段和计数都有总数，以及按环境的明细。
+        """
+        with self._lock:
+            spans: Dict[str, Dict[str, Any]] = {}
+            for (name, env_name), (count, seconds) in self._spans.items():
+                span = spans.setdefault(name, {'count': 0, 'seconds': 0.0, 'environments': {}})
+                span['count'] += count
+                span['seconds'] += seconds
+                if env_name:
+                    span['environments'][env_name] = {'count': count, 'seconds': round(seconds, 6)}
+            for span in spans.values():
+                span['seconds'] = round(span['seconds'], 6)
+            counters: Dict[str, Dict[str, Any]] = {}
+            for (name, env_name), value in self._counters.items():
+                counter = counters.setdefault(name, {'total': 0, 'environments': {}})
+                counter['total'] += value
+                if env_name:
+                    counter['environments'][env_name] = value
+            return {
+                'started_at': self.started_at,
+                'total_seconds': round(time.perf_counter() - self._start, 6),
+                'spans': spans,
+                'counters': counters,
+                'peaks': dict(self._peaks),
+            }
+
+    def save(self, path: str) -> bool:
+        """
+        把汇总保存为 JSON 文件。
+
+        :param path: 文件路径。
+        :type path: str
+        :rtype: bool
+        :return: 保存成功返回 True，否则返回 False。
+        """
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump(self.summary(), file, ensure_ascii=False, indent=2)
+            return True
+        except Exception:
+            logger.exception(f"Failed to save run metrics to '{path}'")
+            return False
+
+    @staticmethod
+    def format_summary(summary: Dict[str, Any], limit: int = 0) -> List[str]:
+        """
+        把汇总转换为文字，每个阶段一行，按耗时从高到低排列，之后是各计数和峰值。
+
+        :param summary: `summary` 返回的汇总。
+        :type summary: Dict[str, Any]
+        :param limit: 最多列出的阶段数，为 0 时全部列出，并附上环境明细、计数和峰值。
+        :type limit: int
+        :rtype: List[str]
+        :return: 文字行。
+
+        :example:
+        >>> RunMetrics.format_summary({'spans': {'query': {'count': 2, 'seconds': 1.5, 'environments': {}}, 'color': {'count': 1, 'seconds': 0.25, 'environments': {}}}, 'counters': {}}, limit=1)
+        ['query 1.50 s']
+        """
+        spans = sorted(summary['spans'].items(), key=lambda item: item[1]['seconds'], reverse=True)
+        if limit:
+            return [f"{name} {span['seconds']:.2f} s" for name, span in spans[:limit]]
+        lines = []
+        for name, span in spans:
+            details = ', '.join(f"{env_name} {detail['seconds']:.2f} s" for env_name, detail in span['environments'].items())
+            lines.append(f"{name}: {span['seconds']:.3f} s / {span['count']}" + (f" ({details})" if details else ''))
+        for name, counter in summary['counters'].items():
+            details = ', '.join(f"{env_name} {value}" for env_name, value in counter['environments'].items())
+            lines.append(f"{name}: {counter['total']}" + (f" ({details})" if details else ''))
+        for name, value in summary.get('peaks', {}).items():
+            lines.append(f"peak {name}: {value:g}")
+        return lines
+
+
+# 全局实例，记录当前这一次运行
+metrics = RunMetrics()
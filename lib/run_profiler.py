@@ -0,0 +1,285 @@
+"""
+这是一个Python文件，其中包含一个类：`RunProfiler`，以及它的全局实例 `profiler`。
+
+`RunProfiler` 用 `cProfile` 分析下一次操作的函数耗时，用 `tracemalloc` 对比操作前后的内存分配。先调用 `arm` 做好准备，下一次操作开始时调用 `begin`，结束时调用 `end`；没有准备时 `begin` 什么也不做，所以可以一直留在代码中。
+
+`cProfile` 只分析启用它的线程。操作在后台线程中运行的部分用 `thread` 上下文管理器包住，各线程的结果在 `end` 时合并。同步完成的操作可以用 `session` 上下文管理器或 `profiled` 装饰器。分析进行中再次调用 `begin` 不会重新开始，外层操作内部调用的其他被分析函数不会提前结束分析。
+
+分析结束后，`top_functions` 按累计耗时列出函数，`top_allocations` 按新增内存列出分配位置，`dump_stats` 把函数统计保存为 `.pstats` 文件，可以用 `pstats`、snakeviz 等工具查看。
+
+`tracemalloc` 会明显拖慢内存分配，同时开启时函数耗时偏高，可以只开启其中一项。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import cProfile
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RunProfiler:
+    """
+    分析下一次操作的函数耗时和内存分配。
+
+    :example:
+    >>> run = RunProfiler()
+    >>> with run.session('idle') as started:
+    ...     pass
+    >>> started
+    False
+    >>> run.arm(cpu=True, memory=True)
+    >>> with run.session('sort'):
+    ...     data = sorted(str(i) for i in range(10000))
+    >>> run.label, run.armed, run.active
+    ('sort', False, False)
+    >>> any(name == 'sorted' or name.endswith('sorted>') for _, _, name, _, _, _ in run.top_functions(50))
+    True
+    >>> run.top_allocations(1)[0][2] > 0
+    True
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 是否分析下一次操作，以及分析哪些项目
+        self.armed = False
+        self.profile_cpu = True
+        self.trace_memory = True
+        # 分析结束时调用，例如通知界面展示结果
+        self.on_finished: Optional[Callable[[], Any]] = None
+        self.active = False
+        self.label = ''
+        self.seconds = 0.0
+        self.stats: Optional[pstats.Stats] = None
+        self.memory_diff: List[tracemalloc.StatisticDiff] = []
+        self._profiles: List[cProfile.Profile] = []
+        self._main_profile: Optional[cProfile.Profile] = None
+        self._snapshot_before: Optional[tracemalloc.Snapshot] = None
+        self._started_tracemalloc = False
+        self._start = 0.0
+
+    def arm(self,
+            cpu: bool = True,
+            memory: bool = True) -> None:
+        """
+        分析下一次操作。
+
+        :param cpu: 是否分析函数耗时。
+        :type cpu: bool
+        :param memory: 是否对比内存分配。
+        :type memory: bool
+        :rtype: None
+        :return: 无返回值。
+        """
+        with self._lock:
+            self.armed = cpu or memory
+            self.profile_cpu = cpu
+            self.trace_memory = memory
+
+    def disarm(self) -> None:
+        """
+        取消尚未开始的分析。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        with self._lock:
+            self.armed = False
+
+    def begin(self, label: str) -> bool:
+        """
+        已经准备好时开始分析，并分析当前线程。
+
+        :param label: 被分析操作的名称。
+        :type label: str
+        :rtype: bool
+        :return: 开始了新的分析返回 True，没有准备或已经在分析时返回 False。
+        """
+        with self._lock:
+            if not self.armed or self.active:
+                return False
+            self.armed = False
+            self.active = True
+            self.label = label
+            self._profiles = []
+        if self.trace_memory:
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+            self._snapshot_before = tracemalloc.take_snapshot()
+        if self.profile_cpu:
+            self._main_profile = self._enable_profile()
+        self._start = time.perf_counter()
+        logger.info("Profiling '%s' started", label)
+        return True
+
+    def end(self) -> bool:
+        """
+        结束分析，整理结果后调用 `on_finished`。必须在调用 `begin` 的线程中调用。
+
+        :rtype: bool
+        :return: 结束了一次分析返回 True，没有在分析时返回 False。
+        """
+        with self._lock:
+            if not self.active:
+                return False
+        self.seconds = time.perf_counter() - self._start
+        if self._main_profile is not None:
+            self._main_profile.disable()
+            self._main_profile = None
+        with self._lock:
+            profiles = self._profiles
+            self._profiles = []
+        self.stats = None
+        for profile in profiles:
+            try:
+                if self.stats is None:
+                    self.stats = pstats.Stats(profile)
+                else:
+                    self.stats.add(profile)
+            except TypeError:
+                # 没有记录到任何调用的分析器无法生成统计
+                pass
+        self.memory_diff = []
+        if self._snapshot_before is not None:
+            snapshot_after = tracemalloc.take_snapshot()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+            # 排除 tracemalloc 自身和导入机制的分配
+            filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, '<frozen importlib._bootstrap*>')]
+            self.memory_diff = [diff for diff in snapshot_after.filter_traces(filters).compare_to(self._snapshot_before.filter_traces(filters), 'lineno')
+                                if diff.size_diff]
+            self._snapshot_before = None
+        with self._lock:
+            self.active = False
+        logger.info("Profiling '%s' finished in %.3f s", self.label, self.seconds)
+        if self.on_finished is not None:
+            self.on_finished()
+        return True
+
+    @contextmanager
+    def thread(self) -> Iterator[None]:
+        """
+        分析进行中时，同样分析当前线程。用于后台线程，没有在分析时不做任何事。
+        """
+        profile = self._enable_profile() if self.active and self.profile_cpu else None
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+
+    @contextmanager
+    def session(self, label: str) -> Iterator[bool]:
+        """
+        已经准备好时分析上下文中的操作。
+
+        :param label: 被分析操作的名称。
+        :type label: str
+        :return: 生成是否开始了新的分析。
+        """
+        started = self.begin(label)
+        try:
+            yield started
+        finally:
+            if started:
+                self.end()
+
+    def profiled(self, label: str) -> Callable:
+        """
+        装饰器，已经准备好时分析函数的下一次调用。
+
+        :param label: 被分析操作的名称。
+        :type label: str
+        :rtype: Callable
+        :return: 装饰器。
+        """
+
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs) -> Any:
+                with self.session(label):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def top_functions(self, limit: int) -> List[Tuple[str, int, str, int, float, float]]:
+        """
+        按累计耗时从高到低列出函数。
+
+        :param limit: 最多列出的函数数。
+        :type limit: int
+        :rtype: List[Tuple[str, int, str, int, float, float]]
+        :return: 每项为文件名、行号、函数名、调用次数、自身耗时和累计耗时，没有分析结果时为空列表。
+        """
+        if self.stats is None:
+            return []
+        rows = [(filename, lineno, name, calls, own_time, cumulative_time)
+                for (filename, lineno, name), (_, calls, own_time, cumulative_time, _) in self.stats.stats.items()]
+        rows.sort(key=lambda row: row[5], reverse=True)
+        return rows[:limit]
+
+    def top_allocations(self, limit: int) -> List[Tuple[str, int, int, int]]:
+        """
+        按新增内存从高到低列出分配位置。
+
+        :param limit: 最多列出的位置数。
+        :type limit: int
+        :rtype: List[Tuple[str, int, int, int]]
+        :return: 每项为文件名、行号、新增字节数和新增内存块数，没有对比结果时为空列表。
+        """
+        return [(diff.traceback[0].filename, diff.traceback[0].lineno, diff.size_diff, diff.count_diff)
+                for diff in self.memory_diff[:limit]]
+
+    def dump_stats(self, path: str) -> bool:
+        """
+        把函数统计保存为 `.pstats` 文件。
+
+        :param path: 文件路径。
+        :type path: str
+        :rtype: bool
+        :return: 保存成功返回 True，没有分析结果或保存失败返回 False。
+        """
+        if self.stats is None:
+            return False
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.stats.dump_stats(path)
+            logger.info(f"Profile stats saved to '{path}'")
+            return True
+        except Exception:
+            logger.exception(f"Failed to save profile stats to '{path}'")
+            return False
+
+    def _enable_profile(self) -> Optional[cProfile.Profile]:
+        """
+        为当前线程启用一个分析器，并加入结果列表。
+
+        :rtype: Optional[cProfile.Profile]
+        :return: 分析器。已有分析器覆盖所有线程时返回 None。
+        """
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12 起分析器对所有线程生效，同时只能启用一个
+            return None
+        with self._lock:
+            self._profiles.append(profile)
+        return profile
+
+
+# 全局实例，分析下一次操作
+profiler = RunProfiler()
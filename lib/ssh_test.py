@@ -11,8 +11,14 @@
 """
 
 import logging
+from typing import TYPE_CHECKING
 
-import paramiko
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import paramiko
+# 第一次测试时才加载 paramiko
+paramiko = lazy_import('paramiko')
 
 logger = logging.getLogger(__name__)
 
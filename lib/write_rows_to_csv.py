@@ -0,0 +1,44 @@
+"""
+这是一个Python文件，主要包含一个函数：`write_rows_to_csv`。
+
+`write_rows_to_csv` 函数把表头和一个逐行产生数据的可迭代对象写入已打开的文本文件。数据一边产生一边写出，不需要先把所有行放进内存，适合导出大表格。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import csv
+import io
+from typing import Iterable, Sequence, TextIO
+
+
+def write_rows_to_csv(file: TextIO,
+                      headers: Sequence[str],
+                      rows: Iterable[Sequence[str]]) -> int:
+    """
+    以 CSV 格式逐行写入数据。
+
+    :param file: 已打开的文本文件对象，应以 newline='' 打开。
+    :type file: TextIO
+    :param headers: 表头。
+    :type headers: Sequence[str]
+    :param rows: 逐行产生数据的可迭代对象，每行的列顺序与表头一致。
+    :type rows: Iterable[Sequence[str]]
+    :rtype: int
+    :return: 写入的数据行数，不含表头。
+
+    :example:
+    >>> buffer = io.StringIO(newline='')
+    >>> write_rows_to_csv(buffer, ['name', 'age'], iter([['Alice', '30'], ['Bob', '25']]))
+    2
+    >>> buffer.getvalue().splitlines()
+    ['name,age', 'Alice,30', 'Bob,25']
+    """
+    writer = csv.writer(file)
+    writer.writerow(headers)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
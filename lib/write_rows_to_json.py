@@ -0,0 +1,60 @@
+"""
+这是一个Python文件，主要包含一个函数：`write_rows_to_json`。
+
+`write_rows_to_json` 函数把逐行产生的数据写成一个 JSON 对象，键为行序号，值为以表头为键的字典。格式与 `json.dump(..., indent=2)` 的输出相同，但每次只序列化一行，内存占用与总行数无关。紧凑模式下不缩进、不换行，分隔符后也不加空格。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import io
+import json
+from typing import Iterable, Sequence, TextIO
+
+
+def write_rows_to_json(file: TextIO,
+                       headers: Sequence[str],
+                       rows: Iterable[Sequence[str]],
+                       compact: bool = False) -> int:
+    """
+    以 JSON 格式逐行写入数据。
+
+    :param file: 已打开的文本文件对象。
+    :type file: TextIO
+    :param headers: 表头，作为每行字典的键。
+    :type headers: Sequence[str]
+    :param rows: 逐行产生数据的可迭代对象，每行的列顺序与表头一致。
+    :type rows: Iterable[Sequence[str]]
+    :param compact: 是否使用紧凑格式。
+    :type compact: bool
+    :rtype: int
+    :return: 写入的数据行数。
+
+    :example:
+    >>> buffer = io.StringIO()
+    >>> write_rows_to_json(buffer, ['name'], iter([['Alice'], ['Bob']]))
+    2
+    >>> json.loads(buffer.getvalue()) == {'0': {'name': 'Alice'}, '1': {'name': 'Bob'}}
+    True
+    >>> buffer = io.StringIO()
+    >>> _ = write_rows_to_json(buffer, ['name'], iter([['Alice'], ['Bob']]), compact=True)
+    >>> buffer.getvalue()
+    '{"0":{"name":"Alice"},"1":{"name":"Bob"}}'
+    """
+    if compact:
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        row_format, indent, end = '{comma}"{index}":{item}', '', '}'
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+        # 整体缩进两格，与一次性 dump 的结果保持一致
+        row_format, indent, end = '{comma}\n  "{index}": {item}', '\n  ', '\n}'
+    count = 0
+    file.write('{')
+    for count, row in enumerate(rows, start=1):
+        item = encoder.encode(dict(zip(headers, row)))
+        if indent:
+            item = item.replace('\n', indent)
+        file.write(row_format.format(comma=',' if count > 1 else '', index=count - 1, item=item))
+    file.write(end if count else '}')
+    return count
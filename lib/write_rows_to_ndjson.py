@@ -0,0 +1,48 @@
+"""
+这是一个Python文件，主要包含一个函数：`write_rows_to_ndjson`。
+
+`write_rows_to_ndjson` 函数把逐行产生的数据写成 NDJSON 格式，每行一个以表头为键的 JSON 对象。下游工具可以逐行读取，不需要先解析整个文件。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import io
+import json
+from typing import Iterable, Sequence, TextIO
+
+
+def write_rows_to_ndjson(file: TextIO,
+                         headers: Sequence[str],
+                         rows: Iterable[Sequence[str]],
+                         compact: bool = True) -> int:
+    """
+    以 NDJSON 格式逐行写入数据。
+
+    :param file: 已打开的文本文件对象。
+    :type file: TextIO
+    :param headers: 表头，作为每行对象的键。
+    :type headers: Sequence[str]
+    :param rows: 逐行产生数据的可迭代对象，每行的列顺序与表头一致。
+    :type rows: Iterable[Sequence[str]]
+    :param compact: 是否使用紧凑分隔符，去掉逗号和冒号后的空格。
+    :type compact: bool
+    :rtype: int
+    :return: 写入的数据行数。
+
+    :example:
+    >>> buffer = io.StringIO()
+    >>> write_rows_to_ndjson(buffer, ['name', 'age'], iter([['Alice', '30'], ['Bob', '25']]))
+    2
+    >>> buffer.getvalue().splitlines()
+    ['{"name":"Alice","age":"30"}', '{"name":"Bob","age":"25"}']
+    """
+    separators = (',', ':') if compact else (', ', ': ')
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=separators)
+    count = 0
+    for row in rows:
+        file.write(encoder.encode(dict(zip(headers, row))))
+        file.write('\n')
+        count += 1
+    return count
@@ -0,0 +1,161 @@
+"""
+这个模块提供了服务名索引，用于在结果逐行插入表格时，增量维护每个服务的行号标识和各状态计数。
+
+本模块的主要内容是 `AppIndex` 类。过滤栏通过它获取排好序的服务名列表、每个服务的行数和状态统计，并直接定位某个服务对应的所有行，而不需要再扫描整张表格。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+from array import array
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AppIndex:
+    """
+    服务名索引。
+
+    以服务名为键，记录该服务所有行的行号标识、一致性状态计数和忽略计数。每插入一行调用一次 `add`，开销为 O(1)。
+
+    :example:
+    >>> index = AppIndex()
+    >>> index.add('web', 0, 'fully', 'no')
+    >>> index.add('api', 1, 'inconsistent', 'yes')
+    >>> index.add('web', 2, 'partially', 'no')
+    >>> index.names()
+    ['api', 'web']
+    >>> list(index.rows('web')), index.row_count('web')
+    ([0, 2], 2)
+    >>> index.status_counts('api')
+    {'fully': 0, 'partially': 0, 'inconsistent': 1, 'unknown': 0, 'skip': 1}
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, array] = {}
+        self._consistency: Dict[str, Dict[str, int]] = {}
+        self._skipped: Dict[str, int] = {}
+        # 排序后的服务名缓存，出现新服务名时失效
+        self._names: Optional[List[str]] = None
+
+    def add(self,
+            name: str,
+            row_id: int,
+            consistency_status: str,
+            skip_status: str) -> None:
+        """
+        向索引中加入一行。
+
+        :param name: 服务名。
+        :type name: str
+        :param row_id: 行号标识。
+        :type row_id: int
+        :param consistency_status: 一致性状态，例如 'fully'。
+        :type consistency_status: str
+        :param skip_status: 忽略状态，'yes' 或 'no'。
+        :type skip_status: str
+        :rtype: None
+        :return: 无返回值。
+        """
+        rows = self._rows.get(name)
+        if rows is None:
+            rows = self._rows[name] = array('I')
+            self._consistency[name] = {'fully': 0, 'partially': 0, 'inconsistent': 0, 'unknown': 0}
+            self._skipped[name] = 0
+            self._names = None
+        rows.append(row_id)
+        counts = self._consistency[name]
+        consistency_status = consistency_status if consistency_status in counts else 'unknown'
+        counts[consistency_status] += 1
+        if skip_status == 'yes':
+            self._skipped[name] += 1
+
+    def update_skip(self,
+                    name: str,
+                    old_status: str,
+                    new_status: str) -> None:
+        """
+        忽略状态变化时更新计数。
+
+        :param name: 服务名。
+        :type name: str
+        :param old_status: 原忽略状态。
+        :type old_status: str
+        :param new_status: 新忽略状态。
+        :type new_status: str
+        :rtype: None
+        :return: 无返回值。
+        """
+        if name not in self._skipped or old_status == new_status:
+            return
+        if new_status == 'yes':
+            self._skipped[name] += 1
+        elif old_status == 'yes':
+            self._skipped[name] -= 1
+
+    def names(self) -> List[str]:
+        """
+        获取排好序的服务名列表。
+
+        :rtype: List[str]
+        :return: 服务名列表。
+        """
+        if self._names is None:
+            self._names = sorted(self._rows)
+        return self._names
+
+    def rows(self, name: str) -> array:
+        """
+        获取服务对应的所有行号标识。
+
+        :param name: 服务名。
+        :type name: str
+        :rtype: array
+        :return: 行号标识数组，服务不存在时为空数组。
+        """
+        return self._rows.get(name, array('I'))
+
+    def row_count(self, name: str) -> int:
+        """
+        获取服务的行数。
+
+        :param name: 服务名。
+        :type name: str
+        :rtype: int
+        :return: 行数。
+        """
+        return len(self._rows.get(name, ()))
+
+    def status_counts(self, name: str) -> Dict[str, int]:
+        """
+        获取服务的各状态计数。
+
+        :param name: 服务名。
+        :type name: str
+        :rtype: Dict[str, int]
+        :return: 一致性状态计数，另加键 'skip' 为忽略行数。
+        """
+        counts = dict(self._consistency.get(name, {}))
+        counts['skip'] = self._skipped.get(name, 0)
+        return counts
+
+    def clear(self) -> None:
+        """
+        清空索引。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        self._rows.clear()
+        self._consistency.clear()
+        self._skipped.clear()
+        self._names = None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
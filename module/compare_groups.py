@@ -0,0 +1,79 @@
+"""
+这个模块提供了同一环境内重复配置的查找功能。
+
+`compare_groups` 函数直接读取 `ResultStore` 的列，对每个环境按（配置键编号，配置值编号）分组。编号来自字符串表，分组时只做整数哈希，不需要拼接字符串。结果以行号标识数组的形式返回，展示时再从存储中取值。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+from array import array
+from typing import Dict, List, Optional, Callable
+
+from module.result_store import ResultStore
+
+logger = logging.getLogger(__name__)
+
+# 参与对比的环境值列
+ENV_COLUMNS = ['pro_value', 'pre_value', 'test_value', 'dev_value']
+
+
+def compare_groups(store: ResultStore,
+                   progress_callback: Optional[Callable[[int], None]] = None,
+                   cancel_callback: Optional[Callable[[], bool]] = None) -> Optional[Dict[str, List[array]]]:
+    """
+    在每个环境内，查找配置键和配置值都相同的行。
+
+    值为 'None' 的行不参与对比，只出现一次的组合会被过滤掉。
+
+    :param store: 查询结果存储。
+    :type store: ResultStore
+    :param progress_callback: 可选，进度回调，参数为 0 到 100 的整数。
+    :type progress_callback: Optional[Callable[[int], None]]
+    :param cancel_callback: 可选，返回 True 时中止对比。
+    :type cancel_callback: Optional[Callable[[], bool]]
+    :return: 以环境值列名为键，值为分组列表，每组是行号标识数组。中止或出错时返回 None。
+    :rtype: Optional[Dict[str, List[array]]]
+
+    :example:
+    >>> s = ResultStore()
+    >>> for name, value in [('a', '1'), ('b', '1'), ('c', '2')]:
+    ...     _ = s.append([name, 'application', 'port', value] + ['None'] * 7 + ['fully', 'no'])
+    >>> [list(group) for group in compare_groups(s)['pro_value']]
+    [[0, 1]]
+    """
+    try:
+        row_count = len(store)
+        total = row_count * len(ENV_COLUMNS)
+        # 大约每 1% 报告一次进度
+        step = max(total // 100, 1)
+        done = 0
+        none_code = store.find_code('None')
+        key_column = store.columns['key']
+        result = {}
+
+        for env_column in ENV_COLUMNS:
+            grouped = {}
+            value_column = store.columns[env_column]
+            for start in range(0, row_count, step):
+                if cancel_callback is not None and cancel_callback():
+                    return None
+                end = min(start + step, row_count)
+                for row_id in range(start, end):
+                    value_code = value_column[row_id]
+                    if value_code == none_code:
+                        continue
+                    # 两个编号合成一个整数作为分组键
+                    grouped.setdefault((key_column[row_id] << 32) | value_code, []).append(row_id)
+                done += end - start
+                if progress_callback is not None:
+                    progress_callback(done * 100 // total)
+            result[env_column] = [array('I', rows) for rows in grouped.values() if len(rows) > 1]
+            logger.debug(f"{env_column}: {len(result[env_column])} duplicate groups found")
+
+        return result
+    except Exception:
+        logger.exception("Error occurred while grouping results for comparison")
+        return None
@@ -60,5 +60,5 @@ def determine_consistency_status(values: List[str],
         # 其他所有情况。
         return 'inconsistent'
     except Exception:
-        logger.exception(f"Error occurred in determining consistency status. Error config: {config}")
+        logger.exception("Error occurred in determining consistency status. Error config: %s", config)
         return 'unknown'
@@ -0,0 +1,119 @@
+"""
+这个模块提供了两次查询结果之间的差异比较功能。
+
+主要功能是 `diff_results` 函数。它对比前后两次 `execute_queries` 得到的格式化结果，只返回发生变化的部分：新增的配置、删除的配置、配置值的变化，以及一致性状态和忽略状态的转换。监视模式用它在每次轮询后只输出变化。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+from typing import Dict, List, Any
+
+logger = logging.getLogger(__name__)
+
+# 参与值比较的环境键
+ENV_KEYS = ['PRO_CONFIG', 'PRE_CONFIG', 'TEST_CONFIG', 'DEV_CONFIG']
+# 参与状态转换比较的键
+STATUS_KEYS = ['consistency_status', 'skip_status']
+
+
+def diff_results(old_results: Dict[str, Dict[str, str]],
+                 new_results: Dict[str, Dict[str, str]]) -> List[Dict[str, Any]]:
+    """
+    比较前后两次格式化查询结果，返回变化事件列表。
+
+    事件是字典，'event' 键为 'added'、'removed'、'changed' 或 'status'，'id' 键为结果字典中的键，另带服务名、分组和配置键。'changed' 事件的 'changes' 以环境键为键，值为 [旧值, 新值]；'status' 事件的 'changes' 以状态键为键。修改时间不单独产生事件。
+
+    :param old_results: 上一次的格式化查询结果。
+    :type old_results: Dict[str, Dict[str, str]]
+    :param new_results: 本次的格式化查询结果。
+    :type new_results: Dict[str, Dict[str, str]]
+    :return: 变化事件列表，顺序为删除、新增、值变化和状态变化。
+    :rtype: List[Dict[str, Any]]
+
+    :example:
+    >>> old = {'a+app+k': {'app_id': 'a', 'namespace_name': 'app', 'key': 'k', 'PRO_CONFIG': '1', 'consistency_status': 'fully', 'skip_status': 'no'}}
+    >>> new = {'a+app+k': {'app_id': 'a', 'namespace_name': 'app', 'key': 'k', 'PRO_CONFIG': '2', 'consistency_status': 'inconsistent', 'skip_status': 'no'}}
+    >>> [(event['event'], event['changes']) for event in diff_results(old, new)]
+    [('changed', {'PRO_CONFIG': ['1', '2']}), ('status', {'consistency_status': ['fully', 'inconsistent']})]
+    >>> [event['event'] for event in diff_results(old, {})]
+    ['removed']
+    """
+    removed, added, changed, status = [], [], [], []
+    try:
+        for result_id, old_result in old_results.items():
+            if result_id not in new_results:
+                removed.append(_make_event('removed', result_id, old_result))
+
+        for result_id, new_result in new_results.items():
+            old_result = old_results.get(result_id)
+            if old_result is None:
+                added.append(_make_event('added', result_id, new_result))
+                continue
+
+            value_changes = _compare_keys(old_result, new_result, ENV_KEYS)
+            if value_changes:
+                changed.append(_make_event('changed', result_id, new_result, value_changes))
+            status_changes = _compare_keys(old_result, new_result, STATUS_KEYS)
+            if status_changes:
+                status.append(_make_event('status', result_id, new_result, status_changes))
+    except Exception:
+        logger.exception("Error occurred while comparing query results")
+    return removed + added + changed + status
+
+
+def _compare_keys(old_result: Dict[str, str],
+                  new_result: Dict[str, str],
+                  keys: List[str]) -> Dict[str, List[str]]:
+    """
+    比较两行结果中指定键的值。缺少的键按 'None' 处理，与表格中的显示一致。
+
+    :param old_result: 旧的一行结果。
+    :type old_result: Dict[str, str]
+    :param new_result: 新的一行结果。
+    :type new_result: Dict[str, str]
+    :param keys: 要比较的键。
+    :type keys: List[str]
+    :return: 值不同的键，值为 [旧值, 新值]。
+    :rtype: Dict[str, List[str]]
+    """
+    changes = {}
+    for key in keys:
+        old_value, new_value = str(old_result.get(key, 'None')), str(new_result.get(key, 'None'))
+        if old_value != new_value:
+            changes[key] = [old_value, new_value]
+    return changes
+
+
+def _make_event(event: str,
+                result_id: str,
+                result: Dict[str, str],
+                changes: Dict[str, List[str]] = None) -> Dict[str, Any]:
+    """
+    生成一条变化事件。新增和删除事件带上该行全部环境的值。
+
+    :param event: 事件类型。
+    :type event: str
+    :param result_id: 结果字典中的键。
+    :type result_id: str
+    :param result: 该行结果。
+    :type result: Dict[str, str]
+    :param changes: 变化内容，新增和删除事件不传。
+    :type changes: Dict[str, List[str]]
+    :return: 变化事件。
+    :rtype: Dict[str, Any]
+    """
+    item = {
+        'event': event,
+        'id': result_id,
+        'app_id': result.get('app_id'),
+        'namespace_name': result.get('namespace_name'),
+        'key': result.get('key'),
+    }
+    if changes is None:
+        item['values'] = {key: result.get(key, 'None') for key in ENV_KEYS + STATUS_KEYS}
+    else:
+        item['changes'] = changes
+    return item
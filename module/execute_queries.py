@@ -3,6 +3,8 @@
 
 本模块包含 `execute_queries` 函数，用于执行数据库查询并处理结果。此外，还包括与查询结果格式化、状态更新相关的辅助函数。该模块适用于需要执行跨多个数据库环境的统一查询和结果处理的场景。
 
+传入查询缓存时，每个环境先执行一次数据指纹查询，指纹与缓存中的一致就沿用缓存的查询结果，不再拉取全部数据。监视模式用它在数据没有变化的环境上节省查询。
+
 :author: assassing
 :contact: https://github.com/hxz393
 :copyright: Copyright 2023, hxz393. 保留所有权利。
@@ -10,19 +12,22 @@
 
 import logging
 import os
-from typing import Dict, Tuple, Union
+from typing import Dict, Tuple, Union, Optional, Any
 
+from lib.run_metrics import metrics
 from module.format_query_results import format_query_results
 from module.get_query_result import get_query_result
-from module.get_query_sql import get_query_sql
+from module.get_query_sql import get_query_sql, get_fingerprint_sql
 from module.update_consistency_status import update_consistency_status
 from module.update_skip_status import update_skip_status
 
 logger = logging.getLogger(__name__)
 
 
+@metrics.traced('execute_queries')
 def execute_queries(config_connection: Dict[str, Dict[str, Union[Dict[str, str], bool]]],
-                    config_main: Dict[str, str]) -> Tuple[Dict[str, Dict[str, str]], Dict[str, bool]]:
+                    config_main: Dict[str, str],
+                    query_cache: Optional[Dict[str, Dict[str, Any]]] = None) -> Tuple[Dict[str, Dict[str, str]], Dict[str, bool]]:
     """
     执行数据库查询并返回格式化后的结果和查询状态。
 
@@ -32,6 +37,8 @@ def execute_queries(config_connection: Dict[str, Dict[str, Union[Dict[str, str],
     :type config_connection: Dict[str, Dict[str, Union[Dict[str, str], bool]]]
     :param config_main: 主要配置参数，用于生成查询SQL语句。
     :type config_main: Dict[str, str]
+    :param query_cache: 可选，查询缓存。键为环境名，值为包含 'fingerprint' 和 'results' 的字典，会被就地更新。
+    :type query_cache: Optional[Dict[str, Dict[str, Any]]]
     :return: 包含格式化查询结果的字典和每个环境的查询状态。
     :rtype: Tuple[Dict[str, Dict[str, str]], Dict[str, bool]]
 
@@ -50,25 +57,73 @@ def execute_queries(config_connection: Dict[str, Dict[str, Union[Dict[str, str],
 
     try:
         query_sql = get_query_sql(config_main)
+        fingerprint_sql = get_fingerprint_sql(config_main) if query_cache is not None else None
 
         for env_name, db_config in config_connection.items():
-            # 获取指定环境的查询结果
-            query_results = get_query_result(db_config, query_sql)
-            logger.debug(f"ENV: {env_name}, SQL query finished.")
-            if query_results:
-                query_statuses[env_name] = True
-                # 格式化查询结果
-                format_query_results(query_results, env_name, config_main, formatted_results)
-            else:
-                logger.warning(f"No results obtained from database query for environment: {env_name}")
+            # 连接、查询和格式化的耗时与计数都计入当前环境
+            with metrics.environment(env_name):
+                # 获取指定环境的查询结果
+                if fingerprint_sql:
+                    query_results = _get_cached_query_result(env_name, db_config, query_sql, fingerprint_sql, query_cache)
+                else:
+                    query_results = get_query_result(db_config, query_sql)
+                logger.debug("ENV: %s, SQL query finished.", env_name)
+                if query_results:
+                    query_statuses[env_name] = True
+                    metrics.count('rows', len(query_results))
+                    # 配置值或 Nacos 配置内容都是倒数第二个字段
+                    metrics.count('bytes', sum(len(row[-2].encode('utf-8')) for row in query_results if isinstance(row[-2], str)))
+                    # 格式化查询结果
+                    with metrics.span('format'):
+                        format_query_results(query_results, env_name, config_main, formatted_results)
+                else:
+                    logger.warning("No results obtained from database query for environment: %s", env_name)
 
         # 通过对比过滤列表，得到是否过滤信息，更新到结果字典
-        update_skip_status(formatted_results)
+        with metrics.span('skip'):
+            update_skip_status(formatted_results)
         # 查询各配置环境的值，得到一致性信息，更新到结果字典。只对比查询成功的环境
-        update_consistency_status(formatted_results, query_statuses)
+        with metrics.span('consistency'):
+            update_consistency_status(formatted_results, query_statuses)
+        metrics.count('results', len(formatted_results))
         logger.debug("Status update finished.")
 
         return formatted_results, query_statuses
     except Exception:
         logger.exception("Exception occurred during executing queries")
         return {}, query_statuses
+
+
+def _get_cached_query_result(env_name: str,
+                             db_config: Dict[str, Union[Dict[str, str], bool]],
+                             query_sql: str,
+                             fingerprint_sql: str,
+                             query_cache: Dict[str, Dict[str, Any]]) -> Any:
+    """
+    先查询数据指纹，指纹未变化时返回缓存的查询结果，否则重新查询并更新缓存。
+
+    :param env_name: 环境名。
+    :type env_name: str
+    :param db_config: 环境的数据库配置。
+    :type db_config: Dict[str, Union[Dict[str, str], bool]]
+    :param query_sql: 完整查询语句。
+    :type query_sql: str
+    :param fingerprint_sql: 数据指纹查询语句。
+    :type fingerprint_sql: str
+    :param query_cache: 查询缓存，会被就地更新。
+    :type query_cache: Dict[str, Dict[str, Any]]
+    :return: 查询结果。
+    :rtype: Any
+    """
+    fingerprint = get_query_result(db_config, fingerprint_sql)
+    cached = query_cache.get(env_name)
+    if fingerprint and cached and cached['fingerprint'] == fingerprint:
+        logger.debug("ENV: %s, data unchanged, reuse cached query result.", env_name)
+        return cached['results']
+
+    query_results = get_query_result(db_config, query_sql)
+    if fingerprint and query_results:
+        query_cache[env_name] = {'fingerprint': fingerprint, 'results': query_results}
+    else:
+        query_cache.pop(env_name, None)
+    return query_results
@@ -0,0 +1,145 @@
+"""
+这个模块提供了跨服务的相似配置值查找功能。
+
+`find_similar_groups` 为每个不同的配置值计算 MinHash 签名，再把签名切成若干段做局部敏感哈希（LSH）分桶。只有落在同一个桶里的值才会互相比较，不需要两两对比所有值，因此可以处理十万级以上的配置值。
+
+分组以代表值为中心：按行的顺序处理各个值，每个值与同桶中所有组的代表值比较，加入最相似且达到阈值的组，没有时自己成为新组的代表值。组内每个值都与代表值相似，不会像逐对合并那样经过一串相似的值把差别很大的值连成一组；代价是两个彼此相似、但分别更接近不同代表值的值会留在不同的组。大量相近的值（例如 JDBC 连接串、主机名）会让同一个桶里积累很多代表值，因此每个桶只与最近加入的 `SIMILAR_BUCKET_LEADERS` 个代表值比较，比较次数与值的数量成正比。只保留包含至少两个不同值、且来自至少两个服务的组。例如只有主机地址不同的 JDBC 连接串，适合整理为公共配置。返回格式与 `compare_groups` 相同，可直接用查重结果对话框展示。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+from array import array
+from typing import Dict, List, Optional, Callable
+
+from config.settings import SIMILAR_THRESHOLD, SIMILAR_NUM_PERM, SIMILAR_BANDS, SIMILAR_SHINGLE_SIZE, SIMILAR_MIN_LENGTH, SIMILAR_BUCKET_LEADERS
+from lib.minhash import minhash_signature, signature_similarity
+from module.compare_groups import ENV_COLUMNS
+from module.result_store import ResultStore
+
+logger = logging.getLogger(__name__)
+
+
+def find_similar_groups(store: ResultStore,
+                        progress_callback: Optional[Callable[[int], None]] = None,
+                        cancel_callback: Optional[Callable[[], bool]] = None,
+                        threshold: float = SIMILAR_THRESHOLD,
+                        num_perm: int = SIMILAR_NUM_PERM,
+                        bands: int = SIMILAR_BANDS,
+                        max_leaders: int = SIMILAR_BUCKET_LEADERS) -> Optional[Dict[str, List[array]]]:
+    """
+    在每个环境内，查找来自不同服务的相似配置值。
+
+    值为 'None' 或长度小于 `SIMILAR_MIN_LENGTH` 的行不参与查找。完全相同的值不单独成组，那是配置查重的工作。
+
+    :param store: 查询结果存储。
+    :type store: ResultStore
+    :param progress_callback: 可选，进度回调，参数为 0 到 100 的整数。
+    :type progress_callback: Optional[Callable[[int], None]]
+    :param cancel_callback: 可选，返回 True 时中止查找。
+    :type cancel_callback: Optional[Callable[[], bool]]
+    :param threshold: 相似度阈值，签名估算的 Jaccard 相似度不低于此值才算相似。
+    :type threshold: float
+    :param num_perm: 签名长度。
+    :type num_perm: int
+    :param bands: LSH 分段数，须能整除签名长度。
+    :type bands: int
+    :param max_leaders: 每个桶最多比较的代表值数，取最近加入的。
+    :type max_leaders: int
+    :return: 以环境值列名为键，值为分组列表，每组是行号标识数组。中止或出错时返回 None。
+    :rtype: Optional[Dict[str, List[array]]]
+
+    :example:
+    >>> s = ResultStore()
+    >>> for name, value in [('a', 'jdbc:mysql://10.0.0.1:3306/order'), ('b', 'jdbc:mysql://10.0.0.2:3306/order'), ('c', 'redis://cache')]:
+    ...     _ = s.append([name, 'application', 'url', value] + ['None'] * 7 + ['fully', 'no'])
+    >>> [list(group) for group in find_similar_groups(s)['pro_value']]
+    [[0, 1]]
+    """
+    try:
+        rows_per_band = num_perm // bands
+        name_column = store.columns['name']
+        none_code = store.find_code('None')
+
+        # 先按值编号收集各环境的行，相同的值只计算一次签名
+        env_values: Dict[str, Dict[int, List[int]]] = {}
+        for env_column in ENV_COLUMNS:
+            value_rows = env_values[env_column] = {}
+            for row_id, value_code in enumerate(store.columns[env_column]):
+                if value_code != none_code:
+                    value_rows.setdefault(value_code, []).append(row_id)
+
+        # 计算签名，不同环境中相同的值共用签名。这一阶段占进度的前一半
+        signatures: Dict[int, Optional[array]] = {}
+        distinct_codes = set().union(*env_values.values())
+        total = max(len(distinct_codes), 1)
+        step = max(total // 50, 1)
+        for done, value_code in enumerate(distinct_codes, start=1):
+            text = store.strings[value_code]
+            signatures[value_code] = (minhash_signature(text, num_perm, SIMILAR_SHINGLE_SIZE)
+                                      if len(text) >= SIMILAR_MIN_LENGTH else None)
+            if done % step == 0:
+                if cancel_callback is not None and cancel_callback():
+                    return None
+                if progress_callback is not None:
+                    progress_callback(done * 50 // total)
+
+        # 分组占进度的后一半，按各环境参与分组的值数计算
+        env_codes = {env_column: [code for code in value_rows if signatures[code] is not None]
+                     for env_column, value_rows in env_values.items()}
+        total = max(sum(len(codes) for codes in env_codes.values()), 1)
+        step = max(total // 50, 1)
+        done = 0
+        result = {}
+        for env_column, value_rows in env_values.items():
+            codes = env_codes[env_column]
+            # 各组的值，键为代表值
+            clusters: Dict[int, List[int]] = {}
+            # LSH 分桶，每段一个字典，桶中只放代表值
+            buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+            for code in codes:
+                done += 1
+                if done % step == 0:
+                    if cancel_callback is not None and cancel_callback():
+                        return None
+                    if progress_callback is not None:
+                        progress_callback(50 + done * 50 // total)
+                signature = signatures[code]
+                band_keys = [signature[band * rows_per_band:(band + 1) * rows_per_band].tobytes() for band in range(bands)]
+                # 与同桶中最近加入的代表值比较，选出最相似的一个
+                best, best_similarity = None, threshold
+                checked = set()
+                for band_buckets, band_key in zip(buckets, band_keys):
+                    for leader in band_buckets.get(band_key, [])[-max_leaders:]:
+                        if leader in checked:
+                            continue
+                        checked.add(leader)
+                        similarity = signature_similarity(signatures[leader], signature)
+                        if similarity >= best_similarity:
+                            best, best_similarity = leader, similarity
+                if best is not None:
+                    clusters[best].append(code)
+                    continue
+                clusters[code] = [code]
+                for band_buckets, band_key in zip(buckets, band_keys):
+                    band_buckets.setdefault(band_key, []).append(code)
+
+            env_groups = []
+            for cluster in clusters.values():
+                if len(cluster) < 2:
+                    continue
+                rows = [row_id for code in cluster for row_id in value_rows[code]]
+                if len({name_column[row_id] for row_id in rows}) < 2:
+                    continue
+                env_groups.append(array('I', rows))
+            result[env_column] = env_groups
+            logger.debug(f"{env_column}: {len(env_groups)} similar groups found")
+
+        if progress_callback is not None:
+            progress_callback(100)
+        return result
+    except Exception:
+        logger.exception("Error occurred while finding similar values")
+        return None
@@ -51,5 +51,5 @@ def format_apollo_result(app_id: str,
             }
         }
     except Exception:
-        logger.exception(f"Error occurred while formatting Apollo result: {env_name}, {app_id}, {namespace_name}")
+        logger.exception("Error occurred while formatting Apollo result: %s, %s, %s", env_name, app_id, namespace_name)
         return None
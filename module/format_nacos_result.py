@@ -10,11 +10,15 @@
 
 import datetime
 import logging
-from typing import Optional, Dict, Tuple
-
-import yaml
+from typing import Optional, Dict, Tuple, TYPE_CHECKING
 
 from lib.dict_flatten import dict_flatten
+from lib.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import yaml
+# 只有 Nacos 需要解析 YAML，第一次使用时才加载
+yaml = lazy_import('yaml')
 
 logger = logging.getLogger(__name__)
 
@@ -50,13 +54,13 @@ def format_nacos_result(app_id: str,
         yaml_content = yaml.safe_load(content)
         # yaml解析返回None或非字典，则打印警告，直接返回
         if not yaml_content or not isinstance(yaml_content, dict):
-            logger.warning(f"Failed to parse yaml content:\n  {content}\nYAML content:\n  {yaml_content}\nfor app:\n  {env_name}, {app_id}, {namespace_name}")
+            logger.warning("Failed to parse yaml content:\n  %s\nYAML content:\n  %s\nfor app:\n  %s, %s, %s", content, yaml_content, env_name, app_id, namespace_name)
             return None
 
         # 尝试将多重嵌套的字典，打平成properties格式。返回多个键值对的字典
         keys_and_values = dict_flatten(yaml_content)
         if not keys_and_values:
-            logger.warning(f"Error flattening yaml content for:\n  {yaml_content}\nfor app:\n  {env_name}, {app_id}, {namespace_name}")
+            logger.warning("Error flattening yaml content for:\n  %s\nfor app:\n  %s, %s, %s", yaml_content, env_name, app_id, namespace_name)
             return None
 
         return {
@@ -70,5 +74,5 @@ def format_nacos_result(app_id: str,
             for key, value in keys_and_values.items()
         }
     except Exception:
-        logger.exception(f"Error occurred while formatting Nacos result: {env_name}, {app_id}, {namespace_name}")
+        logger.exception("Error occurred while formatting Nacos result: %s, %s, %s", env_name, app_id, namespace_name)
         return None
@@ -10,8 +10,10 @@
 
 import datetime
 import logging
+import time
 from typing import Dict, Tuple, Union
 
+from lib.run_metrics import metrics
 from module.format_apollo_result import format_apollo_result
 from module.format_nacos_result import format_nacos_result
 from module.merge_formatted_results import merge_formatted_results
@@ -55,6 +57,8 @@ def format_query_results(query_results: Union[Tuple[Tuple[str, str, str, str, da
         suffixes = config_main['fix_name_right'].split()
         replacements = dict(zip(config_main['fix_name_before'].split(), config_main['fix_name_after'].split()))
 
+        # 合并的耗时单独累计，循环结束后一次记录
+        merge_seconds, merge_count = 0.0, 0
         for single_query_result in query_results:
             name, namespace_name, *rest = single_query_result
             # 处理app_id字段
@@ -70,9 +74,14 @@ def format_query_results(query_results: Union[Tuple[Tuple[str, str, str, str, da
 
             if formatted_result:
                 # 合并单条格式化字典到总字典
+                merge_start = time.perf_counter()
                 merge_formatted_results(formatted_results, formatted_result)
+                merge_seconds += time.perf_counter() - merge_start
+                merge_count += 1
             else:
-                logger.error(f'Formatting error for result: {single_query_result}')
+                metrics.count('parse_failures')
+                logger.error('Formatting error for result: %s', single_query_result)
+        metrics.add_time('merge', merge_seconds, merge_count)
 
     except Exception:
         logger.exception(f"Unexpected error during formatting query results. ENV name: {env_name}")
@@ -0,0 +1,35 @@
+"""
+这个模块用于找出查询失败的环境。
+
+此模块包含 `get_failed_envs` 函数。`execute_queries` 返回的查询状态中，没有开启的环境（`mysql_on` 为 False）同样为 False，但它们并不是查询失败。监视模式判断是否跳过比较、运行历史判断是否沿用上一次的值时，都只应考虑开启了但没有查到结果的环境。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+from typing import Dict, List, Mapping, Any
+
+logger = logging.getLogger(__name__)
+
+
+def get_failed_envs(config_connection: Mapping[str, Mapping[str, Any]],
+                    query_statuses: Dict[str, bool]) -> List[str]:
+    """
+    返回已开启但查询失败的环境名。
+
+    :param config_connection: 数据库连接配置，键为环境名。
+    :type config_connection: Mapping[str, Mapping[str, Any]]
+    :param query_statuses: `execute_queries` 返回的各环境查询状态。
+    :type query_statuses: Dict[str, bool]
+    :rtype: List[str]
+    :return: 查询失败的环境名列表，按连接配置中的顺序排列。
+
+    :example:
+    >>> connection = {'PRO_CONFIG': {'mysql_on': True}, 'PRE_CONFIG': {'mysql_on': True}, 'DEV_CONFIG': {'mysql_on': False}}
+    >>> get_failed_envs(connection, {'PRO_CONFIG': True, 'PRE_CONFIG': False, 'DEV_CONFIG': False})
+    ['PRE_CONFIG']
+    """
+    return [env_name for env_name, db_config in config_connection.items()
+            if db_config.get('mysql_on', False) and not query_statuses.get(env_name, False)]
@@ -1,7 +1,7 @@
 """
 此模块用于处理配置中心相关的查询，包括从不同的配置中心获取 SQL 查询语句。
 
-本模块提供了 `get_query_sql` 函数，用于根据配置中心类型和 Apollo 应用名称获取对应的查询 SQL。支持从 Nacos 和 Apollo 配置中心获取数据。
+本模块提供了 `get_query_sql` 函数，用于根据配置中心类型和 Apollo 应用名称获取对应的查询 SQL。支持从 Nacos 和 Apollo 配置中心获取数据。`get_fingerprint_sql` 函数返回用于判断数据是否变化的轻量查询。
 
 :author: assassing
 :contact: https://github.com/hxz393
@@ -11,7 +11,7 @@
 import logging
 from typing import Dict, Optional
 
-from config.settings import SQL_CONFIG_NACOS, SQL_CONFIG_APOLLO_ID, SQL_CONFIG_APOLLO_NAME, APOLLO_NAME_LIST
+from config.settings import SQL_CONFIG_NACOS, SQL_CONFIG_APOLLO_ID, SQL_CONFIG_APOLLO_NAME, APOLLO_NAME_LIST, SQL_FINGERPRINT_APOLLO, SQL_FINGERPRINT_NACOS
 
 logger = logging.getLogger(__name__)
 
@@ -48,3 +48,29 @@ def get_query_sql(config_main: Dict[str, str]) -> Optional[str]:
     except Exception:
         logger.exception("Error retrieving query SQL")
         return None
+
+
+def get_fingerprint_sql(config_main: Dict[str, str]) -> Optional[str]:
+    """
+    根据配置中心类型获取数据指纹查询 SQL。查询只返回行数和最后修改时间，用于判断是否需要重新拉取全部数据。
+
+    :param config_main: 包含配置中心类型的字典。
+    :type config_main: Dict[str, str]
+    :return: 对应的查询 SQL 语句。如果无法匹配到合适的配置中心，则返回 None。
+    :rtype: Optional[str]
+
+    :example:
+    >>> get_fingerprint_sql({"config_center": "Nacos"}) == SQL_FINGERPRINT_NACOS
+    True
+    """
+    try:
+        config_center = config_main.get('config_center')
+        if config_center == 'Nacos':
+            return SQL_FINGERPRINT_NACOS
+        elif config_center == 'Apollo':
+            return SQL_FINGERPRINT_APOLLO
+        else:
+            return None
+    except Exception:
+        logger.exception("Error retrieving fingerprint SQL")
+        return None
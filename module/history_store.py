@@ -0,0 +1,373 @@
+"""
+这个模块提供了运行历史的本地存储，保存在 SQLite 数据库中。
+
+`HistoryStore` 在每次运行后保存结果，但只记录与上一次相比发生变化的配置，不重复保存整张表：
+
+- `strings` 表：配置值去重后的字符串表，其他表只保存字符串编号。
+- `keys` 表：每个服务、分组、配置键一行，带唯一索引，并记录最近一次的值和状态。
+- `runs` 表：每次运行一行，记录时间、各状态的统计，以及新增、值变化、只有状态变化和删除的配置数。值变化的统计与 `drift_counts` 口径相同，不含只有状态变化的配置。
+- `changes` 表：配置在某次运行中新增、值变化、状态变化或删除时才有一行，记录变化后的值和状态。按配置键和运行编号组织，查询单个配置的时间线只需一次索引查找。
+
+修改时间不保存，变化发生的时间以运行时间为准。查询失败的环境沿用上一次的值，不会被记录为变化。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Iterable, Sequence, Any, Tuple
+
+from config.settings import HISTORY_PATH
+from module.result_store import COLUMN_KEYS
+
+logger = logging.getLogger(__name__)
+
+# 保存的环境值列，以及对应的查询状态键
+VALUE_COLUMNS = ['pro_value', 'pre_value', 'test_value', 'dev_value']
+ENV_NAMES = ['PRO_CONFIG', 'PRE_CONFIG', 'TEST_CONFIG', 'DEV_CONFIG']
+# 统计的状态
+STATUS_COUNTS = ['fully', 'partially', 'inconsistent', 'unknown', 'skip']
+# 统计的变化：新增、值变化、删除和只有状态变化
+RUN_COUNTS = ['added', 'changed', 'removed', 'status_changed']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS strings (
+  string_id INTEGER PRIMARY KEY,
+  text TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS keys (
+  key_id INTEGER PRIMARY KEY,
+  app_id TEXT NOT NULL,
+  namespace_name TEXT NOT NULL,
+  key TEXT NOT NULL,
+  pro_value INTEGER,
+  pre_value INTEGER,
+  test_value INTEGER,
+  dev_value INTEGER,
+  consistency TEXT,
+  skip TEXT,
+  present INTEGER NOT NULL DEFAULT 1,
+  UNIQUE (app_id, namespace_name, key)
+);
+CREATE TABLE IF NOT EXISTS runs (
+  run_id INTEGER PRIMARY KEY,
+  started_at TEXT NOT NULL,
+  row_count INTEGER NOT NULL,
+  fully INTEGER NOT NULL,
+  partially INTEGER NOT NULL,
+  inconsistent INTEGER NOT NULL,
+  unknown INTEGER NOT NULL,
+  skip INTEGER NOT NULL,
+  added INTEGER NOT NULL,
+  changed INTEGER NOT NULL,
+  removed INTEGER NOT NULL,
+  status_changed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS changes (
+  key_id INTEGER NOT NULL,
+  run_id INTEGER NOT NULL,
+  event TEXT NOT NULL,
+  pro_value INTEGER,
+  pre_value INTEGER,
+  test_value INTEGER,
+  dev_value INTEGER,
+  consistency TEXT,
+  skip TEXT,
+  PRIMARY KEY (key_id, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS changes_run ON changes (run_id, event);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+"""
+
+
+class HistoryStore:
+    """
+    运行历史存储。每次调用都打开独立的数据库连接，可以在任意线程中使用。
+
+    :param path: 数据库文件路径。
+    :type path: str
+
+    :example:
+    >>> import tempfile
+    >>> history = HistoryStore(os.path.join(tempfile.mkdtemp(), 'history.sqlite3'))
+    >>> row = ['web', 'application', 'port', '80', 'None', '80', 'None', 'None', 'None', 'None', 'None', 'fully', 'no']
+    >>> history.save_run([row], started_at='2023-12-01 10:00:00')
+    1
+    >>> history.save_run([row[:3] + ['81'] + row[4:11] + ['inconsistent', 'no']], started_at='2023-12-02 10:00:00')
+    2
+    >>> [(item['event'], item['pro_value'], item['consistency']) for item in history.key_timeline('web', 'application', 'port')]
+    [('added', '80', 'fully'), ('changed', '81', 'inconsistent')]
+    >>> history.status_since('web', 'application', 'port', 'inconsistent')
+    '2023-12-02 10:00:00'
+    >>> history.drift_counts(since='2023-12-01 00:00:00')
+    {'web': 1}
+    >>> history.save_run([], failed_envs=['PRE_CONFIG'], started_at='2023-12-03 10:00:00')
+    3
+    >>> history.list_runs(1)[0]['removed']
+    0
+    >>> history.save_run([], failed_envs=[], started_at='2023-12-04 10:00:00')
+    4
+    >>> history.list_runs(1)[0]['removed']
+    1
+    >>> history.save_run([row], started_at='2023-12-05 10:00:00'), history.save_run([row[:11] + ['inconsistent', 'no']], started_at='2023-12-06 10:00:00')
+    (5, 6)
+    >>> {name: history.list_runs(1)[0][name] for name in RUN_COUNTS}, history.drift_counts(since='2023-12-06 00:00:00')
+    ({'added': 0, 'changed': 0, 'removed': 0, 'status_changed': 1}, {})
+    """
+
+    def __init__(self, path: str = HISTORY_PATH):
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        打开数据库连接，必要时创建目录和表。
+
+        :rtype: sqlite3.Connection
+        :return: 数据库连接。
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.executescript(_SCHEMA)
+        self._migrate(connection)
+        return connection
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection) -> None:
+        """
+        升级旧版本的数据库。旧版本的 `runs` 表没有 `status_changed` 列，`changed` 中包含只有状态变化的配置，按变化记录重新统计。
+
+        :param connection: 数据库连接。
+        :type connection: sqlite3.Connection
+        :rtype: None
+        :return: 无返回值。
+        """
+        columns = {row[1] for row in connection.execute('PRAGMA table_info(runs)')}
+        if 'status_changed' in columns:
+            return
+        with connection:
+            connection.execute('ALTER TABLE runs ADD COLUMN status_changed INTEGER NOT NULL DEFAULT 0')
+            connection.execute(
+                "UPDATE runs SET "
+                "changed = (SELECT COUNT(*) FROM changes WHERE changes.run_id = runs.run_id AND event = 'changed'), "
+                "status_changed = (SELECT COUNT(*) FROM changes WHERE changes.run_id = runs.run_id AND event = 'status')")
+
+    def save_run(self,
+                 rows: Iterable[Sequence[str]],
+                 failed_envs: Optional[Iterable[str]] = None,
+                 started_at: Optional[str] = None) -> Optional[int]:
+        """
+        保存一次运行的结果，只记录发生变化的配置。
+
+        :param rows: 按 `COLUMN_KEYS` 顺序排列的行，例如 `ResultStore.iter_rows` 的输出。
+        :type rows: Iterable[Sequence[str]]
+        :param failed_envs: 可选，已开启但查询失败的环境名，见 `get_failed_envs`。这些环境沿用上一次的值，并且本次不记录删除。没有开启的环境不应列入，否则永远不会记录删除。
+        :type failed_envs: Optional[Iterable[str]]
+        :param started_at: 可选，运行时间，格式为 '%Y-%m-%d %H:%M:%S'，默认为当前时间。
+        :type started_at: Optional[str]
+        :rtype: Optional[int]
+        :return: 运行编号，出错时返回 None。
+        """
+        start_time = time.monotonic()
+        started_at = started_at or time.strftime('%Y-%m-%d %H:%M:%S')
+        # 查询失败的环境在状态元组中的位置
+        failed_envs = [ENV_NAMES.index(env_name) for env_name in failed_envs or [] if env_name in ENV_NAMES]
+        positions = [COLUMN_KEYS.index(column) for column in ['name', 'group', 'key'] + VALUE_COLUMNS + ['consistency', 'skip']]
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    strings = dict(connection.execute('SELECT text, string_id FROM strings'))
+                    new_strings: List[Tuple[int, str]] = []
+
+                    def intern(text: str) -> int:
+                        # 字符串去重，新字符串在事务中一起写入
+                        string_id = strings.get(text)
+                        if string_id is None:
+                            string_id = strings[text] = len(strings) + 1
+                            new_strings.append((string_id, text))
+                        return string_id
+
+                    known = {(app_id, namespace_name, key): (key_id, state, present)
+                             for key_id, app_id, namespace_name, key, present, *state in connection.execute(
+                            'SELECT key_id, app_id, namespace_name, key, present, pro_value, pre_value, test_value, dev_value, consistency, skip FROM keys')}
+                    next_key_id = max((item[0] for item in known.values()), default=0) + 1
+                    run_id = connection.execute(
+                        'INSERT INTO runs (started_at, row_count, fully, partially, inconsistent, unknown, skip, added, changed, removed, status_changed) '
+                        'VALUES (?, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)', (started_at,)).lastrowid
+
+                    counts = dict.fromkeys(STATUS_COUNTS + RUN_COUNTS, 0)
+                    key_rows, change_rows, seen = [], [], set()
+                    row_count = 0
+                    for row in rows:
+                        app_id, namespace_name, key, *values, consistency, skip = (row[position] for position in positions)
+                        identity = (app_id, namespace_name, key)
+                        if identity in seen:
+                            continue
+                        seen.add(identity)
+                        row_count += 1
+                        counts['skip' if skip == 'yes' else consistency if consistency in counts else 'unknown'] += 1
+
+                        state = [intern(value) for value in values] + [consistency, skip]
+                        key_id, old_state, present = known.get(identity, (None, None, 0))
+                        if old_state is not None:
+                            for index in failed_envs:
+                                state[index] = old_state[index]
+                        if key_id is None:
+                            key_id, next_key_id = next_key_id, next_key_id + 1
+                            event = 'added'
+                        elif not present:
+                            event = 'added'
+                        elif state[:4] != list(old_state[:4]):
+                            event = 'changed'
+                        elif state[4:] != list(old_state[4:]):
+                            event = 'status'
+                        else:
+                            continue
+                        counts['status_changed' if event == 'status' else event] += 1
+                        key_rows.append((key_id, app_id, namespace_name, key, *state))
+                        change_rows.append((key_id, run_id, event, *state))
+
+                    # 本次没有出现的配置记为删除。有环境查询失败时无法判断，不记录删除
+                    removed = [] if failed_envs else [(key_id,) for identity, (key_id, _, present) in known.items()
+                                                      if present and identity not in seen]
+                    change_rows.extend((key_id, run_id, 'removed', None, None, None, None, None, None) for key_id, in removed)
+                    counts['removed'] = len(removed)
+
+                    connection.executemany('INSERT INTO strings (string_id, text) VALUES (?, ?)', new_strings)
+                    connection.executemany(
+                        'INSERT INTO keys (key_id, app_id, namespace_name, key, pro_value, pre_value, test_value, dev_value, consistency, skip, present) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1) '
+                        'ON CONFLICT (key_id) DO UPDATE SET pro_value = excluded.pro_value, pre_value = excluded.pre_value, '
+                        'test_value = excluded.test_value, dev_value = excluded.dev_value, '
+                        'consistency = excluded.consistency, skip = excluded.skip, present = 1', key_rows)
+                    connection.executemany('UPDATE keys SET present = 0 WHERE key_id = ?', removed)
+                    connection.executemany(
+                        'INSERT INTO changes (key_id, run_id, event, pro_value, pre_value, test_value, dev_value, consistency, skip) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', change_rows)
+                    connection.execute(
+                        'UPDATE runs SET row_count = ?, fully = ?, partially = ?, inconsistent = ?, unknown = ?, skip = ?, '
+                        'added = ?, changed = ?, removed = ?, status_changed = ? WHERE run_id = ?',
+                        (row_count, *(counts[name] for name in STATUS_COUNTS + RUN_COUNTS), run_id))
+            finally:
+                connection.close()
+            logger.debug(f"Run {run_id} saved to history: {row_count} rows, {len(change_rows)} changes, "
+                         f"took {time.monotonic() - start_time:.2f}s")
+            return run_id
+        except Exception:
+            logger.exception("Error occurred while saving run history")
+            return None
+
+    def list_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        获取最近的运行记录，新的在前。
+
+        :param limit: 最多返回的条数。
+        :type limit: int
+        :rtype: List[Dict[str, Any]]
+        :return: 运行记录列表。
+        """
+        return self._query('SELECT * FROM runs ORDER BY run_id DESC LIMIT ?', (limit,))
+
+    def key_timeline(self,
+                     app_id: str,
+                     namespace_name: str,
+                     key: str) -> List[Dict[str, Any]]:
+        """
+        获取单个配置的变化时间线，按运行顺序排列。
+
+        :param app_id: 服务名。
+        :type app_id: str
+        :param namespace_name: 分组名。
+        :type namespace_name: str
+        :param key: 配置键。
+        :type key: str
+        :rtype: List[Dict[str, Any]]
+        :return: 每次变化的运行编号、运行时间、事件类型、各环境的值和状态。
+        """
+        value_joins = ' '.join(f'LEFT JOIN strings AS s_{column} ON s_{column}.string_id = c.{column}' for column in VALUE_COLUMNS)
+        value_fields = ', '.join(f's_{column}.text AS {column}' for column in VALUE_COLUMNS)
+        return self._query(
+            f'SELECT c.run_id, r.started_at, c.event, {value_fields}, c.consistency, c.skip '
+            f'FROM keys AS k JOIN changes AS c ON c.key_id = k.key_id JOIN runs AS r ON r.run_id = c.run_id {value_joins} '
+            f'WHERE k.app_id = ? AND k.namespace_name = ? AND k.key = ? ORDER BY c.run_id',
+            (app_id, namespace_name, key))
+
+    def status_since(self,
+                     app_id: str,
+                     namespace_name: str,
+                     key: str,
+                     status: str = 'inconsistent') -> Optional[str]:
+        """
+        获取配置从什么时候起一直处于指定的一致性状态。
+
+        :param app_id: 服务名。
+        :type app_id: str
+        :param namespace_name: 分组名。
+        :type namespace_name: str
+        :param key: 配置键。
+        :type key: str
+        :param status: 一致性状态。
+        :type status: str
+        :rtype: Optional[str]
+        :return: 进入该状态的运行时间。当前不处于该状态时返回 None。
+        """
+        since = None
+        for item in self.key_timeline(app_id, namespace_name, key):
+            if item['consistency'] != status:
+                since = None
+            elif since is None:
+                since = item['started_at']
+        return since
+
+    def drift_counts(self,
+                     days: int = 30,
+                     since: Optional[str] = None) -> Dict[str, int]:
+        """
+        统计一段时间内各服务的配置值变化次数，多的在前。
+
+        :param days: 统计最近多少天。
+        :type days: int
+        :param since: 可选，起始时间，格式为 '%Y-%m-%d %H:%M:%S'。指定时忽略 days。
+        :type since: Optional[str]
+        :rtype: Dict[str, int]
+        :return: 以服务名为键，变化次数为值的字典。
+        """
+        since = since or time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(time.time() - days * 86400))
+        # 先按时间索引找到范围内的运行，再用运行编号索引扫描变化记录
+        rows = self._query(
+            'SELECT k.app_id AS app_id, COUNT(*) AS count FROM changes AS c JOIN keys AS k ON k.key_id = c.key_id '
+            'WHERE c.run_id IN (SELECT run_id FROM runs WHERE started_at >= ?) AND c.event = ? '
+            'GROUP BY k.app_id ORDER BY count DESC, k.app_id',
+            (since, 'changed'))
+        return {row['app_id']: row['count'] for row in rows}
+
+    def _query(self,
+               sql: str,
+               parameters: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """
+        执行查询，返回字典列表。
+
+        :param sql: 查询语句。
+        :type sql: str
+        :param parameters: 查询参数。
+        :type parameters: Sequence[Any]
+        :rtype: List[Dict[str, Any]]
+        :return: 每行一个字典，出错时返回空列表。
+        """
+        try:
+            connection = self._connect()
+            try:
+                connection.row_factory = sqlite3.Row
+                return [dict(row) for row in connection.execute(sql, parameters)]
+            finally:
+                connection.close()
+        except Exception:
+            logger.exception("Error occurred while querying run history")
+            return []
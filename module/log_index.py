@@ -0,0 +1,144 @@
+"""
+这个模块提供了日志条目的内存索引。
+
+`LogIndex` 把日志文本按条目切分，保存每个条目的文本和级别。一条日志可能包含多行，例如异常堆栈，以时间和级别开头的行才是新条目的开始。按级别过滤时只需查看级别数组，不必重新读取文件和匹配正则表达式。
+
+索引最多保留指定数量的条目，超出时丢弃最旧的条目。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import re
+from array import array
+from typing import List, Optional, Tuple
+
+from config.settings import LOG_COLORS, LOG_LINES
+
+# 日志级别从低到高排列
+LOG_LEVELS = list(LOG_COLORS.keys())
+LOG_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - ', re.MULTILINE)
+# 开头不完整、无法确定级别的条目
+UNKNOWN_LEVEL = -1
+
+
+class LogIndex:
+    """
+    日志条目索引。
+
+    :param max_entries: 最多保留的条目数。
+    :type max_entries: int
+
+    :example:
+    >>> index = LogIndex()
+    >>> _ = index.append('2023-01-01 00:00:00,000 - INFO - main::run::1 - start\\n'
+    ...                  '2023-01-01 00:00:01,000 - ERROR - main::run::2 - failed\\nTraceback\\n')
+    >>> index.select('ERROR')
+    '2023-01-01 00:00:01,000 - ERROR - main::run::2 - failed\\nTraceback\\n'
+    >>> index.append('  File "main.py"\\n')
+    [(3, '  File "main.py"\\n')]
+    >>> len(index), index.select('ERROR').count('\\n')
+    (2, 3)
+    """
+
+    def __init__(self, max_entries: int = LOG_LINES):
+        self.max_entries = max_entries
+        self._entries: List[str] = []
+        self._levels = array('b')
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """
+        清空索引。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        self._entries = []
+        self._levels = array('b')
+
+    def append(self, text: str) -> List[Tuple[int, str]]:
+        """
+        追加日志文本。开头没有时间和级别的文本属于上一个条目的后续内容。
+
+        :param text: 新的日志文本。
+        :type text: str
+        :rtype: List[Tuple[int, str]]
+        :return: 新增的文本片段及其级别编号，包括接在上一个条目后面的内容。
+        """
+        pieces = []
+        starts = [match.start() for match in LOG_PATTERN.finditer(text)]
+        head_end = starts[0] if starts else len(text)
+        # 开头的续行接到上一个条目
+        if head_end:
+            head = text[:head_end]
+            if self._entries:
+                self._entries[-1] += head
+                pieces.append((self._levels[-1], head))
+            else:
+                self._entries.append(head)
+                self._levels.append(UNKNOWN_LEVEL)
+                pieces.append((UNKNOWN_LEVEL, head))
+        for i, start in enumerate(starts):
+            entry = text[start:starts[i + 1] if i + 1 < len(starts) else len(text)]
+            level = LOG_LEVELS.index(LOG_PATTERN.match(entry).group(1))
+            self._entries.append(entry)
+            self._levels.append(level)
+            pieces.append((level, entry))
+        # 超出上限一倍时才裁剪，避免每次追加都移动整个列表
+        if len(self._entries) > self.max_entries * 2:
+            del self._entries[:-self.max_entries]
+            del self._levels[:-self.max_entries]
+        return pieces
+
+    @staticmethod
+    def split_entries(text: str) -> List[str]:
+        """
+        把日志文本按条目切分。开头不属于任何条目的续行单独作为一项。
+
+        :param text: 日志文本。
+        :type text: str
+        :rtype: List[str]
+        :return: 条目文本列表。
+
+        :example:
+        >>> LogIndex.split_entries('2023-01-01 00:00:00,000 - INFO - a\\n2023-01-01 00:00:00,000 - INFO - b\\n')
+        ['2023-01-01 00:00:00,000 - INFO - a\\n', '2023-01-01 00:00:00,000 - INFO - b\\n']
+        """
+        starts = [match.start() for match in LOG_PATTERN.finditer(text)]
+        if not starts or starts[0] != 0:
+            starts.insert(0, 0)
+        return [text[start:end] for start, end in zip(starts, starts[1:] + [len(text)]) if start < end]
+
+    def select(self, min_level: Optional[str] = None) -> str:
+        """
+        取出不低于指定级别的条目，最多 `max_entries` 条。
+
+        :param min_level: 最低级别，为 None 或不是已知级别时取出全部条目。
+        :type min_level: Optional[str]
+        :rtype: str
+        :return: 条目文本依次相连。
+        """
+        if min_level not in LOG_LEVELS:
+            entries = self._entries
+        else:
+            threshold = LOG_LEVELS.index(min_level)
+            entries = [entry for entry, level in zip(self._entries, self._levels) if level >= threshold]
+        return ''.join(entries[-self.max_entries:])
+
+    @staticmethod
+    def passes(level: int, min_level: Optional[str]) -> bool:
+        """
+        判断级别编号是否不低于指定级别。
+
+        :param level: 级别编号。
+        :type level: int
+        :param min_level: 最低级别，为 None 或不是已知级别时总是通过。
+        :type min_level: Optional[str]
+        :rtype: bool
+        :return: 通过返回 True。
+        """
+        return min_level not in LOG_LEVELS or level >= LOG_LEVELS.index(min_level)
@@ -47,5 +47,5 @@ def modify_name(name: str,
         # 使用字典进行替换
         return replacements.get(name, name)
     except Exception:
-        logger.exception(f"An error occurred when modifying name '{name}'")
+        logger.exception("An error occurred when modifying name '%s'", name)
         return name
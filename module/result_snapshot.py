@@ -0,0 +1,214 @@
+"""
+这个模块提供了查询结果快照的保存和读取功能。
+
+每次运行完成后，`save_snapshot` 把结果按列保存为一个二进制文件。程序启动时 `load_snapshot` 读取它，不必连接数据库就能立即展示上一次的结果。
+
+文件格式：
+
+- 8 字节魔数 `CCCSNAP` 加版本号，随后是 4 字节头部长度和 4 字节保留字段。
+- UTF-8 编码的 JSON 头部，记录行数、字符串数、各环境查询状态、保存时间，以及每个数据段相对数据区起点的偏移量和字节数。
+- 数据区由若干数据段组成，每段都按 8 字节对齐：
+
+  - 字符串偏移量：字符串数加一个 uint64。
+  - 字符串数据：所有字符串的 UTF-8 字节依次相连。
+  - 每列一段，按 `COLUMN_KEYS` 排列，每段是行数个 uint32 字符串编号。
+
+整数均为小端序。写入时先写临时文件再替换，读取时不会遇到写了一半的文件。
+
+读取时把各列复制为整数数组，字符串一次解码为列表，得到普通的内存存储，随后就关闭文件。界面会展示所有单元格，延迟解码省不下时间；而映射文件只要还被对比结果等对象引用就一直打开，在 Windows 上会让下一次保存时替换快照文件失败。修改单元格不会改动文件。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import json
+import logging
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from typing import Dict, Optional, Iterable, Sequence, Tuple, Any, List, Union
+
+from config.settings import SNAPSHOT_PATH
+from module.result_store import ResultStore, COLUMN_KEYS
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'CCCSNAP\x02'
+# 魔数、头部长度和保留字段
+_PREFIX = struct.Struct('<8sII')
+_ALIGNMENT = 8
+
+
+def save_snapshot(rows: Iterable[Sequence[str]],
+                  query_statuses: Dict[str, bool],
+                  path: str = SNAPSHOT_PATH) -> bool:
+    """
+    保存查询结果快照。
+
+    :param rows: 按 `COLUMN_KEYS` 顺序排列的行。
+    :type rows: Iterable[Sequence[str]]
+    :param query_statuses: 各环境的查询状态。
+    :type query_statuses: Dict[str, bool]
+    :param path: 快照文件路径。
+    :type path: str
+    :rtype: bool
+    :return: 保存成功返回 True，否则返回 False。
+
+    :example:
+    >>> path = os.path.join(tempfile.mkdtemp(), 'result.snapshot')
+    >>> save_snapshot([['web', 'application', 'port', '80'] + ['None'] * 7 + ['fully', 'no']], {'PRO_CONFIG': True}, path)
+    True
+    >>> store, statuses, _ = load_snapshot(path)
+    >>> store.row(0)[:4], statuses
+    (['web', 'application', 'port', '80'], {'PRO_CONFIG': True})
+    >>> store.set_value(0, 'skip', 'yes')
+    >>> store.value(0, 'skip'), load_snapshot(path)[0].value(0, 'skip')
+    ('yes', 'no')
+    """
+    temp_name = None
+    try:
+        store = ResultStore()
+        for row in rows:
+            store.append(row)
+
+        encoded = [text.encode('utf-8') for text in store.strings]
+        offsets = array('Q', [0])
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        # 按写入顺序排列的数据段，值为字节串或逐段写出的字节串列表
+        segments: List[Tuple[str, Union[bytes, List[bytes]], int]] = [
+            ('string_offsets', _to_little_endian(offsets), len(offsets) * offsets.itemsize),
+            ('string_data', encoded, offsets[-1]),
+        ]
+        segments.extend((column, _to_little_endian(store.columns[column]), len(store) * 4) for column in COLUMN_KEYS)
+
+        sections, position = {}, 0
+        for name, _, length in segments:
+            sections[name] = [position, length]
+            position += _padded(length)
+        header = json.dumps({
+            'row_count': len(store),
+            'string_count': len(encoded),
+            'query_statuses': query_statuses,
+            'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'sections': sections,
+        }).encode('utf-8')
+        # 头部用空格补齐，让数据区从对齐的位置开始
+        header += b' ' * (_padded(_PREFIX.size + len(header)) - _PREFIX.size - len(header))
+
+        target_dir = os.path.dirname(os.path.abspath(path))
+        os.makedirs(target_dir, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(suffix='.part', dir=target_dir)
+        with open(fd, 'wb') as file:
+            file.write(_PREFIX.pack(MAGIC, len(header), 0))
+            file.write(header)
+            for _, data, length in segments:
+                if isinstance(data, list):
+                    file.writelines(data)
+                else:
+                    file.write(data)
+                file.write(b'\0' * (_padded(length) - length))
+        os.replace(temp_name, path)
+        temp_name = None
+        logger.debug(f"Snapshot saved to '{path}': {len(store)} rows, {len(encoded)} strings")
+        return True
+    except Exception:
+        logger.exception("Error occurred while saving result snapshot")
+        return False
+    finally:
+        if temp_name is not None and os.path.exists(temp_name):
+            os.remove(temp_name)
+
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> Optional[Tuple[ResultStore, Dict[str, bool], str]]:
+    """
+    读取查询结果快照。返回的存储在内存中，不引用快照文件。
+
+    :param path: 快照文件路径。
+    :type path: str
+    :rtype: Optional[Tuple[ResultStore, Dict[str, bool], str]]
+    :return: 结果存储、各环境查询状态和保存时间。文件不存在或格式不对时返回 None。
+    """
+    if not os.path.exists(path) or os.path.getsize(path) < _PREFIX.size:
+        return None
+    try:
+        # 整个文件读入内存后立即关闭，不保留对快照文件的引用
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, header_length, _ = _PREFIX.unpack_from(data, 0)
+        if magic != MAGIC:
+            logger.warning(f"Unknown snapshot format: '{path}'")
+            return None
+        header: Dict[str, Any] = json.loads(data[_PREFIX.size:_PREFIX.size + header_length].decode('utf-8'))
+        sections = header['sections']
+        if any(column not in sections for column in COLUMN_KEYS):
+            logger.warning(f"Snapshot columns do not match, ignored: '{path}'")
+            return None
+
+        view = memoryview(data)
+        data_start = _PREFIX.size + header_length
+
+        def section(name: str) -> memoryview:
+            # 按段名切出数据，不复制
+            offset, length = sections[name]
+            return view[data_start + offset:data_start + offset + length]
+
+        offsets = _to_array(section('string_offsets'), 'Q')
+        string_data = section('string_data')
+        strings = [str(string_data[offsets[code]:offsets[code + 1]], 'utf-8') for code in range(len(offsets) - 1)]
+        columns = {column: _to_array(section(column), 'I') for column in COLUMN_KEYS}
+        store = ResultStore.from_arrays(strings, columns)
+        logger.debug(f"Snapshot loaded from '{path}': {header['row_count']} rows")
+        return store, header['query_statuses'], header['created_at']
+    except Exception:
+        logger.exception("Error occurred while loading result snapshot")
+        return None
+
+def _padded(length: int) -> int:
+    """
+    把长度补齐到对齐边界。
+
+    :param length: 字节数。
+    :type length: int
+    :rtype: int
+    :return: 补齐后的字节数。
+    """
+    return -(-length // _ALIGNMENT) * _ALIGNMENT
+
+
+def _to_little_endian(values: array) -> bytes:
+    """
+    把整数数组转换为小端序字节。
+
+    :param values: 整数数组。
+    :type values: array
+    :rtype: bytes
+    :return: 小端序字节。
+    """
+    if sys.byteorder == 'little':
+        return values.tobytes()
+    values = array(values.typecode, values)
+    values.byteswap()
+    return values.tobytes()
+
+
+def _to_array(data: memoryview, typecode: str) -> array:
+    """
+    把小端序字节复制为整数数组。
+
+    :param data: 小端序字节。
+    :type data: memoryview
+    :param typecode: 'I' 或 'Q'。
+    :type typecode: str
+    :rtype: array
+    :return: 整数数组。
+    """
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
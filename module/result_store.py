@@ -0,0 +1,215 @@
+"""
+这个模块提供了查询结果的列式存储。
+
+`ResultStore` 按 `COL_INFO` 中的列保存每一行的用户数据。所有字符串先放入字符串表去重，列中只储存字符串编号，因此相同的值只占一份内存，比较两个值是否相等也只需比较编号。
+
+行号标识就是行在存储中的序号，与主表格中记录的行号标识一致。
+
+从快照读取的存储中，字符串到编号的字典在第一次需要时才建立。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+from array import array
+from typing import Dict, List, Sequence, Any, Optional, Iterable, Iterator, MutableSequence
+
+from config.settings import COL_INFO
+
+logger = logging.getLogger(__name__)
+
+# 按列号排序的列名，例如 ['name', 'group', 'key', 'pro_value', ...]
+COLUMN_KEYS = sorted(COL_INFO, key=lambda k: COL_INFO[k]['col'])
+
+
+class ResultStore:
+    """
+    查询结果的列式存储。
+
+    :example:
+    >>> store = ResultStore()
+    >>> store.append(['web', 'application', 'server.port', '8080', 'None', '8080', 'None', 'None', 'None', 'None', 'None', 'fully', 'no'])
+    0
+    >>> store.value(0, 'pro_value'), store.code(0, 'pro_value') == store.code(0, 'pre_value')
+    ('8080', True)
+    >>> store.set_value(0, 'skip', 'yes')
+    >>> store.row(0)[-1], len(store)
+    ('yes', 1)
+    >>> store.truncate(0)
+    >>> len(store)
+    0
+    """
+
+    def __init__(self):
+        self.strings: MutableSequence[str] = []
+        self._codes: Optional[Dict[str, int]] = {}
+        self.columns: Dict[str, MutableSequence[int]] = {key: array('I') for key in COLUMN_KEYS}
+
+    @classmethod
+    def from_arrays(cls,
+                    strings: MutableSequence[str],
+                    columns: Dict[str, MutableSequence[int]]) -> 'ResultStore':
+        """
+        用已有的字符串表和列创建存储，例如从快照读取的数据。
+
+        :param strings: 字符串表，字符串不能重复。
+        :type strings: MutableSequence[str]
+        :param columns: 以列名为键的字符串编号数组。
+        :type columns: Dict[str, MutableSequence[int]]
+        :rtype: ResultStore
+        :return: 结果存储。
+        """
+        store = cls()
+        store.strings = strings
+        store._codes = None
+        store.columns = columns
+        return store
+
+    @property
+    def codes(self) -> Dict[str, int]:
+        """
+        字符串到编号的字典。从快照读取的存储在第一次访问时才建立。
+
+        :rtype: Dict[str, int]
+        :return: 字符串到编号的字典。
+        """
+        if self._codes is None:
+            self._codes = {text: code for code, text in enumerate(self.strings)}
+        return self._codes
+
+    def intern(self, text: Any) -> int:
+        """
+        获取字符串在字符串表中的编号，不存在时加入字符串表。
+
+        :param text: 字符串，非字符串会先转换为字符串。
+        :type text: Any
+        :rtype: int
+        :return: 字符串编号。
+        """
+        text = str(text)
+        code = self.codes.get(text)
+        if code is None:
+            code = self.codes[text] = len(self.strings)
+            self.strings.append(text)
+        return code
+
+    def append(self, values: Sequence[Any]) -> int:
+        """
+        追加一行数据。
+
+        :param values: 按列号顺序排列的用户数据。
+        :type values: Sequence[Any]
+        :rtype: int
+        :return: 新行的行号标识。
+        """
+        for key, value in zip(COLUMN_KEYS, values):
+            self.columns[key].append(self.intern(value))
+        return len(self) - 1
+
+    def truncate(self, length: int) -> None:
+        """
+        只保留前 `length` 行，用于撤销追加到一半的行。字符串表不变。
+
+        :param length: 保留的行数。
+        :type length: int
+        :rtype: None
+        :return: 无返回值。
+        """
+        for column_array in self.columns.values():
+            if len(column_array) > length:
+                del column_array[length:]
+
+    def code(self, row_id: int, column: str) -> int:
+        """
+        获取单元格的字符串编号。
+
+        :param row_id: 行号标识。
+        :type row_id: int
+        :param column: 列名。
+        :type column: str
+        :rtype: int
+        :return: 字符串编号。
+        """
+        return self.columns[column][row_id]
+
+    def value(self, row_id: int, column: str) -> str:
+        """
+        获取单元格的值。
+
+        :param row_id: 行号标识。
+        :type row_id: int
+        :param column: 列名。
+        :type column: str
+        :rtype: str
+        :return: 单元格的值。
+        """
+        return self.strings[self.columns[column][row_id]]
+
+    def set_value(self, row_id: int, column: str, text: Any) -> None:
+        """
+        修改单元格的值。
+
+        :param row_id: 行号标识。
+        :type row_id: int
+        :param column: 列名。
+        :type column: str
+        :param text: 新值。
+        :type text: Any
+        :rtype: None
+        :return: 无返回值。
+        """
+        self.columns[column][row_id] = self.intern(text)
+
+    def row(self, row_id: int) -> List[str]:
+        """
+        获取一整行的值。
+
+        :param row_id: 行号标识。
+        :type row_id: int
+        :rtype: List[str]
+        :return: 按列号顺序排列的值。
+        """
+        return [self.strings[self.columns[key][row_id]] for key in COLUMN_KEYS]
+
+    def iter_rows(self,
+                  row_ids: Iterable[int],
+                  columns: Sequence[str],
+                  text_mappings: Optional[Dict[str, Dict[str, str]]] = None) -> Iterator[List[str]]:
+        """
+        按给定的行号标识和列名逐行产生数据，不复制整张表。
+
+        :param row_ids: 要输出的行号标识，按输出顺序排列。
+        :type row_ids: Iterable[int]
+        :param columns: 要输出的列名。
+        :type columns: Sequence[str]
+        :param text_mappings: 可选，列名到显示文字映射的字典，例如一致性状态的翻译。
+        :type text_mappings: Optional[Dict[str, Dict[str, str]]]
+        :rtype: Iterator[List[str]]
+        :return: 逐行产生的值列表。
+        """
+        strings = self.strings
+        text_mappings = text_mappings or {}
+        # 预先取出列数组和映射，循环内只做下标访问
+        column_arrays = [(self.columns[column], text_mappings.get(column)) for column in columns]
+        for row_id in row_ids:
+            row = []
+            for column_array, mapping in column_arrays:
+                value = strings[column_array[row_id]]
+                row.append(mapping.get(value, value) if mapping else value)
+            yield row
+
+    def find_code(self, text: str) -> Optional[int]:
+        """
+        查找字符串的编号，但不加入字符串表。
+
+        :param text: 字符串。
+        :type text: str
+        :rtype: Optional[int]
+        :return: 字符串编号，不存在时返回 None。
+        """
+        return self.codes.get(text)
+
+    def __len__(self) -> int:
+        return len(self.columns[COLUMN_KEYS[0]])
@@ -0,0 +1,179 @@
+"""
+这个模块提供了命令行模式的入口，用于在没有图形界面的环境中运行配置对比，例如定时任务和持续集成。
+
+主要功能是 `run_cli` 函数。它读取 `config_main.json` 和连接配置文件，执行与图形界面相同的查询、格式化、忽略和一致性判断流程，然后把结果逐行写到标准输出或文件。本模块及其依赖都不导入 PyQt。
+
+退出码反映不一致配置的数量：
+
+- 0：不一致配置数量不超过 `--max-count`。
+- 1：不一致配置数量超过 `--max-count`。
+- 2：命令行参数错误，由 argparse 返回。
+- 3：运行出错或没有查询到任何结果。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import argparse
+import logging
+import sys
+from typing import Dict, List, Optional, Iterator
+
+from config.settings import LOG_PATH, PROGRAM_NAME, METRICS_PATH, TRACE_PATH
+from lib.logging_config import logging_config
+from lib.run_metrics import metrics
+from lib.write_rows_to_csv import write_rows_to_csv
+from lib.write_rows_to_json import write_rows_to_json
+from lib.write_rows_to_ndjson import write_rows_to_ndjson
+from module.execute_queries import execute_queries
+from module.get_failed_envs import get_failed_envs
+from module.history_store import HistoryStore
+from module.read_config_all import read_config_all
+from module.result_store import COLUMN_KEYS
+from module.save_data_to_file import save_data_to_file
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_INCONSISTENT = 1
+EXIT_ERROR = 3
+# 查询结果中的键，顺序与 COLUMN_KEYS 一致
+RESULT_KEYS = [
+    'app_id', 'namespace_name', 'key',
+    'PRO_CONFIG', 'PRO_CONFIG_modified_time',
+    'PRE_CONFIG', 'PRE_CONFIG_modified_time',
+    'TEST_CONFIG', 'TEST_CONFIG_modified_time',
+    'DEV_CONFIG', 'DEV_CONFIG_modified_time',
+    'consistency_status', 'skip_status',
+]
+# 各 --fail-on 选项计入不一致数量的状态
+FAIL_ON_STATUSES = {
+    'inconsistent': {'inconsistent'},
+    'partially': {'inconsistent', 'partially'},
+    'never': set(),
+}
+
+
+def run_cli(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行模式入口。
+
+    :param argv: 命令行参数，不含程序名和子命令。为 None 时读取 sys.argv。
+    :type argv: Optional[List[str]]
+    :rtype: int
+    :return: 退出码。
+    """
+    args = _parse_args(argv)
+    # 标准输出只留给结果，日志写入文件，需要时再输出到标准错误
+    logging_config(log_file=LOG_PATH, console_output=args.verbose, max_log_size=1, log_level='DEBUG' if args.verbose else 'INFO')
+    try:
+        if args.trace:
+            metrics.enable_trace()
+        metrics.reset()
+        config_main, config_apollo, config_nacos = read_config_all()
+        config_connection = config_apollo if config_main.get('config_center', 'Apollo') == 'Apollo' else config_nacos
+        formatted_results, query_statuses = execute_queries(config_connection, config_main)
+        if not formatted_results:
+            logger.error("No query result, check the connection settings")
+            return EXIT_ERROR
+        logger.debug(f"Query statuses: {query_statuses}")
+
+        counts = _count_statuses(formatted_results)
+        rows = _iter_rows(formatted_results, args.only_inconsistent, args.include_skipped)
+        if args.output:
+            if not save_data_to_file(args.output, args.format, COLUMN_KEYS, rows):
+                logger.error(f"Failed to write results to '{args.output}'")
+                return EXIT_ERROR
+        else:
+            writer = {'csv': write_rows_to_csv, 'json': write_rows_to_json, 'ndjson': write_rows_to_ndjson}[args.format]
+            writer(sys.stdout, COLUMN_KEYS, rows)
+            sys.stdout.flush()
+
+        if not args.no_history:
+            with metrics.trace('save_history'):
+                HistoryStore().save_run(_iter_rows(formatted_results, False, True), get_failed_envs(config_connection, query_statuses))
+
+        metrics.save(METRICS_PATH)
+        if args.trace:
+            metrics.save_trace(args.trace)
+        failed = sum(counts[status] for status in FAIL_ON_STATUSES[args.fail_on])
+        print(f"rows: {len(formatted_results)}, " + ", ".join(f"{status}: {count}" for status, count in counts.items()), file=sys.stderr)
+        return EXIT_INCONSISTENT if failed > args.max_count else EXIT_OK
+    except Exception:
+        logger.exception("Error occurred while running in CLI mode")
+        return EXIT_ERROR
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    """
+    解析命令行参数。
+
+    :param argv: 命令行参数。
+    :type argv: Optional[List[str]]
+    :rtype: argparse.Namespace
+    :return: 解析结果。
+    """
+    parser = argparse.ArgumentParser(prog=f'{PROGRAM_NAME} cli',
+                                     description='Compare configurations across environments without the GUI.')
+    parser.add_argument('-f', '--format', choices=['csv', 'json', 'ndjson'], default='csv',
+                        help='output format (default: csv)')
+    parser.add_argument('-o', '--output',
+                        help='write results to this file instead of stdout; .gz or .xz suffix enables compression')
+    parser.add_argument('--only-inconsistent', action='store_true',
+                        help='only output rows that are not fully consistent')
+    parser.add_argument('--include-skipped', action='store_true',
+                        help='also output rows in the skip list')
+    parser.add_argument('--fail-on', choices=list(FAIL_ON_STATUSES), default='inconsistent',
+                        help='statuses counted as failures (default: inconsistent)')
+    parser.add_argument('--max-count', type=int, default=0,
+                        help='exit with 1 only when more than this many rows fail (default: 0)')
+    parser.add_argument('--no-history', action='store_true',
+                        help='do not record this run in the local run history')
+    parser.add_argument('--trace', nargs='?', const=TRACE_PATH, metavar='FILE',
+                        help=f'record a Chrome trace of this run, loadable in chrome://tracing or Perfetto (default file: {TRACE_PATH})')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='print debug logs to stderr')
+    return parser.parse_args(argv)
+
+
+def _count_statuses(formatted_results: Dict[str, Dict[str, str]]) -> Dict[str, int]:
+    """
+    统计各一致性状态的行数。忽略的行单独计数，不计入一致性状态。
+
+    :param formatted_results: 格式化后的查询结果。
+    :type formatted_results: Dict[str, Dict[str, str]]
+    :rtype: Dict[str, int]
+    :return: 各状态的行数。
+    """
+    counts = {'fully': 0, 'partially': 0, 'inconsistent': 0, 'unknown': 0, 'skip': 0}
+    for result in formatted_results.values():
+        if result.get('skip_status') == 'yes':
+            counts['skip'] += 1
+        else:
+            status = result.get('consistency_status')
+            counts[status if status in counts else 'unknown'] += 1
+    return counts
+
+
+def _iter_rows(formatted_results: Dict[str, Dict[str, str]],
+               only_inconsistent: bool,
+               include_skipped: bool) -> Iterator[List[str]]:
+    """
+    逐行产生要输出的数据。
+
+    :param formatted_results: 格式化后的查询结果。
+    :type formatted_results: Dict[str, Dict[str, str]]
+    :param only_inconsistent: 是否只输出不完全一致的行。
+    :type only_inconsistent: bool
+    :param include_skipped: 是否输出忽略的行。
+    :type include_skipped: bool
+    :rtype: Iterator[List[str]]
+    :return: 逐行产生的值列表。
+    """
+    for result in formatted_results.values():
+        if not include_skipped and result.get('skip_status') == 'yes':
+            continue
+        if only_inconsistent and result.get('consistency_status') == 'fully':
+            continue
+        yield [str(result.get(key, 'None')) for key in RESULT_KEYS]
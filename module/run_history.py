@@ -0,0 +1,99 @@
+"""
+这个模块提供了运行历史的命令行查询入口。
+
+主要功能是 `run_history` 函数。它从 `HistoryStore` 读取本地保存的运行历史，不连接配置中心数据库，结果以每行一个 JSON 对象的格式输出到标准输出。支持三个子命令：
+
+- `runs`：列出最近的运行记录。
+- `key`：查看单个配置的变化时间线，以及它从什么时候开始处于不一致状态。
+- `drift`：统计最近若干天各服务的配置值变化次数。
+
+本模块及其依赖都不导入 PyQt。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import argparse
+import json
+import logging
+import sys
+from typing import List, Optional, Any
+
+from config.settings import LOG_PATH, PROGRAM_NAME
+from lib.logging_config import logging_config
+from module.history_store import HistoryStore
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_ERROR = 3
+
+
+def run_history(argv: Optional[List[str]] = None) -> int:
+    """
+    运行历史查询入口。
+
+    :param argv: 命令行参数，不含程序名和子命令。为 None 时读取 sys.argv。
+    :type argv: Optional[List[str]]
+    :rtype: int
+    :return: 退出码。
+    """
+    args = _parse_args(argv)
+    logging_config(log_file=LOG_PATH, console_output=args.verbose, max_log_size=1, log_level='DEBUG' if args.verbose else 'INFO')
+    try:
+        history = HistoryStore()
+        if args.command == 'runs':
+            for run in history.list_runs(args.limit):
+                _print_line(run)
+        elif args.command == 'key':
+            for item in history.key_timeline(args.app_id, args.namespace_name, args.key):
+                _print_line(item)
+            print(f"inconsistent since: {history.status_since(args.app_id, args.namespace_name, args.key)}", file=sys.stderr)
+        else:
+            for app_id, count in history.drift_counts(args.days).items():
+                _print_line({'app_id': app_id, 'count': count})
+        sys.stdout.flush()
+        return EXIT_OK
+    except Exception:
+        logger.exception("Error occurred while querying run history")
+        return EXIT_ERROR
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    """
+    解析命令行参数。
+
+    :param argv: 命令行参数。
+    :type argv: Optional[List[str]]
+    :rtype: argparse.Namespace
+    :return: 解析结果。
+    """
+    parser = argparse.ArgumentParser(prog=f'{PROGRAM_NAME} history',
+                                     description='Query the local run history without connecting to any database.')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='print debug logs to stderr')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    runs_parser = subparsers.add_parser('runs', help='list recent runs')
+    runs_parser.add_argument('-n', '--limit', type=int, default=20,
+                             help='number of runs to list (default: 20)')
+    key_parser = subparsers.add_parser('key', help='show the change timeline of one key')
+    key_parser.add_argument('app_id')
+    key_parser.add_argument('namespace_name')
+    key_parser.add_argument('key')
+    drift_parser = subparsers.add_parser('drift', help='count value changes per app')
+    drift_parser.add_argument('-d', '--days', type=int, default=30,
+                              help='count changes in this many recent days (default: 30)')
+    return parser.parse_args(argv)
+
+
+def _print_line(item: Any) -> None:
+    """
+    以一行 JSON 输出到标准输出。
+
+    :param item: 可以序列化为 JSON 的数据。
+    :type item: Any
+    :rtype: None
+    :return: 无返回值。
+    """
+    print(json.dumps(item, ensure_ascii=False, separators=(',', ':')))
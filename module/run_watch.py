@@ -0,0 +1,167 @@
+"""
+这个模块提供了监视模式的入口，按固定间隔重复执行配置对比，每次只输出与上一次相比发生的变化。
+
+主要功能是 `run_watch` 函数。第一次查询的结果作为基线，不输出事件。之后每次轮询都用 `diff_results` 与上一次的结果比较，把新增、删除、值变化和状态变化事件逐行以 NDJSON 格式写到标准输出或追加到文件，也可以同时推送到 Webhook。
+
+每个环境先执行一次轻量的数据指纹查询，行数和最后修改时间都没变时沿用上一次的查询结果，只有发生变化的环境才重新拉取全部数据。开启的环境中有查询失败的，本次不做比较，只输出一条查询状态事件，避免把该环境的所有值都报告为变化。
+
+收到 Ctrl+C 或 SIGTERM 时，在当前轮询结束后退出。本模块及其依赖都不导入 PyQt。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import argparse
+import json
+import logging
+import signal
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Any, TextIO
+
+from config.settings import LOG_PATH, PROGRAM_NAME, WATCH_INTERVAL
+from lib.logging_config import logging_config
+from lib.post_json import post_json
+from module.diff_results import diff_results
+from module.execute_queries import execute_queries
+from module.get_failed_envs import get_failed_envs
+from module.read_config_all import read_config_all
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_ERROR = 3
+
+
+def run_watch(argv: Optional[List[str]] = None) -> int:
+    """
+    监视模式入口。
+
+    :param argv: 命令行参数，不含程序名和子命令。为 None 时读取 sys.argv。
+    :type argv: Optional[List[str]]
+    :rtype: int
+    :return: 退出码。
+    """
+    args = _parse_args(argv)
+    logging_config(log_file=LOG_PATH, console_output=args.verbose, max_log_size=1, log_level='DEBUG' if args.verbose else 'INFO')
+    stop_event = threading.Event()
+    _install_stop_handler(stop_event)
+    output = None
+    try:
+        config_main, config_apollo, config_nacos = read_config_all()
+        config_connection = config_apollo if config_main.get('config_center', 'Apollo') == 'Apollo' else config_nacos
+        output = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+
+        # 查询缓存在轮询之间保留，数据指纹没变的环境不再拉取全部数据
+        query_cache: Dict[str, Dict[str, Any]] = {}
+        previous_results: Optional[Dict[str, Dict[str, str]]] = None
+        previous_statuses: Optional[Dict[str, bool]] = None
+        cycle = 0
+        while not stop_event.is_set():
+            cycle += 1
+            start_time = time.monotonic()
+            formatted_results, query_statuses = execute_queries(config_connection, config_main, query_cache)
+
+            events = []
+            if previous_statuses is not None and query_statuses != previous_statuses:
+                events.append({'event': 'query_status', 'changes': {env_name: [previous_statuses.get(env_name), status]
+                                                                    for env_name, status in query_statuses.items()
+                                                                    if previous_statuses.get(env_name) != status}})
+            previous_statuses = query_statuses
+
+            # 没有开启的环境状态也为 False，只看开启的环境是否查询失败
+            failed_envs = get_failed_envs(config_connection, query_statuses)
+            if not formatted_results or failed_envs:
+                logger.warning(f"Cycle {cycle}: query failed for {failed_envs or 'all environments'}, skip comparing")
+            elif previous_results is None:
+                previous_results = formatted_results
+                logger.info(f"Cycle {cycle}: baseline taken, {len(formatted_results)} rows")
+            else:
+                events.extend(diff_results(previous_results, formatted_results))
+                previous_results = formatted_results
+
+            _emit_events(events, cycle, output, args.webhook)
+            logger.info(f"Cycle {cycle}: {len(events)} events, took {time.monotonic() - start_time:.2f}s")
+
+            if args.max_cycles and cycle >= args.max_cycles:
+                break
+            stop_event.wait(args.interval)
+        return EXIT_OK
+    except KeyboardInterrupt:
+        return EXIT_OK
+    except Exception:
+        logger.exception("Error occurred while running in watch mode")
+        return EXIT_ERROR
+    finally:
+        if output is not None and output is not sys.stdout:
+            output.close()
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    """
+    解析命令行参数。
+
+    :param argv: 命令行参数。
+    :type argv: Optional[List[str]]
+    :rtype: argparse.Namespace
+    :return: 解析结果。
+    """
+    parser = argparse.ArgumentParser(prog=f'{PROGRAM_NAME} watch',
+                                     description='Re-run the comparison periodically and print only what changed.')
+    parser.add_argument('-i', '--interval', type=float, default=WATCH_INTERVAL,
+                        help=f'seconds between two runs (default: {WATCH_INTERVAL})')
+    parser.add_argument('-o', '--output',
+                        help='append NDJSON events to this file instead of stdout')
+    parser.add_argument('--webhook',
+                        help='also POST each batch of events as JSON to this URL')
+    parser.add_argument('--max-cycles', type=int, default=0,
+                        help='stop after this many runs, 0 means run until interrupted (default: 0)')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='print debug logs to stderr')
+    return parser.parse_args(argv)
+
+
+def _install_stop_handler(stop_event: threading.Event) -> None:
+    """
+    收到 SIGTERM 时设置停止事件，让监视循环在当前轮询结束后退出。
+
+    :param stop_event: 停止事件。
+    :type stop_event: threading.Event
+    :rtype: None
+    :return: 无返回值。
+    """
+    # 信号处理函数只能在主线程中注册
+    if threading.current_thread() is threading.main_thread() and hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+
+
+def _emit_events(events: List[Dict[str, Any]],
+                 cycle: int,
+                 output: TextIO,
+                 webhook: Optional[str]) -> None:
+    """
+    输出变化事件。每个事件一行 JSON，带上轮询序号和时间；设置了 Webhook 时，整批事件一次推送。
+
+    :param events: 变化事件列表。
+    :type events: List[Dict[str, Any]]
+    :param cycle: 轮询序号。
+    :type cycle: int
+    :param output: 输出流。
+    :type output: TextIO
+    :param webhook: Webhook 地址，为 None 时不推送。
+    :type webhook: Optional[str]
+    :rtype: None
+    :return: 无返回值。
+    """
+    if not events:
+        return
+    timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+    for event in events:
+        event['cycle'], event['time'] = cycle, timestamp
+        output.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')))
+        output.write('\n')
+    output.flush()
+    if webhook:
+        post_json(webhook, {'cycle': cycle, 'time': timestamp, 'events': events})
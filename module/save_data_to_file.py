@@ -1,59 +1,147 @@
 """
-这个模块提供了数据保存功能，允许用户将数据以CSV或JSON格式保存到文件中。
+这个模块提供了数据保存功能，允许用户将数据以CSV、JSON或NDJSON格式保存到文件中。
 
-主要功能是 `save_data_to_file` 函数，它接受文件名、文件类型和要保存的数据，根据文件类型将数据保存为CSV或JSON格式。
+主要功能是 `save_data_to_file` 函数，它接受文件名、文件类型、表头和逐行产生数据的可迭代对象，根据文件类型将数据流式写入文件。文件类型中含有 'compact' 时 JSON 使用紧凑格式，NDJSON 总是使用紧凑格式。文件类型或文件名以 .gz、.xz 结尾时，用多线程分块压缩写出。
+
+数据先写入同目录下的临时文件，全部写完后再替换目标文件。写入失败或被中止时删除临时文件，不会留下不完整的结果。临时文件创建时只有所有者可读写，替换前改为与直接创建文件相同的权限；目标文件已存在时沿用它的权限。
 
 :author: assassing
 :contact: https://github.com/hxz393
 :copyright: Copyright 2023, hxz393. 保留所有权利。
 """
 
+import gzip
+import io
 import logging
 import os
 import tempfile
-from typing import Optional, Dict
+from functools import partial
+from typing import Optional, Iterable, Sequence, Callable
 
-from lib.write_dict_to_csv import write_dict_to_csv
-from lib.write_dict_to_json import write_dict_to_json
+from config.settings import EXPORT_COMPRESS_CHUNK_SIZE
+from lib.parallel_compress_writer import ParallelCompressWriter
+from lib.write_rows_to_csv import write_rows_to_csv
+from lib.write_rows_to_json import write_rows_to_json
+from lib.write_rows_to_ndjson import write_rows_to_ndjson
 
 logger = logging.getLogger(__name__)
 
+# 进程的文件创建掩码只能通过设置来读取，在导入时读取一次，避免导出线程中临时修改
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 
 def save_data_to_file(file_name: str,
                       file_type: str,
-                      data: Dict[int, Dict[str, str]]) -> Optional[bool]:
+                      headers: Sequence[str],
+                      rows: Iterable[Sequence[str]],
+                      cancel_callback: Optional[Callable[[], bool]] = None) -> Optional[bool]:
     """
-    将字典格式的数据保存到CSV或JSON文件中。
+    将逐行产生的数据保存到CSV、JSON或NDJSON文件中。
 
-    该函数根据指定的文件名、文件类型和数据字典，将数据保存到对应格式的文件中。支持的文件类型包括CSV和JSON。当保存成功时返回True，如果遇到错误则返回False，异常情况下返回None。
+    该函数根据指定的文件名、文件类型，将数据保存到对应格式的文件中。支持的文件类型包括CSV、JSON和NDJSON，均可选 gzip 或 xz 压缩。当保存成功时返回True，如果遇到错误或被中止则返回False，异常情况下返回None。
 
     :param file_name: 文件名，包含路径。
     :type file_name: str
-    :param file_type: 文件类型，'csv' 或 'json'。
+    :param file_type: 文件类型，例如 'csv'、'json'、'compact json'、'ndjson' 或文件对话框的过滤器 'NDJSON gzip Files (*.ndjson.gz)'。
     :type file_type: str
-    :param data: 要保存的数据，字典格式。
-    :type data: Dict[int, Dict[str, str]]
-    :return: 成功保存返回True，失败返回False，异常返回None。
+    :param headers: 表头。
+    :type headers: Sequence[str]
+    :param rows: 逐行产生数据的可迭代对象，每行的列顺序与表头一致。
+    :type rows: Iterable[Sequence[str]]
+    :param cancel_callback: 可选，数据写完后调用，返回 True 表示已中止，此时丢弃临时文件。
+    :type cancel_callback: Optional[Callable[[], bool]]
+    :return: 成功保存返回True，失败或中止返回False，异常返回None。
     :rtype: Optional[bool]
 
     :example:
-    >>> data_dict = {1: {'name': 'Alice', 'age': '30'}, 2: {'name': 'Bob', 'age': '25'}}
+    >>> headers = ['name', 'age']
     >>> with tempfile.TemporaryDirectory() as temp_dir:
     ...     temp_csv_file = os.path.join(temp_dir, 'data_dict.csv')
-    ...     save_data_to_file(temp_csv_file, 'csv', data_dict)
+    ...     save_data_to_file(temp_csv_file, 'csv', headers, iter([['Alice', '30'], ['Bob', '25']]))
     ...     temp_json_file = os.path.join(temp_dir, 'data_dict.json')
-    ...     save_data_to_file(temp_json_file, 'json', data_dict)
+    ...     save_data_to_file(temp_json_file, 'json', headers, iter([['Alice', '30'], ['Bob', '25']]))
+    ...     temp_gz_file = os.path.join(temp_dir, 'data_dict.ndjson.gz')
+    ...     save_data_to_file(temp_gz_file, 'ndjson', headers, iter([['Alice', '30'], ['Bob', '25']]))
+    ...     gzip.open(temp_gz_file).read().splitlines()[0]
+    True
     True
     True
+    b'{"name":"Alice","age":"30"}'
     """
+    temp_name = None
     try:
-        if "csv" in file_type.lower():
-            return write_dict_to_csv(file_name, list(data.values()))
-        elif "json" in file_type.lower():
-            return write_dict_to_json(file_name, data)
+        file_type = file_type.lower()
+        # NDJSON 要先于 JSON 判断，因为类型名中也包含 json
+        if "csv" in file_type:
+            writer, encoding, newline = write_rows_to_csv, 'utf-8-sig', ''
+        elif "ndjson" in file_type:
+            writer, encoding, newline = write_rows_to_ndjson, 'utf-8', None
+        elif "json" in file_type:
+            writer, encoding, newline = partial(write_rows_to_json, compact="compact" in file_type), 'utf-8', None
         else:
             logger.error(f"Unsupported file type: {file_type}")
             return False
+        compression = _get_compression(file_name, file_type)
+
+        target_dir = os.path.dirname(os.path.abspath(file_name))
+        os.makedirs(target_dir, exist_ok=True)
+        # 临时文件放在目标目录中，保证最后的替换是同一文件系统内的原子操作
+        fd, temp_name = tempfile.mkstemp(suffix='.part', dir=target_dir)
+        if compression is None:
+            file = open(fd, 'w', encoding=encoding, newline=newline)
+        else:
+            stream = ParallelCompressWriter(open(fd, 'wb'), compression, EXPORT_COMPRESS_CHUNK_SIZE)
+            file = io.TextIOWrapper(stream, encoding=encoding, newline=newline)
+        with file:
+            count = writer(file, headers, rows)
+
+        if cancel_callback is not None and cancel_callback():
+            logger.info(f"Saving to '{file_name}' was cancelled after {count} rows")
+            return False
+        os.chmod(temp_name, _get_file_mode(file_name))
+        os.replace(temp_name, file_name)
+        temp_name = None
+        logger.debug(f"{count} rows written to '{file_name}'")
+        return True
     except Exception:
         logger.exception("Unexpected error while saving data")
         return None
+    finally:
+        if temp_name is not None and os.path.exists(temp_name):
+            os.remove(temp_name)
+
+
+def _get_file_mode(file_name: str) -> int:
+    """
+    获取替换后文件应有的权限：目标文件已存在时沿用它的权限，否则为按掩码创建新文件时的默认权限。
+
+    :param file_name: 目标文件名。
+    :type file_name: str
+    :return: 权限位。
+    :rtype: int
+    """
+    try:
+        return os.stat(file_name).st_mode & 0o7777
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def _get_compression(file_name: str, file_type: str) -> Optional[str]:
+    """
+    根据文件类型和文件名判断压缩方式。
+
+    :param file_name: 文件名。
+    :type file_name: str
+    :param file_type: 已转为小写的文件类型。
+    :type file_type: str
+    :return: 'gzip'、'xz'，不压缩时返回 None。
+    :rtype: Optional[str]
+    """
+    file_name = file_name.lower()
+    words = file_type.replace('(', ' ').replace(')', ' ').split()
+    if "gzip" in words or ".gz" in file_type or file_name.endswith('.gz'):
+        return 'gzip'
+    if "xz" in words or ".xz" in file_type or file_name.endswith('.xz'):
+        return 'xz'
+    return None
@@ -18,12 +18,16 @@ from .action_test import ActionTest
 from .action_unskip import ActionUnskip
 from .action_update import ActionUpdate
 from .filter_bar import FilterBar
+from .app_list_model import AppListModel
 from .message_show import message_show
 from .table_main import TableMain
 from .dialog_settings_main import DialogSettingsMain
 from .dialog_settings_connection import DialogSettingsConnection
+from .comparison_model import ComparisonModel
 from .dialog_comparison import DialogComparison
+from .dialog_profile import DialogProfile
 from .status_bar import StatusBar
 from .lang_manager import LangManager
 from .config_manager import ConfigManager
 from .global_signals import global_signals
+from .action_registry import action_registry, ActionRegistry
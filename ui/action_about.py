@@ -15,6 +15,7 @@ from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QAction
 
 from lib.get_resource_path import get_resource_path
+from ui.action_registry import action_registry
 from ui.dialog_about import DialogAbout
 from ui.lang_manager import LangManager
 
@@ -58,6 +59,8 @@ class ActionAbout(QObject):
         self.lang = self.lang_manager.get_lang()
         self.action_about.setText(self.lang['ui.action_about_1'])
         self.action_about.setStatusTip(self.lang['ui.action_about_2'])
+        # 关于对话框的文字在创建时确定，语言改变后需要重新创建
+        action_registry.discard_dialog('about')
 
     def open_dialog(self) -> None:
         """
@@ -67,7 +70,7 @@ class ActionAbout(QObject):
         :return: 无返回值。
         """
         try:
-            dialog = DialogAbout(self.lang_manager)
+            dialog = action_registry.dialog('about', lambda: DialogAbout(self.lang_manager))
             dialog.exec_()
         except Exception:
             logger.exception("An error occurred while opening the about dialog")
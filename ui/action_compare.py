@@ -1,7 +1,9 @@
 """
 本文件包含用于处理和比较配置数据的类和函数。
 
-该模块主要包含 `ActionCompare` 类，用于在用户界面中处理数据比较的逻辑。该类提供了对比配置数据、更新界面语言、重组数据等功能，方便用户进行环境配置的对比分析。
+该模块主要包含 `ActionCompare` 类，用于在用户界面中处理数据比较的逻辑；以及 `CompareWork` 类，在后台线程中对结果存储进行分组对比，并报告进度。
+
+对比有两种模式：配置查重查找配置键和值完全相同的行；相似配置查找不同服务间相近的配置值。两种模式的结果格式相同，共用一个结果对话框。
 
 :author: assassing
 :contact: https://github.com/hxz393
@@ -9,14 +11,18 @@
 """
 
 import logging
-from typing import Dict, Optional, List
+from array import array
+from typing import Dict, Optional, List, Callable
 
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QAction
 
 from lib.get_resource_path import get_resource_path
 from lib.log_time import log_time
+from module.compare_groups import compare_groups
+from module.find_similar_groups import find_similar_groups
+from module.result_store import ResultStore
 from ui.config_manager import ConfigManager
 from ui.dialog_comparison import DialogComparison
 from ui.global_signals import global_signals
@@ -51,7 +57,15 @@ class ActionCompare(QObject):
         self.lang_manager.lang_updated.connect(self.update_lang)
         self.config_manager = config_manager
         self.table = table
+        self.dialog_comparison = None
+        self.compare_work = None
+        # 对比是否被中止。线程结束后 isInterruptionRequested 总是返回 False，需要单独记录
+        self.cancelled = False
+        # 当前对比模式，'exact' 为配置查重，'similar' 为相似配置
+        self.mode = 'exact'
         self.initUI()
+        # 主窗口关闭时中止还在运行的对比
+        global_signals.close_all.connect(self.stop_work)
 
     def initUI(self) -> None:
         """
@@ -62,8 +76,10 @@ class ActionCompare(QObject):
         """
         self.action_compare = QAction(QIcon(get_resource_path('media/icons8-diff-files-26')), 'Compare')
         self.action_compare.setShortcut('F8')
-        # 为了记录运行时间，使用匿名函数
-        self.action_compare.triggered.connect(lambda checked=False: self.compare())
+        self.action_compare.triggered.connect(self.compare)
+        self.action_similar = QAction(QIcon(get_resource_path('media/icons8-diff-files-26')), 'Find Similar')
+        self.action_similar.setShortcut('Shift+F8')
+        self.action_similar.triggered.connect(self.find_similar)
         self.update_lang()
 
     def update_lang(self) -> None:
@@ -76,128 +92,136 @@ class ActionCompare(QObject):
         self.lang = self.lang_manager.get_lang()
         self.action_compare.setText(self.lang['ui.action_compare_1'])
         self.action_compare.setStatusTip(self.lang['ui.action_compare_2'])
+        self.action_similar.setText(self.lang['ui.action_compare_7'])
+        self.action_similar.setStatusTip(self.lang['ui.action_compare_8'])
 
-    @log_time
     def compare(self) -> None:
         """
-        执行数据对比操作。
+        执行配置查重。
 
-        该方法首先从表格获取原始数据，然后对数据进行重组和对比分析。最终，它将对比结果展示在对话框中。
+        :rtype: None
+        :return: 无返回值。
+        """
+        self._start('exact', compare_groups)
+
+    def find_similar(self) -> None:
+        """
+        执行相似配置查找。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        self._start('similar', find_similar_groups)
+
+    def _start(self,
+               mode: str,
+               compare_func: Callable) -> None:
+        """
+        启动后台对比。
+
+        该方法在后台线程中对主表格的结果存储进行分组对比，界面只接收进度和最终的分组结果，不会因数据量大而卡住。
+
+        :param mode: 对比模式，'exact' 或 'similar'。
+        :type mode: str
+        :param compare_func: 对比函数，接收结果存储、进度回调和中止回调。
+        :type compare_func: Callable
 
         :rtype: None
         :return: 无返回值。
         """
         try:
-            # 获取原表格数据到字典。
-            original_data = self.table.get_table_data()
-            if not original_data:
+            store = self.table.result_store
+            if not len(store):
                 logger.warning("No data available in the table for comparison.")
                 message_show('Information', self.lang['ui.action_compare_4'])
                 return
 
-            # 对原表格数据进行重新整理分组。
-            new_data = self._reorganize_data(original_data)
-            if not new_data:
-                logger.error("Data reorganization failed.")
-                self.status_updated.emit(self.lang['label_status_error'])
-                return
-
-            # 对整理分组后的数据进行对比。
-            result = self._compare_environments(new_data)
-            if not result:
-                logger.error("Environment comparison failed.")
-                self.status_updated.emit(self.lang['label_status_error'])
-                return
-
-            # 打开带表格组件的对话框，展示结果。
-            self.dialog_comparison = DialogComparison(self.lang_manager, self.config_manager, result)
-            self.dialog_comparison.status_updated.connect(self.forward_status)
-            self.dialog_comparison.show()
-            # 连接全局信号，主窗口关闭时一并关闭。
-            global_signals.close_all.connect(self.close_dialog)
+            # 对比期间禁止重复触发
+            self._set_actions_enabled(False)
+            self.mode = mode
+            self.cancelled = False
+            self.compare_work = CompareWork(store, compare_func)
+            self.compare_work.progress_signal.connect(self.show_progress)
+            self.compare_work.result_signal.connect(self.show_result)
+            self.compare_work.start()
         except Exception:
             logger.exception("An error occurred during data comparison.")
+            self._set_actions_enabled(True)
             self.status_updated.emit(self.lang['label_status_error'])
 
-    def _reorganize_data(self, original_data: Dict[int, Dict[str, str]]) -> Optional[Dict[str, List[Dict[str, str]]]]:
+    def _set_actions_enabled(self, enabled: bool) -> None:
         """
-        将原始数据根据特定的规则进行重组。
+        同时启用或禁用两个对比动作。
 
-        此方法接收原始数据字典，并按照预设的环境键进行重组，最终返回一个新的数据结构。
+        :param enabled: 是否启用。
+        :type enabled: bool
 
-        :param original_data: 原始数据字典，键为行数，值对应一行数据。
-        :type original_data: Dict[int, Dict[str, str]]
-        :return: 重组后的数据字典。类似于：{'生产环境': [{'服务': 'service', '分组': 'application'}], '预览环境': [{'服务': 'service', '分组': 'application'}]}
-        :rtype: Optional[Dict[str, List[Dict[str, str]]]]
+        :rtype: None
+        :return: 无返回值。
         """
-        try:
-            # 先初始化字典结构，每个环境key对应一个值列表，列表内容为每行的数据
-            env_keys = [
-                self.lang['ui.dialog_settings_connection_2'],
-                self.lang['ui.dialog_settings_connection_3'],
-                self.lang['ui.dialog_settings_connection_4'],
-                self.lang['ui.dialog_settings_connection_5']
-            ]
-            new_data = {env: [] for env in env_keys}
-
-            # 获取每行的数据字典entry，类似于：{'服务': 'web', '分组': 'application'}
-            for entry in original_data.values():
-                # 表头中显示的环境名称，可直接在entry中作为key取值
-                for env in env_keys:
-                    # 只获取服务、分组、配置键和值四个元素
-                    env_data = {
-                        self.lang['ui.table_main_1']: entry[self.lang['ui.table_main_1']],
-                        self.lang['ui.table_main_2']: entry[self.lang['ui.table_main_2']],
-                        self.lang['ui.table_main_3']: entry[self.lang['ui.table_main_3']],
-                        self.lang['ui.action_compare_3']: entry[env]
-                    }
-                    # 将数据插入到new_data字典中
-                    new_data[env].append(env_data)
-
-            return new_data
-        except Exception:
-            logger.exception("Failed to reorganize data.")
-            return None
+        self.action_compare.setEnabled(enabled)
+        self.action_similar.setEnabled(enabled)
 
-    def _compare_environments(self, new_data: Dict[str, List[Dict[str, str]]]) -> Dict[str, Dict[str, List[Dict[str, str]]]]:
+    def show_progress(self, percent: int) -> None:
         """
-        对不同环境的配置数据进行对比。
+        在状态栏显示对比进度。
 
-        此函数接收一个字典，字典的键是环境名称，值是对应该环境的配置项列表。它将每个环境的配置数据通过 filter_and_group_items 方法进行处理和分组。
+        :param percent: 进度百分比。
+        :type percent: int
 
-        :param new_data: 各环境的配置数据。
-        :type new_data: Dict[str, List[Dict[str, str]]]
+        :rtype: None
+        :return: 无返回值。
+        """
+        self.status_updated.emit(f"{self.lang['ui.action_compare_5']} {percent}%")
 
-        :return: 经过筛选和分组的环境配置数据。例如：{'生产环境': {'server.port+8088': [{'服务': 'service', '分组': 'application'}, {'服务': 'web', '分组': 'application'}],...},'预览环境': {},...}
-        :rtype: Dict[str, Dict[str, List[Dict[str, str]]]]
+    def show_result(self, store: ResultStore, groups: Optional[Dict[str, List[array]]]) -> None:
         """
-        # 按环境解包，items中有所有当前环境的配置
-        return {env: self._filter_and_group_items(items) for env, items in new_data.items()}
+        接收后台对比结果，并打开对话框展示。
 
-    def _filter_and_group_items(self, items: List[Dict[str, str]]) -> Dict[str, List[Dict[str, str]]]:
+        :param store: 对比所用的结果存储。
+        :type store: ResultStore
+        :param groups: 各环境的分组结果，失败时为 None。
+        :type groups: Optional[Dict[str, List[array]]]
+
+        :rtype: None
+        :return: 无返回值。
         """
-        对给定的数据项进行筛选和分组。
+        self._set_actions_enabled(True)
+        try:
+            # 被中止的对比不展示结果
+            if self.cancelled:
+                logger.info("Comparison was cancelled.")
+                return
+            if groups is None:
+                logger.error("Environment comparison failed.")
+                self.status_updated.emit(self.lang['label_status_error'])
+                return
 
-        此函数接收一个列表，列表中的每个元素是字典，代表一行数据。它首先过滤掉值为'None'的项，然后根据特定的键值对数据进行分组。
+            # 打开带表格组件的对话框，展示结果。两种模式只有标题和提示文字不同
+            exact = self.mode == 'exact'
+            title_key = 'ui.dialog_comparison_1' if exact else 'ui.dialog_comparison_7'
+            self.dialog_comparison = DialogComparison(self.lang_manager, self.config_manager, store, groups, title_key)
+            self.dialog_comparison.status_updated.connect(self.forward_status)
+            self.dialog_comparison.show()
+            message_key = 'ui.action_compare_6' if exact else 'ui.action_compare_9'
+            self.status_updated.emit(f"{sum(len(env_groups) for env_groups in groups.values())} {self.lang[message_key]}")
+            # 连接全局信号，主窗口关闭时一并关闭。
+            global_signals.close_all.connect(self.close_dialog)
+        except Exception:
+            logger.exception("An error occurred while showing comparison result.")
+            self.status_updated.emit(self.lang['label_status_error'])
 
-        :param items: 要筛选和分组的数据列表。
-        :type items: List[Dict[str, str]]
+    def stop_work(self) -> None:
+        """
+        中止正在运行的对比，并等待后台线程结束。由主窗口发送信号调用，避免主窗口关闭后线程还在运行。
 
-        :return: 分组后的数据字典。
-        :rtype: Dict[str, List[Dict[str, str]]]
+        :rtype: None
+        :return: 无返回值。
         """
-        grouped = {}
-        # 一个item是筛选后的一行数据
-        for item in items:
-            # 跳过None值，不加入对比
-            if item.get(self.lang['ui.action_compare_3']) == 'None':
-                continue
-            # 拼接索引用的key
-            key = f"{item[self.lang['ui.table_main_3']]}+{item[self.lang['ui.action_compare_3']]}"
-            # 将行数据插入到列表中
-            grouped.setdefault(key, []).append(item)
-        # 筛选掉列表长度小于2的键值对
-        return {k: v for k, v in grouped.items() if len(v) > 1}
+        if self.compare_work is not None and self.compare_work.isRunning():
+            self.cancelled = True
+            self.compare_work.requestInterruption()
+            self.compare_work.wait()
 
     def close_dialog(self) -> None:
         """
@@ -220,3 +244,34 @@ class ActionCompare(QObject):
         :return: 无返回值。
         """
         self.status_updated.emit(message)
+
+
+class CompareWork(QThread):
+    """
+    在后台对结果存储进行分组对比。
+
+    :param store: 主表格的结果存储。
+    :type store: ResultStore
+    :param compare_func: 对比函数，例如 `compare_groups` 或 `find_similar_groups`。
+    :type compare_func: Callable
+    """
+    progress_signal = pyqtSignal(int)
+    result_signal = pyqtSignal(object, object)
+
+    def __init__(self,
+                 store: ResultStore,
+                 compare_func: Callable):
+        super().__init__()
+        self.store = store
+        self.compare_func = compare_func
+
+    @log_time
+    def run(self) -> None:
+        """
+        执行分组对比，完成后通过信号返回结果。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        groups = self.compare_func(self.store, self.progress_signal.emit, self.isInterruptionRequested)
+        self.result_signal.emit(self.store, groups)
@@ -11,9 +11,9 @@
 import logging
 from typing import Optional, List
 
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, pyqtSignal, QItemSelectionRange
 from PyQt5.QtGui import QIcon
-from PyQt5.QtWidgets import QAction, QApplication, QTableWidgetSelectionRange, QTableWidget
+from PyQt5.QtWidgets import QAction, QApplication, QTableView
 
 from lib.get_resource_path import get_resource_path
 from ui.lang_manager import LangManager
@@ -29,14 +29,14 @@ class ActionCopy(QObject):
 
     :param lang_manager: 用于管理语言设置的对象。
     :type lang_manager: LangManager
-    :param table: 表格对象，用于操作表格数据。
-    :type table: QTableWidget
+    :param table: 表格对象，用于操作表格数据。QTableWidget 和基于模型的 QTableView 都适用。
+    :type table: QTableView
     """
     status_updated = pyqtSignal(str)
 
     def __init__(self,
                  lang_manager: LangManager,
-                 table: QTableWidget):
+                 table: QTableView):
         super().__init__()
         self.lang_manager = lang_manager
         self.lang_manager.lang_updated.connect(self.update_lang)
@@ -76,7 +76,7 @@ class ActionCopy(QObject):
         :return: 复制的数据字符串，如果没有选中任何内容，则返回 None。
         """
         try:
-            selected_ranges = self.table.selectedRanges()
+            selected_ranges = list(self.table.selectionModel().selection())
             if not selected_ranges:
                 return None
 
@@ -89,14 +89,14 @@ class ActionCopy(QObject):
             self.status_updated.emit(self.lang['label_status_error'])
             return None
 
-    def _format_selected_data(self, selected_ranges: List[QTableWidgetSelectionRange]) -> str:
+    def _format_selected_data(self, selected_ranges: List[QItemSelectionRange]) -> str:
         """
         格式化选中的数据为字符串。
 
         遍历选中的每个区域，提取并格式化数据。
 
         :param selected_ranges: 选中的表格区域列表。
-        :type selected_ranges: List[QTableWidgetSelectionRange]
+        :type selected_ranges: List[QItemSelectionRange]
         :rtype: str
         :return: 格式化后的数据字符串。
         """
@@ -105,24 +105,24 @@ class ActionCopy(QObject):
             for data in self._extract_range_data(selected_range)
         ).strip()
 
-    def _extract_range_data(self, selected_range: QTableWidgetSelectionRange) -> List[str]:
+    def _extract_range_data(self, selected_range: QItemSelectionRange) -> List[str]:
         """
         提取选中区域的数据。
 
         对给定的表格区域，按行提取数据。
 
         :param selected_range: 选中的表格区域。
-        :type selected_range: QTableWidgetSelectionRange
+        :type selected_range: QItemSelectionRange
         :rtype: List[str]
         :return: 提取的行数据列表。
         """
         return [
             '\t'.join(self._extract_row_data(row, selected_range))
-            for row in range(selected_range.topRow(), selected_range.bottomRow() + 1)
+            for row in range(selected_range.top(), selected_range.bottom() + 1)
             if not self.table.isRowHidden(row)
         ]
 
-    def _extract_row_data(self, row: int, selected_range: QTableWidgetSelectionRange) -> List[str]:
+    def _extract_row_data(self, row: int, selected_range: QItemSelectionRange) -> List[str]:
         """
         提取指定行的数据。
 
@@ -131,12 +131,13 @@ class ActionCopy(QObject):
         :param row: 行号。
         :type row: int
         :param selected_range: 选中的表格区域。
-        :type selected_range: QTableWidgetSelectionRange
+        :type selected_range: QItemSelectionRange
         :rtype: List[str]
         :return: 提取的单元格数据列表。
         """
+        model = self.table.model()
         return [
-            self.table.item(row, col).text() if self.table.item(row, col) else ''
-            for col in range(selected_range.leftColumn(), selected_range.rightColumn() + 1)
+            str(model.index(row, col).data() or '')
+            for col in range(selected_range.left(), selected_range.right() + 1)
             if not self.table.isColumnHidden(col)
         ]
@@ -1,7 +1,7 @@
 """
 此模块用于创建和管理调试操作界面，主要包括 ActionDebug 类。
 
-ActionDebug 类提供了一个调试操作的接口，里面可以输入要调试的代码。
+ActionDebug 类打开性能分析对话框 `DialogProfile`，用来分析下一次开始运行或过滤操作的函数耗时和内存分配。
 
 :author: assassing
 :contact: https://github.com/hxz393
@@ -16,8 +16,11 @@ from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QAction
 
 from lib.get_resource_path import get_resource_path
+from ui.action_registry import action_registry
 from ui.config_manager import ConfigManager
+from ui.dialog_profile import DialogProfile
 from ui.filter_bar import FilterBar
+from ui.global_signals import global_signals
 from ui.lang_manager import LangManager
 from ui.table_main import TableMain
 
@@ -45,13 +48,12 @@ class ActionDebug(QObject):
                  table: TableMain,
                  filter_bar: FilterBar):
         super().__init__()
-        super().__init__()
         self.lang_manager = lang_manager
         self.lang_manager.lang_updated.connect(self.update_lang)
         self.config_manager = config_manager
         self.table = table
         self.filter_bar = filter_bar
-        self.config_window = None
+        self.dialog_profile = None
         self.initUI()
 
     def initUI(self) -> None:
@@ -91,9 +93,40 @@ class ActionDebug(QObject):
 
     def debug(self) -> None:
         """
-        执行调试代码。
+        打开性能分析对话框。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        try:
+            # 对话框只创建一次，非阻塞显示，分析期间可以继续操作主窗口
+            self.dialog_profile = action_registry.dialog('profile', self._create_dialog)
+            self.dialog_profile.show()
+            self.dialog_profile.raise_()
+            self.dialog_profile.activateWindow()
+        except Exception:
+            logger.exception("An error occurred while opening the profile dialog")
+            self.status_updated.emit(self.lang['label_status_error'])
+
+    def _create_dialog(self) -> DialogProfile:
+        """
+        创建性能分析对话框并连接信号。
+
+        :rtype: DialogProfile
+        :return: 性能分析对话框。
+        """
+        dialog = DialogProfile(self.lang_manager)
+        dialog.status_updated.connect(self.forward_status)
+        # 连接全局信号，主窗口关闭时一并关闭。
+        global_signals.close_all.connect(self.close_dialog)
+        return dialog
+
+    def close_dialog(self) -> None:
+        """
+        关闭性能分析对话框。由主窗口发送信号调用。
 
         :rtype: None
         :return: 无返回值。
         """
-        self.status_updated.emit('Hello World!')
+        if self.dialog_profile is not None:
+            self.dialog_profile.close()
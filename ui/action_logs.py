@@ -15,6 +15,7 @@ from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QAction
 
 from lib.get_resource_path import get_resource_path
+from ui.action_registry import action_registry
 from ui.dialog_logs import DialogLogs
 from ui.lang_manager import LangManager
 from ui.global_signals import global_signals
@@ -75,16 +76,31 @@ class ActionLogs(QObject):
         :return: 无返回值。
         """
         try:
-            # 实例化显示方式，非阻塞调用。exec_()为阻塞调用。
-            self.dialog_logs = DialogLogs(self.lang_manager)
-            self.dialog_logs.status_updated.connect(self.forward_status)
-            self.dialog_logs.show()
-            # 连接全局信号，主窗口关闭时一并关闭。
-            global_signals.close_all.connect(self.close_dialog)
+            # 对话框只创建一次，再次打开时重新读取日志。非阻塞调用，exec_()为阻塞调用。
+            self.dialog_logs = action_registry.dialog('logs', self._create_dialog)
+            if self.dialog_logs.isVisible():
+                self.dialog_logs.raise_()
+                self.dialog_logs.activateWindow()
+            else:
+                self.dialog_logs.load_logs()
+                self.dialog_logs.show()
         except Exception:
             logger.exception("An error occurred while opening the logs dialog")
             self.status_updated.emit(self.lang['label_status_error'])
 
+    def _create_dialog(self) -> DialogLogs:
+        """
+        创建日志对话框并连接信号。
+
+        :rtype: DialogLogs
+        :return: 日志对话框。
+        """
+        dialog = DialogLogs(self.lang_manager)
+        dialog.status_updated.connect(self.forward_status)
+        # 连接全局信号，主窗口关闭时一并关闭。
+        global_signals.close_all.connect(self.close_dialog)
+        return dialog
+
     def close_dialog(self) -> None:
         """
         关闭日志对话框。由主窗口发送信号调用，避免主窗口关闭后，日志窗口还运行。
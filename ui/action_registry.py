@@ -0,0 +1,125 @@
+"""
+这个模块提供了动作和对话框的共享注册表。
+
+`ActionRegistry` 保存动作的创建函数，第一次用到某个动作时才创建，之后一直复用同一个实例。主窗口的菜单、工具栏和主表格的右键菜单都从注册表取动作，不再各自创建一套，每个动作只连接一次语言更新信号，快捷键也不会重复注册。
+
+注册表也缓存非模态或内容固定的对话框，再次打开时直接显示原来的窗口。
+
+动作的 `status_updated` 和 `filter_updated` 信号在创建时统一转发到注册表的同名信号，主窗口只需连接注册表。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+from typing import Callable, Dict
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtWidgets import QDialog
+
+logger = logging.getLogger(__name__)
+
+
+class ActionRegistry(QObject):
+    """
+    动作和对话框的共享注册表。
+
+    :example:
+    >>> registry = ActionRegistry()
+    >>> registry.register('demo', QObject)
+    >>> registry.is_created('demo'), registry.get('demo') is registry.get('demo'), registry.is_created('demo')
+    (False, True, True)
+    """
+    status_updated = pyqtSignal(str)
+    filter_updated = pyqtSignal(list)
+
+    def __init__(self):
+        super().__init__()
+        self._factories: Dict[str, Callable[[], QObject]] = {}
+        self._actions: Dict[str, QObject] = {}
+        self._dialogs: Dict[str, QDialog] = {}
+
+    def register(self,
+                 name: str,
+                 factory: Callable[[], QObject]) -> None:
+        """
+        注册动作的创建函数。已经创建的同名动作会被丢弃。
+
+        :param name: 动作名。
+        :type name: str
+        :param factory: 无参数的创建函数，返回动作对象。
+        :type factory: Callable[[], QObject]
+        :rtype: None
+        :return: 无返回值。
+        """
+        self._factories[name] = factory
+        self._actions.pop(name, None)
+
+    def get(self, name: str) -> QObject:
+        """
+        获取动作，第一次获取时创建。
+
+        :param name: 动作名。
+        :type name: str
+        :rtype: QObject
+        :return: 动作对象。
+        :raise KeyError: 动作没有注册时抛出。
+        """
+        action = self._actions.get(name)
+        if action is None:
+            action = self._actions[name] = self._factories[name]()
+            # 统一转发动作的信号
+            if hasattr(action, 'status_updated'):
+                action.status_updated.connect(self.status_updated)
+            if hasattr(action, 'filter_updated'):
+                action.filter_updated.connect(self.filter_updated)
+            logger.debug(f"Action created: {name}")
+        return action
+
+    def is_created(self, name: str) -> bool:
+        """
+        判断动作是否已经创建。
+
+        :param name: 动作名。
+        :type name: str
+        :rtype: bool
+        :return: 已创建返回 True。
+        """
+        return name in self._actions
+
+    def dialog(self,
+               name: str,
+               factory: Callable[[], QDialog]) -> QDialog:
+        """
+        获取缓存的对话框，第一次获取时创建。
+
+        :param name: 对话框名。
+        :type name: str
+        :param factory: 无参数的创建函数，返回对话框。
+        :type factory: Callable[[], QDialog]
+        :rtype: QDialog
+        :return: 对话框。
+        """
+        dialog = self._dialogs.get(name)
+        if dialog is None:
+            dialog = self._dialogs[name] = factory()
+        return dialog
+
+    def discard_dialog(self, name: str) -> None:
+        """
+        关闭并丢弃缓存的对话框，例如界面语言改变后，内容固定的对话框需要重新创建。
+
+        :param name: 对话框名。
+        :type name: str
+        :rtype: None
+        :return: 无返回值。
+        """
+        dialog = self._dialogs.pop(name, None)
+        if dialog is not None:
+            dialog.close()
+            dialog.deleteLater()
+
+
+# 创建注册表的单一实例
+action_registry = ActionRegistry()
@@ -4,6 +4,8 @@
 类 `ActionSave` 封装了与数据保存相关的所有操作，包括初始化界面、更新语言设置以及执行保存动作。
 此类是与 PyQt5 相关的 GUI 操作的一部分，用于实现用户的数据保存需求。
 
+界面线程只记录可见行的行号标识和可见列，数据由 `SaveWork` 在后台线程中从结果存储逐行读取并写入文件，支持显示进度和中途取消。
+
 :author: assassing
 :contact: https://github.com/hxz393
 :copyright: Copyright 2023, hxz393. 保留所有权利。
@@ -11,13 +13,17 @@
 
 import logging
 import os
-from typing import Dict, Optional
+from array import array
+from typing import Dict, Optional, List, Iterator, Tuple
 
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal
 from PyQt5.QtGui import QIcon
-from PyQt5.QtWidgets import QAction, QFileDialog, QTableWidget
+from PyQt5.QtWidgets import QAction, QFileDialog, QTableView, QProgressDialog
 
+from config.settings import SAVE_FILE_FILTERS
 from lib.get_resource_path import get_resource_path
+from lib.log_time import log_time
+from module.result_store import ResultStore, COLUMN_KEYS
 from module.save_data_to_file import save_data_to_file
 from ui.lang_manager import LangManager
 from ui.message_show import message_show
@@ -33,18 +39,20 @@ class ActionSave(QObject):
 
     :param lang_manager: 用于管理语言设置的对象。
     :type lang_manager: LangManager
-    :param table: 表格对象，用于操作表格数据。
-    :type table: QTableWidget
+    :param table: 表格对象，用于操作表格数据。QTableWidget 和基于模型的 QTableView 都适用。
+    :type table: QTableView
     """
     status_updated = pyqtSignal(str)
 
     def __init__(self,
                  lang_manager: LangManager,
-                 table: QTableWidget):
+                 table: QTableView):
         super().__init__()
         self.lang_manager = lang_manager
         self.lang_manager.lang_updated.connect(self.update_lang)
         self.table = table
+        self.save_work = None
+        self.progress_dialog = None
         self.initUI()
 
     def initUI(self) -> None:
@@ -74,23 +82,147 @@ class ActionSave(QObject):
         """
         触发保存文件的操作。
 
-        此方法弹出文件保存对话框，允许用户选择保存格式和位置，并执行保存操作。
+        此方法弹出文件保存对话框，允许用户选择保存格式和位置，然后在后台线程执行保存操作。
 
         :rtype: None
         :return: 无返回值。
         """
         try:
-            table_data = self._extract_table_data()
-            if table_data is None:
+            # 上一次导出还没结束，不重复启动
+            if self.save_work is not None and self.save_work.isRunning():
+                return None
+
+            export_source = self._collect_export_source()
+            if export_source is None:
                 message_show('Critical', self.lang['ui.action_save_8'])
                 return None
 
-            file_name, file_type = QFileDialog.getSaveFileName(None, self.lang['ui.action_save_3'], "", "CSV Files (*.csv);;JSON Files (*.json)", options=QFileDialog.Options())
+            file_name, file_type = QFileDialog.getSaveFileName(None, self.lang['ui.action_save_3'], "", ";;".join(SAVE_FILE_FILTERS), options=QFileDialog.Options())
             if not file_name or not file_type:
                 return None
+            file_name = self._apply_suffix(file_name, file_type[file_type.find('(*') + 2:file_type.rfind(')')])
+
+            store, row_ids, columns, headers, text_mappings = export_source
+            self.save_work = SaveWork(file_name, file_type, store, row_ids, columns, headers, text_mappings)
+            self.save_work.progress_signal.connect(self._show_progress)
+            self.save_work.result_signal.connect(self._save_finished)
+            self._open_progress_dialog()
+            self.save_work.start()
+        except Exception:
+            logger.exception("Error saving file")
+            self.status_updated.emit(self.lang['label_status_error'])
+
+    @staticmethod
+    def _apply_suffix(file_name: str, suffix: str) -> str:
+        """
+        按所选类型补全扩展名。文件名没有扩展名时补上完整扩展名；已经是基础扩展名时只补压缩扩展名；其他扩展名保持不变。
+
+        :param file_name: 用户输入的文件名。
+        :type file_name: str
+        :param suffix: 所选类型的扩展名，例如 '.ndjson.gz'。
+        :type suffix: str
+        :rtype: str
+        :return: 补全后的文件名。
+
+        :example:
+        >>> [ActionSave._apply_suffix(name, '.ndjson.gz') for name in ['out', 'out.ndjson', 'out.NDJSON.gz', 'out.txt']]
+        ['out.ndjson.gz', 'out.ndjson.gz', 'out.NDJSON.gz', 'out.txt']
+        >>> ActionSave._apply_suffix('report.csv', '.csv')
+        'report.csv'
+        """
+        lower_name = file_name.lower()
+        if not suffix or lower_name.endswith(suffix):
+            return file_name
+        base, compression = os.path.splitext(suffix) if suffix.count('.') > 1 else (suffix, '')
+        if compression and lower_name.endswith(base):
+            return file_name + compression
+        if not os.path.splitext(os.path.basename(file_name))[1]:
+            return file_name + suffix
+        return file_name
+
+    def _collect_export_source(self) -> Optional[Tuple[ResultStore, array, List[str], List[str], Dict[str, Dict[str, str]]]]:
+        """
+        收集导出所需的信息：结果存储、可见行的行号标识、可见列的列名和表头，以及显示文字映射。
+
+        主表格通过行号标识读取存储，查重结果表格通过模型中的行号标识数组读取。这里只遍历行的隐藏状态，不读取单元格文字。
+
+        :return: 导出信息元组；表格没有关联结果存储时返回 None。
+        :rtype: Optional[Tuple[ResultStore, array, List[str], List[str], Dict[str, Dict[str, str]]]]
+        """
+        model = self.table.model()
+        if hasattr(self.table, 'result_store'):
+            # 主表格：列名按列号排列，状态列导出显示文字
+            store = self.table.result_store
+            row_id_of = self.table.row_id
+            column_keys = COLUMN_KEYS
+            text_mappings = {'consistency': self.table.consistency_status_mapping,
+                             'skip': self.table.skip_status_mapping}
+        elif hasattr(model, 'store'):
+            # 查重结果表格
+            store = model.store
+            row_id_of = model.row_ids.__getitem__
+            column_keys = model.columns
+            text_mappings = {}
+        else:
+            return None
+
+        # 可见行掩码：按视图顺序记录不隐藏行的行号标识
+        row_ids = array('I', (row_id_of(row) for row in range(model.rowCount()) if not self.table.isRowHidden(row)))
+        visible_columns = [col for col in range(model.columnCount()) if not self.table.isColumnHidden(col)]
+        columns = [column_keys[col] for col in visible_columns]
+        headers = [model.headerData(col, Qt.Horizontal) for col in visible_columns]
+        return store, row_ids, columns, headers, text_mappings
+
+    def _open_progress_dialog(self) -> None:
+        """
+        打开带取消按钮的进度对话框。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        self.progress_dialog = QProgressDialog(self.lang['ui.action_save_9'], self.lang['ui.dialog_settings_main_12'], 0, 100)
+        self.progress_dialog.setWindowTitle(self.lang['ui.action_save_1'])
+        self.progress_dialog.setWindowModality(Qt.ApplicationModal)
+        # 导出很快完成时不弹出对话框
+        self.progress_dialog.setMinimumDuration(500)
+        self.progress_dialog.setAutoClose(False)
+        self.progress_dialog.setAutoReset(False)
+        self.progress_dialog.canceled.connect(self.save_work.requestInterruption)
+        self.progress_dialog.setValue(0)
+
+    def _show_progress(self, percent: int) -> None:
+        """
+        更新进度对话框。
+
+        :param percent: 进度百分比。
+        :type percent: int
+        :rtype: None
+        :return: 无返回值。
+        """
+        if self.progress_dialog is not None:
+            self.progress_dialog.setValue(percent)
+
+    def _save_finished(self, file_name: str, save_result: Optional[bool], cancelled: bool) -> None:
+        """
+        后台保存结束后关闭进度对话框，并提示结果。
 
-            save_result = save_data_to_file(file_name, file_type, table_data)
-            if save_result:
+        :param file_name: 保存的文件名。
+        :type file_name: str
+        :param save_result: 保存结果，成功为True，失败为False，异常为None。
+        :type save_result: Optional[bool]
+        :param cancelled: 是否被用户取消。
+        :type cancelled: bool
+        :rtype: None
+        :return: 无返回值。
+        """
+        try:
+            if self.progress_dialog is not None:
+                self.progress_dialog.close()
+                self.progress_dialog = None
+
+            if cancelled:
+                self.status_updated.emit(self.lang['ui.action_save_10'])
+            elif save_result:
                 self.status_updated.emit(self.lang['ui.action_save_5'])
                 logger.info(f"File saved to: '{file_name}', File size: {os.path.getsize(file_name):,} Bytes")
             else:
@@ -99,19 +231,70 @@ class ActionSave(QObject):
             logger.exception("Error saving file")
             self.status_updated.emit(self.lang['label_status_error'])
 
-    def _extract_table_data(self) -> Optional[Dict[int, Dict[str, str]]]:
+
+class SaveWork(QThread):
+    """
+    在后台线程中把结果存储的可见部分流式写入文件。
+
+    :param file_name: 文件名，包含路径。
+    :type file_name: str
+    :param file_type: 文件对话框返回的文件类型过滤器。
+    :type file_type: str
+    :param store: 结果存储。
+    :type store: ResultStore
+    :param row_ids: 要导出行的行号标识，按导出顺序排列。
+    :type row_ids: array
+    :param columns: 要导出的列名。
+    :type columns: List[str]
+    :param headers: 与列名对应的表头。
+    :type headers: List[str]
+    :param text_mappings: 列名到显示文字映射的字典。
+    :type text_mappings: Dict[str, Dict[str, str]]
+    """
+    progress_signal = pyqtSignal(int)
+    result_signal = pyqtSignal(str, object, bool)
+
+    def __init__(self,
+                 file_name: str,
+                 file_type: str,
+                 store: ResultStore,
+                 row_ids: array,
+                 columns: List[str],
+                 headers: List[str],
+                 text_mappings: Dict[str, Dict[str, str]]):
+        super().__init__()
+        self.file_name = file_name
+        self.file_type = file_type
+        self.store = store
+        self.row_ids = row_ids
+        self.columns = columns
+        self.headers = headers
+        self.text_mappings = text_mappings
+
+    @log_time
+    def run(self) -> None:
+        """
+        执行保存，完成后通过信号返回结果。
+
+        :rtype: None
+        :return: 无返回值。
         """
-        从表格中提取数据。
+        save_result = save_data_to_file(self.file_name, self.file_type, self.headers, self._iter_rows(), self.isInterruptionRequested)
+        self.result_signal.emit(self.file_name, save_result, self.isInterruptionRequested())
 
-        此方法遍历配置中心比较器的表格，提取不隐藏的行和列的数据。
+    def _iter_rows(self) -> Iterator[List[str]]:
+        """
+        逐行产生导出数据，期间报告进度。用户取消后停止产生数据。
 
-        :return: 表格数据的字典，键为行号，值为该行的数据字典；如果提取失败，则返回None。
-        :rtype: Optional[Dict[int, Dict[str, str]]]
+        :rtype: Iterator[List[str]]
+        :return: 逐行产生的值列表。
         """
-        return {
-            row: {
-                self.table.horizontalHeaderItem(col).text(): self.table.item(row, col).text()
-                for col in range(self.table.columnCount()) if not self.table.isColumnHidden(col)
-            }
-            for row in range(self.table.rowCount()) if not self.table.isRowHidden(row)
-        }
+        total = len(self.row_ids)
+        # 大约每 1% 报告一次进度，并检查是否取消
+        step = max(total // 100, 1)
+        for done, row in enumerate(self.store.iter_rows(self.row_ids, self.columns, self.text_mappings), start=1):
+            yield row
+            if done % step == 0:
+                if self.isInterruptionRequested():
+                    return
+                self.progress_signal.emit(done * 100 // total)
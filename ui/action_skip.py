@@ -11,7 +11,7 @@
 import logging
 from typing import List
 
-from PyQt5.QtCore import Qt, QObject, pyqtSignal
+from PyQt5.QtCore import QObject, pyqtSignal
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QAction, QTableWidget
 
@@ -102,8 +102,8 @@ class ActionSkip(QObject):
         :rtype: List[str]
         :return: 更新后的忽略列表。
         """
-        # 获取配置
-        skip_list = self.config_manager.get_skip_list()
+        # 获取配置，转换为可修改的列表
+        skip_list = list(self.config_manager.get_skip_list())
 
         for item in self.table.selectedItems():
             row = item.row()
@@ -123,5 +123,4 @@ class ActionSkip(QObject):
         :rtype: None
         :return: 无返回值。
         """
-        self.table.item(row, COL_INFO['skip']['col']).setData(Qt.UserRole, "yes")
-        self.table.item(row, COL_INFO['skip']['col']).setData(Qt.DisplayRole, self.lang['ui.action_start_12'])
+        self.table.set_skip_status(row, "yes")
@@ -3,23 +3,32 @@
 
 本模块中包含的类负责应用程序的主要操作流程，如用户界面的初始化、按钮动作的处理、后台数据查询、数据展示等。主要类包括`ActionStart`和`StartWork`，分别负责处理用户界面动作和执行后台工作。
 
+每次运行完成后保存结果快照。程序启动时先从快照展示上一次的结果，再在后台刷新，新结果到达后才替换表格内容。
+
 :author: assassing
 :contact: https://github.com/hxz393
 :copyright: Copyright 2023, hxz393. 保留所有权利。
 """
 
 import logging
+import threading
 from typing import Dict, List
 
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QObject
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QAction, QHeaderView
 
-from config.settings import COL_INFO
+from config.settings import COL_INFO, METRICS_PATH, TRACE_PATH
 from lib.get_resource_path import get_resource_path
+from lib.run_metrics import metrics
+from lib.run_profiler import profiler
 from module.execute_queries import execute_queries
+from module.get_failed_envs import get_failed_envs
+from module.history_store import HistoryStore
+from module.result_snapshot import save_snapshot, load_snapshot
 from ui.config_manager import ConfigManager
 from ui.filter_bar import FilterBar
+from ui.global_signals import global_signals
 from ui.lang_manager import LangManager
 from ui.message_show import message_show
 from ui.table_main import TableMain
@@ -56,6 +65,11 @@ class ActionStart(QObject):
         self.config_manager = config_manager
         self.table = table
         self.filter_bar = filter_bar
+        # 后台刷新时不弹出错误对话框，只在状态栏提示
+        self.silent = False
+        self.snapshot_time = ''
+        self.start_work = None
+        self.run_succeeded = False
         self.initUI()
 
     def initUI(self) -> None:
@@ -87,12 +101,61 @@ class ActionStart(QObject):
         """
         启动更新动作的处理流程。
 
-        此方法负责初始化和启动一个后台线程 `StartWork`，该线程执行数据查询和表格更新。同时，该方法还负责连接信号和槽以进行 UI 更新。
+        :rtype: None
+        :return: 无返回值。
+        """
+        self._start_work(silent=False)
+
+    def refresh(self) -> None:
+        """
+        在后台刷新结果。与 `start` 相同，但出错时不弹出对话框。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        self._start_work(silent=True)
+
+    def load_snapshot(self) -> bool:
+        """
+        从上一次运行保存的快照填充表格，不连接数据库。
+
+        :rtype: bool
+        :return: 成功展示快照返回 True，没有快照或读取失败返回 False。
+        """
+        try:
+            snapshot = load_snapshot()
+            if snapshot is None:
+                return False
+            store, query_statuses, self.snapshot_time = snapshot
+            # 快照的存储直接作为表格的存储，不再复制成行列表
+            with metrics.span('table_fill'):
+                self.prepare_table()
+                self.table.load_store(store)
+            metrics.count('table_rows', len(store))
+            self.table_column_hide(query_statuses)
+            self.finalize()
+            logger.info(f'Snapshot saved at {self.snapshot_time} loaded, {len(store)} rows')
+            return True
+        except Exception:
+            logger.exception('Failed to load result snapshot.')
+            self.status_updated.emit(self.lang['label_status_error'])
+            return False
 
+    def _start_work(self, silent: bool) -> None:
+        """
+        初始化和启动一个后台线程 `StartWork`，该线程执行数据查询和表格更新。同时，该方法还负责连接信号和槽以进行 UI 更新。
+
+        :param silent: 是否为后台刷新。
+        :type silent: bool
         :rtype: None
         :return: 无返回值。
         """
         try:
+            # 上一次运行的线程还在保存历史和快照时，不启动新的运行
+            if self.start_work is not None and self.start_work.isRunning():
+                return
+            self.silent = silent
+            self.run_succeeded = False
             # 初始化子线程，传入语言字典和配置
             self.start_work = StartWork(self.lang, self.config_manager)
             # 连接信号槽，都是 UI 操作，必须主线程中进行
@@ -101,26 +164,45 @@ class ActionStart(QObject):
             self.start_work.table_column_hide_signal.connect(self.table_column_hide)
             self.start_work.finalize_signal.connect(self.finalize)
             self.start_work.message.connect(self.show_result_message)
-            # 开始运行
+            # 线程结束信号排在所有界面槽之后，这时跟踪事件已经完整
+            self.start_work.finished.connect(self.work_finished)
+            # 已经准备好性能分析时，从这里开始分析，到线程结束为止
+            profiler.begin('start')
+            # 开始记录本次运行的耗时和计数。必须在状态栏开始采样之前清空，否则会清掉最初采样的峰值
+            metrics.reset()
+            # 开始运行，状态栏开始采样资源占用
+            global_signals.run_started.emit()
             self.start_work.start()
         except Exception:
             logger.exception('Failed to initiate start action.')
             self.status_updated.emit(self.lang['label_status_error'])
 
+    @metrics.traced('ui.initialize')
     def initialize(self) -> None:
         """
         初始化界面和状态，在开始操作前执行。
 
-        此方法用于设置 UI 元素的初始状态，如禁用按钮、清空表格等。
+        此方法用于设置 UI 元素的初始状态，如禁用按钮。表格在查询完成、新数据到达时才清空，查询期间仍可查看旧数据。
 
         :rtype: None
         :return: 无返回值。
         """
         logger.info('Start running')
         # 状态栏发送提示消息
-        self.status_updated.emit(self.lang['ui.action_start_3'])
+        if self.silent and self.snapshot_time:
+            self.status_updated.emit(self.lang['ui.action_start_14'].format(self.snapshot_time))
+        else:
+            self.status_updated.emit(self.lang['ui.action_start_3'])
         # 开始按钮不可点击
         self.action_start.setEnabled(False)
+
+    def prepare_table(self) -> None:
+        """
+        插入新数据前清空表格，并禁用排序、更新和过滤栏。
+
+        :rtype: None
+        :return: 无返回值。
+        """
         # 禁用表格排序
         self.table.setSortingEnabled(False)
         # 禁用表格更新
@@ -136,8 +218,9 @@ class ActionStart(QObject):
         self.table.clear()
         # 初始化表宽
         self.table.set_header_resize()
-        logger.debug('Initialization finished')
+        logger.debug('Table cleared')
 
+    @metrics.traced('ui.table_insert')
     def table_insert(self, table_rows: List[List[List[str]]]) -> None:
         """
         将查询结果插入到主表格中。
@@ -150,10 +233,14 @@ class ActionStart(QObject):
         :rtype: None
         :return: 无返回值。
         """
-        for row in table_rows:
-            self.table.add_row(row)
+        with metrics.span('table_fill'):
+            self.prepare_table()
+            for row in table_rows:
+                self.table.add_row(row)
+        metrics.count('table_rows', len(table_rows))
         logger.debug('Table filling finished.')
 
+    @metrics.traced('ui.table_column_hide')
     def table_column_hide(self, query_statuses: Dict[str, bool]) -> None:
         """
         根据查询状态决定是否隐藏表格的某些列。
@@ -173,6 +260,7 @@ class ActionStart(QObject):
             # 根据环境开关，决定列是否隐藏。
             self.table.showColumn(col) if env_switch else self.table.hideColumn(col)
 
+    @metrics.traced('ui.finalize')
     def finalize(self) -> None:
         """
         完成查询后的收尾工作，包括重新启用表格排序和更新等。
@@ -192,7 +280,7 @@ class ActionStart(QObject):
         # 更新过滤器，过滤服务中插入值
         self.filter_bar.filter_options_add()
         # 调用过滤器
-        self.filter_bar.highlight_rows.clear()
+        self.table.highlight_rows.clear()
         self.filter_bar.filter_table()
         # 启用表格更新
         self.table.setUpdatesEnabled(True)
@@ -204,6 +292,7 @@ class ActionStart(QObject):
         self.filter_bar.filter_value_button.setEnabled(True)
         self.filter_bar.filter_reset_button.setEnabled(True)
 
+    @metrics.traced('ui.show_result_message')
     def show_result_message(self, result: str) -> None:
         """
         显示结果消息。
@@ -216,8 +305,8 @@ class ActionStart(QObject):
         :rtype: None
         :return: 无返回值。
         """
-        self.action_start.setEnabled(True)
-        if result == 'done':
+        self.run_succeeded = result == 'done'
+        if self.run_succeeded:
             logger.info('Run Completed')
         else:
             message = {
@@ -225,10 +314,30 @@ class ActionStart(QObject):
                 'prepare table rows failed': ('Warning', self.lang['ui.action_start_6']),
                 'run error': ('Critical', self.lang['ui.action_start_7'])
             }.get(result)
-            if message:
+            if message and not self.silent:
                 message_show(*message)
             self.status_updated.emit(self.lang['label_status_error'])
 
+    def work_finished(self) -> None:
+        """
+        后台线程结束后，通知状态栏停止采样，运行成功时保存并显示耗时汇总，保存本次运行的跟踪文件，结束性能分析，最后重新启用开始按钮。跟踪和性能分析没有启用时跳过对应步骤。
+
+        结果显示后线程还要保存历史和快照，开始按钮在这里才启用，保证同一时间只有一次运行。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        # 状态栏停止采样时会最后采样一次，之后再保存汇总，峰值才完整
+        global_signals.run_finished.emit()
+        if self.run_succeeded:
+            metrics.save(METRICS_PATH)
+            global_signals.run_metrics_updated.emit(metrics.summary())
+        if metrics.tracing:
+            metrics.save_trace(TRACE_PATH)
+        profiler.end()
+        # 线程连同历史和快照的保存都结束后，才允许开始下一次运行
+        self.action_start.setEnabled(True)
+
 
 class StartWork(QThread):
     """
@@ -263,35 +372,47 @@ class StartWork(QThread):
         :rtype: None
         :return: 无返回值。
         """
-        try:
-            # 开始初始化准备工作
-            self.initialize_signal.emit()
-
-            # 读取配置信息，开始数据库查询
-            config_main = self.config_manager.get_config_main()
-            config_connection = self.config_manager.get_config_connection()
-            formatted_results, query_statuses = execute_queries(config_connection, config_main)
-            if not formatted_results:
-                self.message.emit('no query result')
-                return
-
-            # 合成要插入表格的数据
-            table_rows = self.prepare_table_rows(formatted_results)
-            if not table_rows:
-                self.message.emit('prepare table rows failed')
-                return
-
-            # 将数据插入到主表格
-            self.table_insert_signal.emit(table_rows)
-            # 隐藏主表格不必要的列
-            self.table_column_hide_signal.emit(query_statuses)
-
-            # 收尾工作
-            self.finalize_signal.emit()
-            self.message.emit('done')
-        except Exception:
-            logger.exception('Error occurred during execution')
-            self.message.emit('run error')
+        # 性能分析进行中时同样分析后台线程
+        with profiler.thread():
+            try:
+                # 跟踪文件中用类名标识这个线程
+                threading.current_thread().name = type(self).__name__
+                # 开始初始化准备工作
+                self.initialize_signal.emit()
+
+                # 读取配置信息，开始数据库查询
+                config_main = self.config_manager.get_config_main()
+                config_connection = self.config_manager.get_config_connection()
+                formatted_results, query_statuses = execute_queries(config_connection, config_main)
+                if not formatted_results:
+                    self.message.emit('no query result')
+                    return
+
+                # 合成要插入表格的数据
+                with metrics.trace('prepare_table_rows'):
+                    table_rows = self.prepare_table_rows(formatted_results)
+                if not table_rows:
+                    self.message.emit('prepare table rows failed')
+                    return
+
+                # 将数据插入到主表格
+                self.table_insert_signal.emit(table_rows)
+                # 隐藏主表格不必要的列
+                self.table_column_hide_signal.emit(query_statuses)
+
+                # 收尾工作
+                self.finalize_signal.emit()
+                self.message.emit('done')
+
+                # 保存运行历史和结果快照。在子线程中进行，不阻塞界面
+                user_rows = [[user_data for _, user_data in row] for row in table_rows]
+                with metrics.trace('save_history'):
+                    HistoryStore().save_run(user_rows, get_failed_envs(config_connection, query_statuses))
+                with metrics.trace('save_snapshot'):
+                    save_snapshot(user_rows, query_statuses)
+            except Exception:
+                logger.exception('Error occurred during execution')
+                self.message.emit('run error')
 
     def prepare_table_rows(self, formatted_results: Dict[str, Dict[str, str]]) -> List[List[List[str]]]:
         """
@@ -10,7 +10,7 @@
 
 import logging
 
-from PyQt5.QtCore import Qt, pyqtSignal, QObject
+from PyQt5.QtCore import pyqtSignal, QObject
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QAction, QTableWidget
 
@@ -123,5 +123,4 @@ class ActionUnskip(QObject):
         :rtype: None
         :return: 无返回值。
         """
-        self.table.item(row, COL_INFO['skip']['col']).setData(Qt.UserRole, "no")
-        self.table.item(row, COL_INFO['skip']['col']).setData(Qt.DisplayRole, self.lang['ui.action_start_11'])
+        self.table.set_skip_status(row, "no")
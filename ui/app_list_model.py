@@ -0,0 +1,169 @@
+"""
+本模块提供了服务过滤下拉框使用的列表模型。
+
+`AppListModel` 直接读取 `AppIndex` 中的服务名和计数，不为每个服务创建单独的条目对象。模型支持勾选多个服务，第一行固定为“显示所有”。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+from typing import Any, List, Set
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, pyqtSignal
+
+from module.app_index import AppIndex
+from ui.lang_manager import LangManager
+
+logger = logging.getLogger(__name__)
+
+
+class AppListModel(QAbstractListModel):
+    """
+    服务名列表模型，支持多选。
+
+    显示文字为“服务名 (行数)”，编辑角色为服务名本身，供补全器匹配。勾选状态变化时发出 `selection_changed` 信号。
+
+    :param lang_manager: 语言管理器，用于“显示所有”选项和提示文字。
+    :type lang_manager: LangManager
+    :param app_index: 服务名索引。
+    :type app_index: AppIndex
+    """
+    selection_changed = pyqtSignal()
+
+    def __init__(self,
+                 lang_manager: LangManager,
+                 app_index: AppIndex):
+        super().__init__()
+        self.lang_manager = lang_manager
+        self.lang_manager.lang_updated.connect(self.update_lang)
+        self.lang = self.lang_manager.get_lang()
+        self.app_index = app_index
+        self._names: List[str] = []
+        self._checked: Set[str] = set()
+
+    def update_lang(self) -> None:
+        """
+        更新界面语言设置。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        self.lang = self.lang_manager.get_lang()
+        self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1))
+
+    def refresh(self) -> None:
+        """
+        从索引重新读取服务名列表。已勾选但不再存在的服务会被移除。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        self.beginResetModel()
+        self._names = self.app_index.names()
+        self._checked &= set(self._names)
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._names) + 1
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row = index.row()
+        # 第一行为显示所有
+        if row == 0:
+            if role in (Qt.DisplayRole, Qt.EditRole):
+                return self.lang['ui.filter_bar_3']
+            if role == Qt.CheckStateRole:
+                return Qt.Unchecked if self._checked else Qt.Checked
+            if role == Qt.UserRole:
+                return 'all'
+            return None
+
+        name = self._names[row - 1]
+        if role == Qt.DisplayRole:
+            return f"{name} ({self.app_index.row_count(name)})"
+        if role in (Qt.EditRole, Qt.UserRole):
+            return name
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if name in self._checked else Qt.Unchecked
+        if role == Qt.ToolTipRole:
+            counts = self.app_index.status_counts(name)
+            return (f"{self.app_index.row_count(name)} {self.lang['ui.filter_bar_11']}\n"
+                    f"{self.lang['ui.filter_bar_4']}: {counts['fully']}\n"
+                    f"{self.lang['ui.filter_bar_5']}: {counts['partially']}\n"
+                    f"{self.lang['ui.action_start_8']}: {counts['inconsistent']}\n"
+                    f"{self.lang['ui.filter_bar_6']}: {counts['skip']}")
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    def toggle(self, row: int) -> None:
+        """
+        切换指定行的勾选状态。勾选第一行等于清空选择。
+
+        :param row: 行号。
+        :type row: int
+        :rtype: None
+        :return: 无返回值。
+        """
+        if row < 0 or row >= self.rowCount():
+            return
+        if row == 0:
+            self.clear_selection()
+            return
+        name = self._names[row - 1]
+        self._checked.symmetric_difference_update({name})
+        self._notify()
+
+    def select_only(self, name: str) -> bool:
+        """
+        只勾选一个服务。
+
+        :param name: 服务名。
+        :type name: str
+        :rtype: bool
+        :return: 服务存在时返回 True。
+        """
+        if name not in self.app_index:
+            return False
+        self._checked = {name}
+        self._notify()
+        return True
+
+    def clear_selection(self) -> None:
+        """
+        清空勾选，即显示所有服务。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        if self._checked:
+            self._checked.clear()
+            self._notify()
+        else:
+            self.selection_changed.emit()
+
+    def checked_names(self) -> Set[str]:
+        """
+        获取已勾选的服务名集合。为空时表示显示所有。
+
+        :rtype: Set[str]
+        :return: 服务名集合。
+        """
+        return set(self._checked)
+
+    def _notify(self) -> None:
+        """
+        通知视图勾选状态变化，并发出选择变化信号。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1), [Qt.CheckStateRole])
+        self.selection_changed.emit()
@@ -0,0 +1,147 @@
+"""
+本模块提供了查重结果对话框使用的表格模型。
+
+`ComparisonModel` 直接读取 `ResultStore` 和分组得到的行号标识数组，不为单元格创建条目对象。视图只在绘制可见单元格时向模型取值，背景色和字体颜色也通过模型角色返回。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+from array import array
+from bisect import bisect_right
+from typing import Any, List, Optional
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor, QBrush
+
+from config.settings import COLOR_SKIP, COLOR_DEFAULT
+from module.result_store import ResultStore
+
+logger = logging.getLogger(__name__)
+
+
+class ComparisonModel(QAbstractTableModel):
+    """
+    单个环境的查重结果模型。
+
+    所有分组的行号标识被拼接为一个数组，另用一个数组记录每组的起始位置。通过二分查找定位行所属的组，用于组号表头和交替背景色。
+
+    :param store: 结果存储。
+    :type store: ResultStore
+    :param env_column: 环境值列名，例如 'pro_value'。
+    :type env_column: str
+    :param groups: 单个环境的分组结果，每组是行号标识数组。
+    :type groups: List[array]
+    :param headers: 列标题。
+    :type headers: List[str]
+    """
+
+    def __init__(self,
+                 store: ResultStore,
+                 env_column: str,
+                 groups: List[array],
+                 headers: List[str]):
+        super().__init__()
+        self.store = store
+        self.headers = headers
+        # 要展示的列：服务、分组、配置键和当前环境的值
+        self.columns = ['name', 'group', 'key', env_column]
+        self.row_ids = array('I')
+        self.group_starts = array('I')
+        for group in groups:
+            self.group_starts.append(len(self.row_ids))
+            self.row_ids.extend(group)
+        # 两种背景色交替使用：白色和灰色
+        self.color_palette = [QBrush(QColor(COLOR_DEFAULT)), QBrush(QColor(COLOR_SKIP))]
+        self.public_brush = QBrush(QColor(Qt.red))
+        # 公共配置名称的字符串编号，未设置时为 None
+        self.public_code: Optional[int] = None
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.row_ids)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row_id = self.row_ids[index.row()]
+        if role == Qt.DisplayRole:
+            return self.store.value(row_id, self.columns[index.column()])
+        if role == Qt.BackgroundRole:
+            # 组号从 1 开始，与原先的配色保持一致
+            return self.color_palette[(self._group_of(index.row()) + 1) % len(self.color_palette)]
+        if role == Qt.ForegroundRole:
+            if self.public_code is not None and self.store.code(row_id, 'name') == self.public_code:
+                return self.public_brush
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section] if section < len(self.headers) else None
+        # 纵向表头为“组号.组内序号”
+        group = self._group_of(section)
+        return f"{group + 1}.{section - self.group_starts[group] + 1}"
+
+    def set_headers(self, headers: List[str]) -> None:
+        """
+        更新列标题。
+
+        :param headers: 新的列标题。
+        :type headers: List[str]
+        :rtype: None
+        :return: 无返回值。
+        """
+        self.headers = headers
+        self.headerDataChanged.emit(Qt.Horizontal, 0, self.columnCount() - 1)
+
+    def set_public(self, public_value: str) -> None:
+        """
+        设置公共配置名称，名称匹配的行字体显示为红色。传入空字符串则取消标记。
+
+        只记录名称的字符串编号并发出一次数据变化信号，不逐个单元格修改。
+
+        :param public_value: 公共配置名称。
+        :type public_value: str
+        :rtype: None
+        :return: 无返回值。
+        """
+        if public_value:
+            # 名称不在字符串表中时，用一个不可能出现的编号，使所有行都不匹配
+            code = self.store.find_code(public_value)
+            self.public_code = -1 if code is None else code
+        else:
+            self.public_code = None
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(self.rowCount() - 1, self.columnCount() - 1),
+                                  [Qt.ForegroundRole])
+
+    def row_text(self, row: int, column: int) -> str:
+        """
+        获取单元格文本，供搜索使用。
+
+        :param row: 行号。
+        :type row: int
+        :param column: 列号。
+        :type column: int
+        :rtype: str
+        :return: 单元格文本。
+        """
+        return self.store.value(self.row_ids[row], self.columns[column])
+
+    def _group_of(self, row: int) -> int:
+        """
+        查找行所属的组序号，从 0 开始。
+
+        :param row: 行号。
+        :type row: int
+        :rtype: int
+        :return: 组序号。
+        """
+        return bisect_right(self.group_starts, row) - 1
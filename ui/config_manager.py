@@ -3,18 +3,20 @@
 
 包含一个核心类 `ConfigManager`，负责读取、更新和管理配置。该类提供了获取主配置、连接配置和跳过列表的方法，并允许更新这些配置信息。
 
+配置在保存时冻结为只读结构，读取时直接返回引用，不再复制。每次更新配置都会换成新的只读对象并增加版本号，使用者可以按版本号缓存由配置计算出的数据。需要修改配置时，先用 `thaw_data` 得到可修改的副本。
+
 :author: assassing
 :contact: https://github.com/hxz393
 :copyright: Copyright 2023, hxz393. 保留所有权利。
 """
 
-import copy
 import logging
-from typing import Dict, Optional, Union, List
+from typing import Dict, Optional, Union, List, Mapping, Tuple
 
 from PyQt5.QtCore import QObject, pyqtSignal
 
 from config.settings import CONFIG_SKIP_PATH, CONFIG_MAIN_PATH, CONFIG_APOLLO_PATH, CONFIG_NACOS_PATH
+from lib.freeze_data import freeze_data
 from lib.read_file_to_list import read_file_to_list
 from lib.write_dict_to_json import write_dict_to_json
 from lib.write_list_to_file import write_list_to_file
@@ -39,47 +41,63 @@ class ConfigManager(QObject):
 
     def __init__(self):
         super().__init__()
-        self._config_main, self._config_apollo, self._config_nacos = read_config_all()
-        self._skip_list = read_file_to_list(CONFIG_SKIP_PATH) or []
+        config_main, config_apollo, config_nacos = read_config_all()
+        self._config_main = freeze_data(config_main)
+        self._config_apollo = freeze_data(config_apollo)
+        self._config_nacos = freeze_data(config_nacos)
+        self._skip_list = freeze_data(read_file_to_list(CONFIG_SKIP_PATH) or [])
+        # 各项配置的版本号，每次更新加一
+        self._versions = {'config_main': 0, 'config_connection': 0, 'skip_list': 0}
+
+    def get_version(self, name: str) -> int:
+        """
+        获取配置的版本号。配置每次更新后版本号加一，使用者可以据此判断缓存是否过期。
+
+        :param name: 配置名，可选 'config_main'、'config_connection' 或 'skip_list'。
+        :type name: str
+        :return: 版本号。
+        :rtype: int
+        """
+        return self._versions[name]
 
-    def get_config_main(self) -> Optional[Dict[str, str]]:
+    def get_config_main(self) -> Optional[Mapping[str, str]]:
         """
-        获取主配置的副本。
+        获取只读的主配置。
 
-        :return: 包含主配置的字典，如果出现错误则返回 None。
-        :rtype: Optional[Dict[str, str]]
+        :return: 包含主配置的只读映射，如果出现错误则返回 None。
+        :rtype: Optional[Mapping[str, str]]
         """
         try:
-            return copy.deepcopy(self._config_main)
+            return self._config_main
         except Exception:
             logger.exception("Failed to get config_main.")
             return None
 
-    def get_config_connection(self) -> Optional[Dict[str, Dict[str, Union[Dict[str, str], bool]]]]:
+    def get_config_connection(self) -> Optional[Mapping[str, Mapping[str, Union[Mapping[str, str], bool]]]]:
         """
-        根据当前配置中心获取连接配置的副本。
+        根据当前配置中心获取只读的连接配置。
 
-        :return: 包含连接配置的字典，如果出现错误则返回 None。
-        :rtype: Optional[Dict[str, Dict[str, Union[Dict[str, str], bool]]]]
+        :return: 包含连接配置的只读映射，如果出现错误则返回 None。
+        :rtype: Optional[Mapping[str, Mapping[str, Union[Mapping[str, str], bool]]]]
         """
         try:
             if self._config_main['config_center'] == 'Apollo':
-                return copy.deepcopy(self._config_apollo)
+                return self._config_apollo
             else:
-                return copy.deepcopy(self._config_nacos)
+                return self._config_nacos
         except Exception:
             logger.exception("Failed to get config_connection.")
             return None
 
-    def get_skip_list(self) -> Optional[List[str]]:
+    def get_skip_list(self) -> Optional[Tuple[str, ...]]:
         """
-        获取忽略列表的副本。
+        获取只读的忽略列表。
 
-        :return: 包含跳过项的列表，如果出现错误则返回 None。
-        :rtype: Optional[List[str]]
+        :return: 包含跳过项的元组，如果出现错误则返回 None。
+        :rtype: Optional[Tuple[str, ...]]
         """
         try:
-            return copy.deepcopy(self._skip_list)
+            return self._skip_list
         except Exception:
             logger.exception("Failed to get skip_list.")
             return None
@@ -92,7 +110,10 @@ class ConfigManager(QObject):
         :type new_config: Dict[str, str]
         """
         try:
-            self._config_main = new_config
+            self._config_main = freeze_data(new_config)
+            self._versions['config_main'] += 1
+            # 配置中心可能改变，连接配置也随之改变
+            self._versions['config_connection'] += 1
             self.config_main_updated.emit()
             write_dict_to_json(CONFIG_MAIN_PATH, new_config)
             logger.info("Config updated: config_main")
@@ -108,11 +129,12 @@ class ConfigManager(QObject):
         """
         try:
             if self._config_main['config_center'] == 'Apollo':
-                self._config_apollo = new_config
+                self._config_apollo = freeze_data(new_config)
                 write_dict_to_json(CONFIG_APOLLO_PATH, new_config)
             else:
-                self._config_nacos = new_config
+                self._config_nacos = freeze_data(new_config)
                 write_dict_to_json(CONFIG_NACOS_PATH, new_config)
+            self._versions['config_connection'] += 1
             self.config_connection_updated.emit()
             logger.info("Config updated: config_connection")
         except Exception:
@@ -126,7 +148,8 @@ class ConfigManager(QObject):
         :type new_config: List[str]
         """
         try:
-            self._skip_list = new_config
+            self._skip_list = freeze_data(new_config)
+            self._versions['skip_list'] += 1
             # 写入到配置文件
             self.skip_list_updated.emit()
             write_list_to_file(CONFIG_SKIP_PATH, new_config)
@@ -3,20 +3,25 @@
 
 DialogComparison 类提供了一个对话框界面，用于展示不同环境下配置项的比较结果。类中包含多个方法，用于初始化界面、更新语言设置、创建标签页和表格，并处理表格数据。
 
+每个标签页的表格在第一次切换到该页时才创建，表格数据由 `ComparisonModel` 按需提供。
+
 :author: assassing
 :contact: https://github.com/hxz393
 :copyright: Copyright 2023, hxz393. 保留所有权利。
 """
 
 import logging
+from array import array
 from typing import Dict, List, Optional
 
 from PyQt5.QtCore import Qt, pyqtSignal, QPoint
-from PyQt5.QtGui import QIcon, QColor
-from PyQt5.QtWidgets import QTabWidget, QTableWidget, QTableWidgetItem, QVBoxLayout, QWidget, QDialog, QHBoxLayout, QLabel, QFrame, QLineEdit, QSizePolicy, QPushButton, QMenu
+from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import QTabWidget, QTableView, QVBoxLayout, QWidget, QDialog, QHBoxLayout, QLabel, QFrame, QLineEdit, QSizePolicy, QPushButton, QMenu, QAbstractItemView, QHeaderView
 
-from config.settings import COLOR_SKIP
 from lib.get_resource_path import get_resource_path
+from module.compare_groups import ENV_COLUMNS
+from module.result_store import ResultStore
+from ui.comparison_model import ComparisonModel
 from ui.lang_manager import LangManager
 from ui.config_manager import ConfigManager
 from ui.action_save import ActionSave
@@ -33,21 +38,31 @@ class DialogComparison(QDialog):
     :type lang_manager: LangManager
     :param config_manager: 配置管理器实例，用于管理配置。
     :type config_manager: ConfigManager
-    :param data: 包含环境配置比较结果的字典。
-    :type data: Dict[str, Dict[str, List[Dict[str, str]]]]
+    :param store: 对比所用的结果存储。
+    :type store: ResultStore
+    :param groups: 各环境的分组结果，键为环境值列名，值为行号标识数组的列表。
+    :type groups: Dict[str, List[array]]
+    :param title_key: 窗口标题的语言键，默认为配置查重结果。
+    :type title_key: str
     """
     status_updated = pyqtSignal(str)
 
     def __init__(self,
                  lang_manager: LangManager,
                  config_manager: ConfigManager,
-                 data: Dict[str, Dict[str, List[Dict[str, str]]]]):
+                 store: ResultStore,
+                 groups: Dict[str, List[array]],
+                 title_key: str = 'ui.dialog_comparison_1'):
         super().__init__(flags=Qt.Dialog | Qt.WindowCloseButtonHint)
         self.lang_manager = lang_manager
         self.lang_manager.lang_updated.connect(self.update_lang)
         self.config_manager = config_manager
         self.lang = self.lang_manager.get_lang()
-        self.data = data
+        self.store = store
+        self.groups = groups
+        self.title_key = title_key
+        # 已创建的表格，键为标签页序号
+        self.tables: Dict[int, QTableView] = {}
 
         self.initUI()
 
@@ -76,11 +91,15 @@ class DialogComparison(QDialog):
             self.layout.addWidget(separator)
             # 运行语言配置，创建表格要用到
             self.update_lang()
-            # 创建标签页
-            tab_widget = QTabWidget()
-            self.layout.addWidget(tab_widget)
+            # 创建标签页，先放入空白页，切换到时再创建表格
+            self.tab_widget = QTabWidget()
+            self.layout.addWidget(self.tab_widget)
             for env in self.env_keys:
-                tab_widget.addTab(self._create_tab(env), env)
+                tab = QWidget()
+                QVBoxLayout(tab)
+                self.tab_widget.addTab(tab, env)
+            self.tab_widget.currentChanged.connect(self._ensure_tab)
+            self._ensure_tab(self.tab_widget.currentIndex())
         except Exception:
             logger.exception("Failed to initialize DialogComparison UI components")
             self.status_updated.emit(self.lang['label_status_error'])
@@ -135,20 +154,37 @@ class DialogComparison(QDialog):
 
         return filter_bar
 
-    def _create_tab(self, env: str) -> QWidget:
+    def _ensure_tab(self, index: int) -> None:
         """
-        创建一个标签页。
+        确保标签页中的表格已创建。每个标签页只创建一次。
 
-        :param env: 环境名。
-        :type env: str
+        :param index: 标签页序号。
+        :type index: int
 
-        :rtype: QWidget
-        :return: 返回标签页。
+        :rtype: None
+        :return: 无返回值。
+        """
+        try:
+            if index < 0 or index in self.tables:
+                return
+            env_column = ENV_COLUMNS[index]
+            table = self._create_table(env_column, self.groups.get(env_column, []))
+            self.tab_widget.widget(index).layout().addWidget(table)
+            self.tables[index] = table
+        except Exception:
+            logger.exception("Failed to create comparison tab")
+            self.status_updated.emit(self.lang['label_status_error'])
+
+    def _setup_table_actions(self, table: QTableView) -> None:
+        """
+        为表格添加复制、保存动作和右键菜单。
+
+        :param table: 表格视图。
+        :type table: QTableView
+
+        :rtype: None
+        :return: 无返回值。
         """
-        tab = QWidget()
-        tab_layout = QVBoxLayout(tab)
-        table = self._create_table(self.data.get(env, {}))
-        tab_layout.addWidget(table)
 
         # 为每个 table 实例化 ActionCopy 和 ActionSave
         table.actionCopy = ActionCopy(self.lang_manager, table)
@@ -159,8 +195,6 @@ class DialogComparison(QDialog):
         table.setContextMenuPolicy(Qt.CustomContextMenu)
         table.customContextMenuRequested.connect(self._cell_context_menu)
 
-        return tab
-
     def _cell_context_menu(self, pos: QPoint) -> None:
         """
         实现表格单元格的右键菜单功能。
@@ -172,8 +206,8 @@ class DialogComparison(QDialog):
         :return: 无返回值。
         """
         sender = self.sender()
-        # 确定sender是QTableWidget，且拥有actionCopy和actionSave属性
-        if isinstance(sender, QTableWidget):
+        # 确定sender是QTableView，且拥有actionCopy和actionSave属性
+        if isinstance(sender, QTableView):
             if hasattr(sender, 'actionCopy') and hasattr(sender, 'actionSave'):
                 copy = getattr(sender, 'actionCopy')
                 save = getattr(sender, 'actionSave')
@@ -190,7 +224,7 @@ class DialogComparison(QDialog):
         :return: 无返回值。
         """
         self.lang = self.lang_manager.get_lang()
-        self.setWindowTitle(self.lang['ui.dialog_comparison_1'])
+        self.setWindowTitle(self.lang[self.title_key])
         # 更新标签页
         self.env_keys = [
             self.lang['ui.dialog_settings_connection_2'],
@@ -225,7 +259,7 @@ class DialogComparison(QDialog):
         :rtype: None
         :return: 无返回值。
         """
-        tab_widget = self.findChild(QTabWidget)
+        tab_widget = getattr(self, 'tab_widget', None)
         # 确定标签页存在，且标签数量与新标题数量相等
         if tab_widget is not None and len(new_titles) == tab_widget.count():
             for index, title in enumerate(new_titles):
@@ -241,90 +275,40 @@ class DialogComparison(QDialog):
         :rtype: None
         :return: 无返回值。
         """
-        tab_widget = self.findChild(QTabWidget)
-        if tab_widget is None:
-            return
-        # 循环设置每个标签页中的表格表头
-        for i in range(tab_widget.count()):
-            table = tab_widget.widget(i).findChild(QTableWidget)
-            for j, header in enumerate(new_headers):
-                table.setHorizontalHeaderItem(j, QTableWidgetItem(header))
+        # 只有已创建的表格需要更新，未创建的表格会在创建时使用新表头
+        for table in getattr(self, 'tables', {}).values():
+            table.model().set_headers(new_headers)
 
-    def _create_table(self, items: Dict[str, List[Dict[str, str]]]) -> QTableWidget:
+    def _create_table(self,
+                      env_column: str,
+                      groups: List[array]) -> QTableView:
         """
-        建立表格并插入数据。
+        建立表格视图并绑定数据模型。
 
-        :param items: 包含单个环境配置比较结果。
-        :type items: List[Dict[str, str]]]
+        :param env_column: 环境值列名。
+        :type env_column: str
+        :param groups: 单个环境的分组结果。
+        :type groups: List[array]
 
-        :rtype: QTableWidget
+        :rtype: QTableView
         :return: 返回建好的表格组件。
         """
-        table = QTableWidget()
+        table = QTableView()
+        table.setModel(ComparisonModel(self.store, env_column, groups, self.column_headers))
         # 配置表格基本属性
-        table.setColumnCount(len(self.column_headers))
-        table.setHorizontalHeaderLabels(self.column_headers)
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
-        table.setSelectionBehavior(QTableWidget.SelectItems)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectItems)
         table.setTextElideMode(Qt.ElideNone)
         table.horizontalHeader().setMinimumSectionSize(220)
-
-        # 向表格插入数据。先计算总行数，禁用更新，优化性能。
-        table.setUpdatesEnabled(False)
-        table.setRowCount(sum(len(group) for group in items.values()))
-        self._insert_data_to_table(table, items)
-        table.setUpdatesEnabled(True)
+        # 固定行高，避免按内容计算每一行的高度
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self._setup_table_actions(table)
+        # 已输入公共配置时，新建的表格也要标记
+        if self._public_enabled():
+            table.model().set_public(self.public_box.text().strip())
 
         return table
 
-    def _insert_data_to_table(self,
-                              table: QTableWidget,
-                              items: Dict[str, List[Dict[str, str]]]) -> None:
-        """
-        向表格插入特定格式的数据。
-
-        :param table: 展示结果表格。
-        :type table: QTableWidget
-        :param items: 包含单个环境配置比较结果。
-        :type items: Dict[str, List[Dict[str, str]]]
-
-        :rtype: None
-        :return: 无返回值。
-        """
-        try:
-            # 如果没数据，直接返回
-            if not items:
-                return
-
-            # 两种颜色：白色和灰色
-            color_palette = [Qt.white, QColor(COLOR_SKIP)]
-            # 开始行数
-            row_count = 0
-
-            # 索引键不需要，直接获取对结果分好组的列表
-            for group_number, item_group in enumerate(items.values(), start=1):
-                # 要单元格设置的背景颜色
-                group_color = color_palette[group_number % len(color_palette)]
-                # 对包含多组配置字典的列表进行处理
-                for item_index, item in enumerate(item_group, start=1):
-                    # 为每行设置组号
-                    table.setVerticalHeaderItem(row_count, QTableWidgetItem(f"{group_number}.{item_index}"))
-                    # 对表头处理，col_index为列号，key为列标题
-                    for col_index, key in enumerate(self.column_headers):
-                        # 避免 KeyError
-                        value = item.get(key, "")
-                        # 设置单元格数据
-                        table_item = QTableWidgetItem(str(value))
-                        # 为单元格设置背景颜色
-                        table_item.setBackground(group_color)
-                        # 通过行号、列号和数据信息插入到表格
-                        table.setItem(row_count, col_index, table_item)
-                    # 插入完一行后，行号加一
-                    row_count += 1
-        except Exception:
-            logger.exception("Failed to insert data into table")
-            self.status_updated.emit(self.lang['label_status_error'])
-
     def forward_status(self, message: str) -> None:
         """
         用于转发状态信号。
@@ -337,93 +321,47 @@ class DialogComparison(QDialog):
         """
         self.status_updated.emit(message)
 
-    def _get_current_table(self) -> Optional[QTableWidget]:
+    def _get_current_table(self) -> Optional[QTableView]:
         """
         获取当前选中标签页中的表格。
 
-        :rtype: Optional[QTableWidget]
-        :return: 返回当前选中标签页中的 QTableWidget 实例。没获取到则返回 None。
+        :rtype: Optional[QTableView]
+        :return: 返回当前选中标签页中的 QTableView 实例。没获取到则返回 None。
         """
-        tab_widget = self.findChild(QTabWidget)
+        tab_widget = getattr(self, 'tab_widget', None)
         if tab_widget is None:
             return None
+        return self.tables.get(tab_widget.currentIndex())
 
-        current_tab = tab_widget.currentWidget()
-        if current_tab is None:
-            return None
+    def _public_enabled(self) -> bool:
+        """
+        判断是否开启了颜色设置。
 
-        table = current_tab.findChild(QTableWidget)
-        return table
+        :rtype: bool
+        :return: 开启时返回 True。
+        """
+        return self.config_manager.get_config_main().get('color_set', 'ON') != 'OFF'
 
     def set_public(self) -> None:
         """
         根据用户输入公共配置的名称，设置表格中对应行的字体颜色。
 
+        字体颜色由模型返回，这里只需通知模型一次。
+
         :rtype: None
         :return: 无返回值。
         """
         # 如果关闭颜色设置，直接返回。
-        color_switch = self.config_manager.get_config_main().get('color_set', 'ON')
-        if color_switch == 'OFF':
+        if not self._public_enabled():
             return
 
         # 获取输入值和表格。表格为空则返回。
-        public_value = self.public_box.text().strip()
         table = self._get_current_table()
         if table is None:
             return
 
-        # 无论输入值是否为空，都先重置表格字体颜色
-        self._reset_table_font_color(table)
-
-        # 输入值为空，直接返回。
-        if not public_value:
-            return
-
-        # 遍历表格设置匹配行的字体颜色
-        for row in range(table.rowCount()):
-            cell_item = table.item(row, 0)
-            if cell_item and public_value == cell_item.text():
-                self._set_row_font_color(table, row, Qt.red)
-
-    @staticmethod
-    def _set_row_font_color(table: QTableWidget,
-                            row: int,
-                            color: str) -> None:
-        """
-        设置特定行的字体颜色。
-
-        :param table: 要操作的表格对象。
-        :type table: QTableWidget
-        :param row: 行号。
-        :type row: int
-        :param color: 字体颜色。
-        :type color: str
-
-        :rtype: None
-        :return: 无返回值。
-        """
-        for column in range(table.columnCount()):
-            cell_item = table.item(row, column)
-            if cell_item:
-                cell_item.setForeground(QColor(color))
-
-    @staticmethod
-    def _reset_table_font_color(table: QTableWidget) -> None:
-        """
-        重置表格所有单元格的字体颜色为黑色。
-
-        :param table: 要操作的表格对象。
-        :type table: QTableWidget
-
-        :rtype: None
-        :return: 无返回值。
-        """
-        for row in range(table.rowCount()):
-            for column in range(table.columnCount()):
-                cell_item = table.item(row, column)
-                if cell_item:
-                    cell_item.setForeground(Qt.black)
+        # 输入值为空时，模型会取消标记
+        table.model().set_public(self.public_box.text().strip())
 
     def search_value(self) -> None:
         """
@@ -446,18 +384,22 @@ class DialogComparison(QDialog):
             return
 
         # 逐行匹配搜索值
-        for row in range(table.rowCount()):
-            self._search_process(table, row, search_text)
+        model = table.model()
+        for row in range(model.rowCount()):
+            self._search_process(table, model, row, search_text)
 
     @staticmethod
-    def _search_process(table: QTableWidget,
+    def _search_process(table: QTableView,
+                        model: ComparisonModel,
                         row: int,
                         search_text: str) -> None:
         """
         作用于单行，根据搜索文本设置可见性。
 
         :param table: 表格对象。
-        :type table: QTableWidget
+        :type table: QTableView
+        :param model: 表格模型。
+        :type model: ComparisonModel
         :param row: 当前行号。
         :type row: int
         :param search_text: 搜索文本。
@@ -466,30 +408,21 @@ class DialogComparison(QDialog):
         :rtype: None
         :return: 无返回值。
         """
-        # 变量和实际显示匹配。先设为False为不显示
-        row_contains_search_text = False
-        # 只搜索键和值列
-        for column in [2, 3]:
-            # 获取单元格文本，并小写化，匹配搜索文本，让搜索不区分大小写
-            cell_text = table.item(row, column).text().lower()
-            # 找到匹配项，跳出内层循环
-            if search_text in cell_text:
-                row_contains_search_text = True
-                break
-
+        # 只搜索键和值列，搜索不区分大小写
+        row_contains_search_text = any(search_text in model.row_text(row, column).lower() for column in [2, 3])
         table.setRowHidden(row, not row_contains_search_text)
 
     @staticmethod
-    def _reset_row_hidden_status(table: QTableWidget) -> None:
+    def _reset_row_hidden_status(table: QTableView) -> None:
         """
         重置表格行的隐藏状态。
 
         :param table: 表格对象。
-        :type table: QTableWidget
+        :type table: QTableView
 
         :rtype: None
         :return: 无返回值。
         """
         if table is not None:
-            for row in range(table.rowCount()):
+            for row in range(table.model().rowCount()):
                 table.setRowHidden(row, False)
@@ -4,24 +4,32 @@
 此模块定义了 `DialogLogs` 类，用于创建和管理一个日志对话框界面。该界面允许用户查看应用程序的日志，
 过滤显示特定级别的日志，以及清除日志内容。
 
+实时跟随日志不再定时读取文件：本进程的日志由 `log_sink` 送来，其他进程写入的日志由文件监视发现，日志文件轮换后会先读完旧文件。
+
+打开对话框时只从文件末尾读取最后 `LOG_LINES` 行，日志条目保存在 `LogIndex` 索引中，切换过滤级别时直接从索引取出，不再读取文件。显示使用限制了最大行数的 `QPlainTextEdit`，由 `LogHighlighter` 按级别着色。
+
 :author: assassing
 :contact: https://github.com/hxz393
 :copyright: Copyright 2023, hxz393. 保留所有权利。
 """
 
 import logging
-import re
+import os
 import webbrowser
-from typing import Optional
+from collections import Counter
 
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
-from PyQt5.QtGui import QColor, QTextCharFormat, QTextCursor, QIcon
-from PyQt5.QtWidgets import QDialog, QTextEdit, QVBoxLayout, QPushButton, QHBoxLayout, QComboBox, QLabel
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QFileSystemWatcher
+from PyQt5.QtGui import QCloseEvent, QColor, QTextCharFormat, QTextCursor, QIcon, QSyntaxHighlighter, QTextDocument
+from PyQt5.QtWidgets import QDialog, QPlainTextEdit, QVBoxLayout, QPushButton, QHBoxLayout, QComboBox, QLabel
 
-from config.settings import GITHUB_URL, LOG_PATH, LOG_COLORS, LOG_DEFAULT_LEVEL, LOG_LINES, LOG_UPDATE_RATE
+from config.settings import GITHUB_URL, LOG_PATH, LOG_COLORS, LOG_DEFAULT_LEVEL, LOG_LINES
+from lib.follow_file import FileFollower
 from lib.get_resource_path import get_resource_path
+from lib.read_file_tail import read_file_tail
 from lib.write_list_to_file import write_list_to_file
+from module.log_index import LogIndex, LOG_LEVELS, LOG_PATTERN
 from ui.lang_manager import LangManager
+from ui.log_sink import log_sink
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +43,6 @@ class DialogLogs(QDialog):
     :param lang_manager: 语言管理器，用于界面语言的国际化。
     :type lang_manager: LangManager
     """
-    LOG_LEVELS = [i for i in LOG_COLORS.keys()]
-    LOG_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - ')
     status_updated = pyqtSignal(str)
 
     def __init__(self, lang_manager: LangManager):
@@ -55,16 +61,20 @@ class DialogLogs(QDialog):
         self.setWindowIcon(QIcon(get_resource_path('media/icons8-log-26.png')))
         self.resize(600, 470)
 
-        # 创建日志文本编辑器，设置为只读，不换行
-        self.text_edit = QTextEdit(self)
+        # 创建日志文本编辑器，设置为只读，不换行，超出最大行数时自动删除最旧的行
+        self.text_edit = QPlainTextEdit(self)
         self.text_edit.setReadOnly(True)
-        self.text_edit.setLineWrapMode(QTextEdit.NoWrap)
+        self.text_edit.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.text_edit.setMaximumBlockCount(LOG_LINES)
+        self.highlighter = LogHighlighter(self.text_edit.document())
+        # 日志条目索引
+        self.log_index = LogIndex()
 
         # 创建标签和下拉框
         self.label = QLabel(self)
         self.combo_box = QComboBox(self)
         self.combo_box.addItem(LOG_DEFAULT_LEVEL, None)
-        self.combo_box.addItems(DialogLogs.LOG_LEVELS)
+        self.combo_box.addItems(LOG_LEVELS)
         self.combo_box.currentIndexChanged.connect(self.filter_logs)
 
         # 创建按钮
@@ -98,11 +108,16 @@ class DialogLogs(QDialog):
         layout.addWidget(self.text_edit)
         layout.addLayout(button_layout)
 
-        # 初始化定时器，但不立即启动
-        self.update_timer = QTimer(self)
-        self.update_timer.timeout.connect(self.update_logs)
-        # 添加一个标记来追踪实时更新状态
-        self.log_file_position = 0
+        # 跟随日志文件，识别文件轮换
+        self.log_follower = FileFollower(LOG_PATH)
+        # 监视日志文件和所在目录，发现其他进程写入的日志
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.fileChanged.connect(self._on_log_file_changed)
+        self.file_watcher.directoryChanged.connect(self._on_log_file_changed)
+        # 已经从接收器取出的记录序号，以及已经显示但还没在文件中读到的记录
+        self.sink_sequence = 0
+        self.pending_records = Counter()
+        self._update_scheduled = False
 
         self.update_lang()
         self.load_logs()
@@ -126,16 +141,17 @@ class DialogLogs(QDialog):
         """
         加载并处理日志文件。
 
-        读取日志文件的内容，并根据当前的筛选级别显示日志信息。
+        从文件末尾读取最后 `LOG_LINES` 行建立索引，并根据当前的筛选级别显示日志信息。
 
         :rtype: None
         :return: 无返回值。
         """
         try:
-            self.text_edit.clear()
-            logs_content = self._read_logs_file()
-            self._process_logs(logs_content)
-            self.text_edit.moveCursor(QTextCursor.End)
+            logs_content, position = read_file_tail(LOG_PATH, LOG_LINES)
+            self.log_follower.seek_end(position)
+            self.log_index.clear()
+            self.log_index.append(logs_content)
+            self._show_logs()
         except Exception:
             logger.exception("Error opening log file")
             self.status_updated.emit(self.lang['label_status_error'])
@@ -151,7 +167,9 @@ class DialogLogs(QDialog):
         """
         try:
             self.text_edit.clear()
+            self.log_index.clear()
             write_list_to_file(LOG_PATH, [])
+            self.log_follower.seek_end()
             logger.info("All logs cleared")
         except Exception:
             logger.exception("Error clearing logs")
@@ -161,173 +179,156 @@ class DialogLogs(QDialog):
         """
         更新日志内容。
 
-        读取新的日志内容并追加到文本编辑器。
+        本进程的新记录从日志接收器取出，文件中的新内容只追加其他进程写入的日志。先读文件再取接收器的记录，文件中本进程的记录此时一定已经取出，可以准确跳过。
 
         :rtype: None
         :return: 无返回值。
         """
+        self._update_scheduled = False
         try:
-            with open(LOG_PATH, 'r', encoding='utf8') as file:
-                # 移动到上次读取的位置
-                file.seek(self.log_file_position)
-                # 读取新内容
-                new_content = file.read()
-                # 更新读取位置
-                self.log_file_position = file.tell()
-            # 如果有新内容
-            if new_content:
-                self._process_logs(new_content)
-                self.text_edit.moveCursor(QTextCursor.End)
+            new_content = self.log_follower.read_new()
+            # 本进程的日志直接从接收器取出
+            records, self.sink_sequence = log_sink.records_since(self.sink_sequence)
+            if records:
+                self.pending_records.update(f'{record}\n' for record in records)
+                self._append_logs(''.join(f'{record}\n' for record in records))
+            if not new_content:
+                return
+            # 跳过接收器已经送来的记录
+            external = []
+            for entry in LogIndex.split_entries(new_content):
+                if self.pending_records[entry] > 0:
+                    self.pending_records[entry] -= 1
+                else:
+                    external.append(entry)
+            # 丢弃一直没有出现在文件中的记录，例如文件处理器级别更高时
+            if len(self.pending_records) > LOG_LINES:
+                self.pending_records.clear()
+            if external:
+                self._append_logs(''.join(external))
         except Exception:
             logger.exception("Error updating logs")
             self.status_updated.emit(self.lang['label_status_error'])
 
     def toggle_real_time_logs(self) -> None:
         """
-        切换实时日志更新功能，启用或禁用定时器。
+        切换实时日志跟随。
+
+        跟随时本进程的日志由接收器通知，其他进程写入的日志由文件监视通知，空闲时没有任何开销。
 
         :rtype: None
         :return: 无返回值。
         """
         if self.refresh_button.isChecked():
-            self.update_timer.start(LOG_UPDATE_RATE)
             logger.info("tail -f run.log")
+            log_sink.attach()
+            log_sink.records_added.connect(self._schedule_update)
+            # 之前的日志从文件读取，之后的日志从接收器读取
+            self.sink_sequence = log_sink.sequence
+            self.pending_records.clear()
+            self._watch_log_file()
+            self.update_logs()
         else:
-            self.update_timer.stop()
+            log_sink.records_added.disconnect(self._schedule_update)
+            log_sink.detach()
+            if self.file_watcher.files():
+                self.file_watcher.removePaths(self.file_watcher.files())
             logger.info("break `tail -f run.log`")
 
-    @staticmethod
-    def _read_logs_file() -> str:
+    def closeEvent(self, event: QCloseEvent) -> None:
         """
-        读取日志文件内容。
-
-        此方法从日志文件中读取所有日志内容并返回。
+        关闭对话框时停止跟随日志。
 
-        :return: 日志文件的内容。
-        :rtype: str
+        :param event: 关闭事件。
+        :type event: QCloseEvent
+        :rtype: None
+        :return: 无返回值。
         """
-        try:
-            with open(LOG_PATH, 'r', encoding='utf8') as file:
-                lines = file.readlines()
-                # 获取最后的LOG_LINES行
-                return ''.join(lines[-int(LOG_LINES):])
-        except Exception:
-            logger.exception("Error reading log file")
-            return ""
+        if self.refresh_button.isChecked():
+            self.refresh_button.setChecked(False)
+            self.toggle_real_time_logs()
+        super().closeEvent(event)
 
-    def _process_logs(self,
-                      logs_content: str,
-                      filter_level: Optional[str] = None) -> None:
+    def _schedule_update(self) -> None:
         """
-        处理并显示日志。
-
-        将日志内容按照指定的过滤级别进行处理，并显示在文本编辑器中。
+        合并短时间内的多次通知，在事件循环空闲时更新一次。
 
-        :param logs_content: 完整的日志内容。
-        :type logs_content: str
-        :param filter_level: 要筛选的日志级别，可选。
-        :type filter_level: Optional[str]
+        :rtype: None
+        :return: 无返回值。
         """
-        start_positions = [match.start() for match in DialogLogs.LOG_PATTERN.finditer(logs_content)]
+        if not self._update_scheduled:
+            self._update_scheduled = True
+            QTimer.singleShot(0, self.update_logs)
 
-        for i in range(len(start_positions)):
-            start = start_positions[i]
-            end = start_positions[i + 1] if i + 1 < len(start_positions) else None
-            log_entry = logs_content[start:end]
-            if filter_level is None or self._is_log_entry_of_level(log_entry, filter_level):
-                self._parse_and_display_log(log_entry)
+    def _on_log_file_changed(self) -> None:
+        """
+        日志文件或所在目录变化时更新日志。文件被轮换或重建后需要重新加入监视。
 
-    def _parse_and_display_log(self, log_entry: str) -> None:
+        :rtype: None
+        :return: 无返回值。
         """
-        解析并显示单条日志。
+        self._watch_log_file()
+        self._schedule_update()
 
-        解析单条日志信息，并以适当的颜色显示在文本编辑器中。
+    def _watch_log_file(self) -> None:
+        """
+        监视日志文件和所在目录。
 
-        :param log_entry: 单条日志的内容。
-        :type log_entry: str
+        :rtype: None
+        :return: 无返回值。
         """
-        match = DialogLogs.LOG_PATTERN.search(log_entry)
-        if match:
-            log_level = match.group(1)
-            color = LOG_COLORS.get(log_level, "black")
-        else:
-            color = "black"
-        self._append_log(log_entry, color)
+        log_dir = os.path.dirname(os.path.abspath(LOG_PATH))
+        if os.path.isdir(log_dir) and log_dir not in self.file_watcher.directories():
+            self.file_watcher.addPath(log_dir)
+        if os.path.exists(LOG_PATH) and not self.file_watcher.files():
+            self.file_watcher.addPath(LOG_PATH)
 
     def filter_logs(self) -> None:
         """
         根据选定级别过滤日志。
 
-        根据用户在下拉框中选择的日志级别筛选日志。
+        根据用户在下拉框中选择的日志级别，从索引中取出日志重新显示，不再读取文件。
 
         :rtype: None
         :return: 无返回值。
         """
         try:
-            selected_level = self.combo_box.currentText()
-
-            # 保存当前光标位置
-            current_cursor = self.text_edit.textCursor()
-            current_position = current_cursor.position()
-
-            # 清除并重新加载日志
-            self.text_edit.clear()
-            logs_content = self._read_logs_file()
-            self._process_logs(logs_content, selected_level)
-
-            # 尝试恢复光标到之前的位置
-            new_cursor = self.text_edit.textCursor()
-            new_cursor.setPosition(min(current_position, len(self.text_edit.toPlainText())))
-            self.text_edit.setTextCursor(new_cursor)
-            logger.info(f"Filtered level of logs: {selected_level}")
+            self._show_logs()
+            logger.info(f"Filtered level of logs: {self.combo_box.currentText()}")
         except Exception:
             logger.exception("Error filtering logs")
             self.status_updated.emit(self.lang['label_status_error'])
 
-    def _append_log(self,
-                    log: str,
-                    color: str) -> None:
+    def _show_logs(self) -> None:
         """
-        将日志添加到文本编辑器。
+        按当前筛选级别显示索引中的日志，并滚动到末尾。
 
-        使用指定的颜色将单条日志文本添加到文本编辑器中。
-
-        :param log: 要添加的日志文本。
-        :type log: str
-        :param color: 日志文本的颜色。
-        :type color: str
         :rtype: None
         :return: 无返回值。
         """
-        color_format = QTextCharFormat()
-        color_format.setForeground(QColor(color))
-
-        cursor = self.text_edit.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        cursor.insertText(log, color_format)
+        # 去掉末尾换行，避免多出一个空行
+        self.text_edit.setPlainText(self.log_index.select(self.combo_box.currentText()).rstrip('\n'))
+        self.text_edit.moveCursor(QTextCursor.End)
 
-    @staticmethod
-    def _is_log_entry_of_level(log_entry: str,
-                               selected_level: str) -> bool:
+    def _append_logs(self, logs_content: str) -> None:
         """
-        判断日志条目是否为选定级别。
-
-        检查日志条目是否为或高于用户选定的日志级别。
+        把新的日志加入索引，并追加符合筛选级别的部分。
 
-        :param log_entry: 单条日志的内容。
-        :type log_entry: str
-        :param selected_level: 选定的日志级别。
-        :type selected_level: str
-        :return: 日志条目是否为选定级别。
-        :rtype: bool
+        :param logs_content: 新的日志文本。
+        :type logs_content: str
+        :rtype: None
+        :return: 无返回值。
         """
-        if selected_level == LOG_DEFAULT_LEVEL:
-            return True
-        selected_index = DialogLogs.LOG_LEVELS.index(selected_level)
-        for level in DialogLogs.LOG_LEVELS[selected_index:]:
-            if f' - {level} - ' in log_entry:
-                return True
-        return False
+        selected_level = self.combo_box.currentText()
+        text = ''.join(piece for level, piece in self.log_index.append(logs_content) if LogIndex.passes(level, selected_level))
+        if not text:
+            return
+        # 视图停在末尾时才跟随滚动
+        scroll_bar = self.text_edit.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        self.text_edit.appendPlainText(text.rstrip('\n'))
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
 
     def open_github(self) -> None:
         """
@@ -344,3 +345,36 @@ class DialogLogs(QDialog):
         except Exception:
             logger.exception("Failed to open GitHub URL")
             self.status_updated.emit(self.lang['label_status_error'])
+
+
+class LogHighlighter(QSyntaxHighlighter):
+    """
+    按日志级别给文本着色。条目的续行沿用上一行的级别。
+
+    :param document: 要着色的文档。
+    :type document: QTextDocument
+    """
+
+    def __init__(self, document: QTextDocument):
+        super().__init__(document)
+        # 每个级别的格式只创建一次
+        self.formats = []
+        for level in LOG_LEVELS:
+            color_format = QTextCharFormat()
+            color_format.setForeground(QColor(LOG_COLORS[level]))
+            self.formats.append(color_format)
+
+    def highlightBlock(self, text: str) -> None:
+        """
+        给一行文本着色，由 Qt 在文本变化时调用。
+
+        :param text: 一行文本。
+        :type text: str
+        :rtype: None
+        :return: 无返回值。
+        """
+        match = LOG_PATTERN.match(text)
+        level = LOG_LEVELS.index(match.group(1)) if match else self.previousBlockState()
+        self.setCurrentBlockState(level)
+        if level >= 0:
+            self.setFormat(0, len(text), self.formats[level])
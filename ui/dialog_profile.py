@@ -0,0 +1,248 @@
+"""
+本模块提供了性能分析对话框。
+
+此模块定义了 `DialogProfile` 类。用户在对话框中选择分析项目后点击按钮，`profiler` 会分析下一次开始运行或过滤操作。分析结束后，对话框列出累计耗时最高的函数和新增内存最多的分配位置，并可以把函数统计导出为 `.pstats` 文件，不需要借助外部工具就能排查生产数据上的慢运行。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import os
+
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QCheckBox, QLabel, QTabWidget, QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog
+
+from config.settings import PROFILE_TOP
+from lib.get_resource_path import get_resource_path
+from lib.run_profiler import profiler
+from ui.global_signals import global_signals
+from ui.lang_manager import LangManager
+
+logger = logging.getLogger(__name__)
+
+
+class DialogProfile(QDialog):
+    """
+    性能分析对话框，准备分析并展示结果。
+
+    :param lang_manager: 语言管理器，用于界面语言的国际化。
+    :type lang_manager: LangManager
+    """
+    status_updated = pyqtSignal(str)
+
+    def __init__(self, lang_manager: LangManager):
+        super().__init__(flags=Qt.Dialog | Qt.WindowCloseButtonHint)
+        self.lang_manager = lang_manager
+        self.lang_manager.lang_updated.connect(self.update_lang)
+        # 分析在界面线程中结束，直接通过全局信号通知
+        profiler.on_finished = global_signals.profile_finished.emit
+        global_signals.profile_finished.connect(self.show_results)
+        self.initUI()
+
+    def initUI(self) -> None:
+        """
+        初始化用户界面组件。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        self.setWindowIcon(QIcon(get_resource_path('media/icons8-debug-26.png')))
+        self.resize(800, 520)
+
+        # 分析项目和准备按钮
+        self.cpu_check_box = QCheckBox(self)
+        self.cpu_check_box.setChecked(True)
+        self.memory_check_box = QCheckBox(self)
+        self.memory_check_box.setChecked(True)
+        self.arm_button = QPushButton(self)
+        self.arm_button.setCheckable(True)
+        self.arm_button.clicked.connect(self.toggle_arm)
+        self.status_label = QLabel(self)
+
+        # 结果表格
+        self.function_table = self._create_table(4)
+        self.allocation_table = self._create_table(3)
+        self.tab_widget = QTabWidget(self)
+        self.tab_widget.addTab(self.function_table, '')
+        self.tab_widget.addTab(self.allocation_table, '')
+
+        self.export_button = QPushButton(self)
+        self.export_button.clicked.connect(self.export_stats)
+        self.close_button = QPushButton(self)
+        self.close_button.clicked.connect(self.close)
+
+        # 布局设置
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(self.cpu_check_box)
+        top_layout.addWidget(self.memory_check_box)
+        top_layout.addStretch()
+        top_layout.addWidget(self.arm_button)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.export_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.close_button)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(top_layout)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.tab_widget)
+        layout.addLayout(button_layout)
+
+        self.update_lang()
+        self.show_results()
+
+    def update_lang(self) -> None:
+        """
+        更新界面语言设置。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        self.lang = self.lang_manager.get_lang()
+        self.setWindowTitle(self.lang['ui.dialog_profile_1'])
+        self.cpu_check_box.setText(self.lang['ui.dialog_profile_2'])
+        self.memory_check_box.setText(self.lang['ui.dialog_profile_3'])
+        self.arm_button.setText(self.lang['ui.dialog_profile_4'])
+        self.tab_widget.setTabText(0, self.lang['ui.dialog_profile_7'])
+        self.tab_widget.setTabText(1, self.lang['ui.dialog_profile_8'])
+        self.function_table.setHorizontalHeaderLabels([self.lang[f'ui.dialog_profile_{i}'] for i in (9, 10, 11, 12)])
+        self.allocation_table.setHorizontalHeaderLabels([self.lang[f'ui.dialog_profile_{i}'] for i in (13, 14, 15)])
+        self.export_button.setText(self.lang['ui.dialog_profile_16'])
+        self.close_button.setText(self.lang['ui.dialog_profile_17'])
+        self._update_status()
+
+    def toggle_arm(self, checked: bool) -> None:
+        """
+        准备或取消分析下一次操作。
+
+        :param checked: 按钮是否按下。
+        :type checked: bool
+        :rtype: None
+        :return: 无返回值。
+        """
+        try:
+            if checked:
+                profiler.arm(cpu=self.cpu_check_box.isChecked(), memory=self.memory_check_box.isChecked())
+            else:
+                profiler.disarm()
+            # 两项都没有选中时不会准备分析
+            self.arm_button.setChecked(profiler.armed)
+            self.cpu_check_box.setEnabled(not profiler.armed)
+            self.memory_check_box.setEnabled(not profiler.armed)
+            self._update_status()
+        except Exception:
+            logger.exception("Failed to arm the profiler")
+            self.status_updated.emit(self.lang['label_status_error'])
+
+    def show_results(self) -> None:
+        """
+        展示最近一次分析的结果。分析结束时由全局信号调用，对话框隐藏时一并显示出来。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        try:
+            self.arm_button.setChecked(profiler.armed)
+            self.cpu_check_box.setEnabled(not profiler.armed)
+            self.memory_check_box.setEnabled(not profiler.armed)
+            self._update_status()
+
+            functions = profiler.top_functions(PROFILE_TOP)
+            self.function_table.setRowCount(len(functions))
+            for row, (filename, lineno, name, calls, own_time, cumulative_time) in enumerate(functions):
+                # 内置函数没有文件名
+                location = f'{name} ({os.path.basename(filename)}:{lineno})' if filename != '~' else name
+                self._set_row(self.function_table, row, [location, calls, round(own_time, 4), round(cumulative_time, 4)], tooltip=f'{filename}:{lineno}')
+
+            allocations = profiler.top_allocations(PROFILE_TOP)
+            self.allocation_table.setRowCount(len(allocations))
+            for row, (filename, lineno, size, count) in enumerate(allocations):
+                self._set_row(self.allocation_table, row, [f'{os.path.basename(filename)}:{lineno}', round(size / 1024, 1), count], tooltip=f'{filename}:{lineno}')
+
+            self.export_button.setEnabled(profiler.stats is not None)
+            if profiler.label and not self.isVisible():
+                self.show()
+        except Exception:
+            logger.exception("Failed to show profile results")
+            self.status_updated.emit(self.lang['label_status_error'])
+
+    def export_stats(self) -> None:
+        """
+        把函数统计导出为 `.pstats` 文件。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        try:
+            file_name, _ = QFileDialog.getSaveFileName(self, self.lang['ui.dialog_profile_16'], f'{profiler.label}.pstats', 'Profile Stats (*.pstats)')
+            if not file_name:
+                return
+            if profiler.dump_stats(file_name):
+                self.status_updated.emit(self.lang['ui.dialog_profile_18'])
+            else:
+                self.status_updated.emit(self.lang['label_status_error'])
+        except Exception:
+            logger.exception("Failed to export profile stats")
+            self.status_updated.emit(self.lang['label_status_error'])
+
+    def _update_status(self) -> None:
+        """
+        更新状态文字：等待分析，或上一次分析的操作和用时。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        if profiler.armed:
+            self.status_label.setText(self.lang['ui.dialog_profile_5'])
+        elif profiler.label:
+            self.status_label.setText(self.lang['ui.dialog_profile_6'].format(profiler.label, profiler.seconds))
+        else:
+            self.status_label.setText('')
+
+    def _create_table(self, column_count: int) -> QTableWidget:
+        """
+        创建只读的结果表格，第一列自动拉伸。
+
+        :param column_count: 列数。
+        :type column_count: int
+        :rtype: QTableWidget
+        :return: 表格。
+        """
+        table = QTableWidget(0, column_count, self)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.setSelectionBehavior(QTableWidget.SelectRows)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        return table
+
+    @staticmethod
+    def _set_row(table: QTableWidget,
+                 row: int,
+                 values: list,
+                 tooltip: str) -> None:
+        """
+        填充一行，数字列右对齐。
+
+        :param table: 表格。
+        :type table: QTableWidget
+        :param row: 行号。
+        :type row: int
+        :param values: 各列的值。
+        :type values: list
+        :param tooltip: 第一列的提示文字。
+        :type tooltip: str
+        :rtype: None
+        :return: 无返回值。
+        """
+        for col, value in enumerate(values):
+            item = QTableWidgetItem()
+            item.setData(Qt.DisplayRole, value)
+            if col:
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            else:
+                item.setToolTip(tooltip)
+            table.setItem(row, col, item)
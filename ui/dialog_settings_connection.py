@@ -16,6 +16,7 @@ from PyQt5.QtGui import QIcon, QRegExpValidator
 from PyQt5.QtWidgets import QDialog, QFormLayout, QLineEdit, QDialogButtonBox, QTabWidget, QWidget, QHBoxLayout, QFrame, QVBoxLayout, QGroupBox, QLabel, QCheckBox
 
 from config.settings import REGEX_PORT, REGEX_ASCII
+from lib.freeze_data import thaw_data
 from lib.get_resource_path import get_resource_path
 from ui.config_manager import ConfigManager
 from ui.lang_manager import LangManager
@@ -45,7 +46,8 @@ class DialogSettingsConnection(QDialog):
         self.config_manager = config_manager
         # 两个配置都要
         self.config_main = self.config_manager.get_config_main()
-        self.config_connection = self.config_manager.get_config_connection()
+        # 对话框会修改连接配置，因此使用可修改的副本
+        self.config_connection = thaw_data(self.config_manager.get_config_connection())
         # 获取语言字典
         self.lang = self.lang_manager.get_lang()
         self.initUI()
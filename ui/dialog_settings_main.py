@@ -17,6 +17,7 @@ from PyQt5.QtWidgets import QDialog, QLineEdit, QDialogButtonBox, QHBoxLayout, Q
 
 from config.lang_dict_all import LANG_DICTS
 from config.settings import CONFIG_CENTER_LIST, APOLLO_NAME_LIST, COLOR_SET_LIST
+from lib.freeze_data import thaw_data
 from lib.get_resource_path import get_resource_path
 from ui.config_manager import ConfigManager
 from ui.lang_manager import LangManager
@@ -47,8 +48,8 @@ class DialogSettingsMain(QDialog):
         # 初始化两个管理器
         self.lang_manager = lang_manager
         self.config_manager = config_manager
-        # 获取管理器中的配置
-        self.config_main = self.config_manager.get_config_main()
+        # 获取管理器中的配置，对话框会修改它，因此使用可修改的副本
+        self.config_main = thaw_data(self.config_manager.get_config_main())
         # 获取语言字典
         self.lang = self.lang_manager.get_lang()
         self.initUI()
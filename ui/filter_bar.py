@@ -9,13 +9,16 @@
 """
 
 import logging
-from typing import List, Optional, Union
+from typing import List, Optional, Union, Set
 
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtWidgets import QHBoxLayout, QLabel, QComboBox, QLineEdit, QPushButton, QCheckBox, QFrame, QWidget, QSizePolicy
+from PyQt5.QtCore import Qt, pyqtSignal, QObject, QEvent
+from PyQt5.QtWidgets import QHBoxLayout, QLabel, QComboBox, QLineEdit, QPushButton, QCheckBox, QFrame, QWidget, QSizePolicy, QCompleter, QAbstractItemView
 
-from config.settings import COL_INFO, COLOR_HIGHLIGHT
+from config.settings import COL_INFO
 from lib.log_time import log_time
+from lib.run_metrics import metrics
+from lib.run_profiler import profiler
+from ui.app_list_model import AppListModel
 from ui.config_manager import ConfigManager
 from ui.lang_manager import LangManager
 from ui.table_main import TableMain
@@ -49,7 +52,6 @@ class FilterBar(QWidget):
         self.lang = self.lang_manager.get_lang()
         self.config_manager = config_manager
         self.table = table
-        self.highlight_rows = []
         self.initUI()
 
     def initUI(self) -> None:
@@ -103,8 +105,8 @@ class FilterBar(QWidget):
                 self.filter_table_box.setItemText(index, f"{self.lang['ui.filter_bar_4']}+{self.lang['ui.filter_bar_5']}")
             elif self.filter_table_box.itemData(index) == "fully+partially+skip":
                 self.filter_table_box.setItemText(index, f"{self.lang['ui.filter_bar_4']}+{self.lang['ui.filter_bar_5']}+{self.lang['ui.filter_bar_6']}")
-        # 直接更新服务名过滤默认选项文字
-        self.filter_app_box.setItemText(0, self.lang['ui.filter_bar_3'])
+        # 服务名过滤默认选项文字由模型自行更新，这里只刷新输入框
+        self._update_app_box_text()
         # 更新其他文字
         self.filter_app_label.setText(self.lang['ui.filter_bar_1'])
         self.filter_table_label.setText(self.lang['ui.filter_bar_2'])
@@ -125,15 +127,32 @@ class FilterBar(QWidget):
         # 建立标签，加入主布局
         self.filter_app_label = QLabel()
         self.layout.addWidget(self.filter_app_label)
-        # 过滤服务下拉框
+        # 过滤服务下拉框，选项来自表格维护的服务名索引
+        self.app_model = AppListModel(self.lang_manager, self.table.app_index)
         self.filter_app_box = QComboBox()
+        self.filter_app_box.setModel(self.app_model)
+        # 可输入服务名，不允许插入新选项
+        self.filter_app_box.setEditable(True)
+        self.filter_app_box.setInsertPolicy(QComboBox.NoInsert)
         # 设置下拉框的尺寸策略和宽度
         self.filter_app_box.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         # 设置最大宽度，以免拉伸太长
         self.filter_app_box.setMinimumWidth(100)
         self.filter_app_box.setMaximumWidth(300)
-        # 设置下拉框的事件处理
-        self.filter_app_box.currentIndexChanged.connect(self.filter_table)
+        # 设置补全器，输入部分服务名即可筛选
+        completer = QCompleter(self.app_model, self.filter_app_box)
+        completer.setCompletionRole(Qt.EditRole)
+        completer.setFilterMode(Qt.MatchContains)
+        completer.setCaseSensitivity(Qt.CaseInsensitive)
+        completer.activated[str].connect(self._select_app)
+        self.filter_app_box.setCompleter(completer)
+        self.filter_app_box.lineEdit().returnPressed.connect(lambda: self._select_app(self.filter_app_box.lineEdit().text()))
+        # 键盘在弹出列表中选择时，同样切换勾选
+        self.filter_app_box.activated[int].connect(self._toggle_app)
+        # 点击弹出列表中的选项时切换勾选，不关闭弹出列表
+        self.filter_app_box.view().viewport().installEventFilter(self)
+        # 设置勾选变化的事件处理
+        self.app_model.selection_changed.connect(self.filter_table)
         # 设置下拉框的选项，通过函数填充
         self.filter_options_add()
         self.layout.addWidget(self.filter_app_box)
@@ -221,36 +240,88 @@ class FilterBar(QWidget):
         """
         填充服务过滤下拉框选项。
 
-        此方法从配置数据中提取所有唯一的服务名称，并将它们添加到服务过滤下拉框中。
+        此方法从表格维护的服务名索引中读取所有服务名称，不再扫描表格。
 
         :rtype: None
         :return: 无返回值。
         """
         try:
             # 先断开信号
-            self.filter_app_box.currentIndexChanged.disconnect(self.filter_table)
+            self.app_model.selection_changed.disconnect(self.filter_table)
             self.filter_app_box.setEnabled(False)
-            # 清空过滤器并添加显示所有行的选项
-            self.filter_app_box.clear()
-            self.filter_app_box.addItem(self.lang['ui.filter_bar_3'], "all")
-            self.filter_app_box.setCurrentIndex(0)
-            # 使用集合和列表推导式去重并获取所有唯一项
-            unique_items = {self.table.item(row, COL_INFO['name']['col']).text()
-                            for row in range(self.table.rowCount())
-                            if self.table.item(row, COL_INFO['name']['col'])}
-            # 添加唯一项到下拉框
-            [self.filter_app_box.addItem(item, item) for item in unique_items]
-            # 对下拉框进行排序
-            model = self.filter_app_box.model()
-            model.sort(0)
+            # 从索引刷新模型，保留仍然存在的勾选
+            self.app_model.refresh()
+            self._update_app_box_text()
         except Exception:
             logger.exception("Exception occurred in adding filter options")
             self.status_updated.emit(self.lang['label_status_error'])
         finally:
             # 重新连接信号
-            self.filter_app_box.currentIndexChanged.connect(self.filter_table)
+            self.app_model.selection_changed.connect(self.filter_table)
             self.filter_app_box.setEnabled(True)
 
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        """
+        拦截服务下拉列表中的鼠标释放事件，实现多选。
+
+        :param obj: 事件对象。
+        :type obj: QObject
+        :param event: 事件。
+        :type event: QEvent
+
+        :return: 事件已处理时返回 True。
+        :rtype: bool
+        """
+        if obj is self.filter_app_box.view().viewport() and event.type() == QEvent.MouseButtonRelease:
+            index = self.filter_app_box.view().indexAt(event.pos())
+            if index.isValid():
+                self._toggle_app(index.row())
+            return True
+        return super().eventFilter(obj, event)
+
+    def _toggle_app(self, row: int) -> None:
+        """
+        切换服务下拉列表中指定行的勾选状态。
+
+        :param row: 行号。
+        :type row: int
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        self.app_model.toggle(row)
+        self._update_app_box_text()
+
+    def _select_app(self, name: str) -> None:
+        """
+        只选择一个服务，并跳转到它的行。由补全器或回车触发。
+
+        :param name: 服务名。
+        :type name: str
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        name = name.strip()
+        # 补全器和回车可能同时触发，选择没有变化时不重复过滤
+        if {name} == self.app_model.checked_names():
+            return
+        if not name or name == self.lang['ui.filter_bar_3']:
+            self.app_model.clear_selection()
+        else:
+            self.app_model.select_only(name)
+        self._update_app_box_text()
+
+    def _update_app_box_text(self) -> None:
+        """
+        在服务下拉框的输入框中显示当前选择。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        selected_apps = sorted(self.app_model.checked_names())
+        self.filter_app_box.lineEdit().setText(', '.join(selected_apps) if selected_apps else self.lang['ui.filter_bar_3'])
+
     def filter_reset(self) -> None:
         """
         重置过滤条件。
@@ -264,11 +335,12 @@ class FilterBar(QWidget):
             # 禁更新
             self.table.setUpdatesEnabled(False)
             # 断开信号连接
-            self.filter_app_box.currentIndexChanged.disconnect(self.filter_table)
+            self.app_model.selection_changed.disconnect(self.filter_table)
             self.filter_table_box.currentIndexChanged.disconnect(self.filter_table)
             self.filter_table_check_box.stateChanged.disconnect(self.filter_table)
-            # 重置 QComboBox 为第一个项，通常是 "--显示所有--"，
-            self.filter_app_box.setCurrentIndex(0)
+            # 清空服务勾选，重置 QComboBox 为第一个项，通常是 "--显示所有--"，
+            self.app_model.clear_selection()
+            self._update_app_box_text()
             self.filter_table_box.setCurrentIndex(0)
             # 还原反选框状态
             self.filter_table_check_box.setChecked(False)
@@ -282,11 +354,13 @@ class FilterBar(QWidget):
         finally:
             # 开启更新，重新连接信号
             self.table.setUpdatesEnabled(True)
-            self.filter_app_box.currentIndexChanged.connect(self.filter_table)
+            self.app_model.selection_changed.connect(self.filter_table)
             self.filter_table_box.currentIndexChanged.connect(self.filter_table)
             self.filter_table_check_box.stateChanged.connect(self.filter_table)
 
     @log_time
+    @profiler.profiled('filter')
+    @metrics.timed('filter')
     def filter_table(self, rows: Optional[List[int]] = None) -> None:
         """
         应用过滤条件到表格。带有时间记录用于调试。
@@ -309,17 +383,26 @@ class FilterBar(QWidget):
             visible_rows = 0
             # 搜索框输入内容
             search_value = self.filter_value_box.text().strip().lower()
+            # 选中的服务，为空表示所有服务
+            selected_apps = self.app_model.checked_names()
+            # 通过索引直接得到选中服务的行，其他行不需要读取单元格
+            app_rows = self._get_app_rows(selected_apps) if selected_apps else None
+            first_visible_row = None
             # 在新的搜索开始之前，恢复每个单元格的原始样式。
             if color_switch == 'ON':
                 # 针对忽略操作，改变表格颜色。
                 if valid_rows:
                     self.table.apply_color_to_table(valid_rows)
                 # 针对高亮操作
-                elif self.highlight_rows:
+                elif self.table.highlight_rows:
                     self._reset_styles()
 
             # 如果没有传入行列表，则应用到整个列表
             for row in valid_rows if valid_rows else range(self.table.rowCount()):
+                if app_rows is not None and row not in app_rows:
+                    self.table.setRowHidden(row, True)
+                    continue
+
                 consistency_data = self.table.item(row, COL_INFO['consistency']['col']).data(Qt.UserRole)
                 skip_data = self.table.item(row, COL_INFO['skip']['col']).data(Qt.UserRole)
                 name_data = self.table.item(row, COL_INFO['name']['col']).text()
@@ -331,7 +414,7 @@ class FilterBar(QWidget):
                     continue
 
                 # 匹配选择所有或者选择服务名时为True，不设隐藏
-                app_match = self._get_app_match(name_data)
+                app_match = self._get_app_match(name_data, selected_apps)
                 if not app_match:
                     self.table.setRowHidden(row, True)
                     continue
@@ -345,13 +428,16 @@ class FilterBar(QWidget):
                 # 仅当条件都匹配时才显示行
                 self.table.setRowHidden(row, False)
                 visible_rows += 1
+                if first_visible_row is None or row < first_visible_row:
+                    first_visible_row = row
 
                 # 对单元格应用颜色
                 if color_switch == 'ON' and isinstance(search_match, list):
-                    self.highlight_rows.append(self._generate_index_key(row))
-                    for column in search_match:
-                        self.table.apply_color(row, COLOR_HIGHLIGHT, column)
+                    self.table.highlight_cells(row, search_match)
 
+            # 选择了服务时，直接跳转到它的第一行
+            if selected_apps and first_visible_row is not None:
+                self.table.scrollToItem(self.table.item(first_visible_row, COL_INFO['name']['col']), QAbstractItemView.PositionAtTop)
             # 更新状态栏信息展示过滤后的行数
             self.status_updated.emit(f"{visible_rows} {self.lang['ui.filter_bar_11']}")
         except Exception:
@@ -360,18 +446,35 @@ class FilterBar(QWidget):
         finally:
             self.table.setUpdatesEnabled(True)
 
-    def _get_app_match(self, name_data: str) -> bool:
+    def _get_app_rows(self, selected_apps: Set[str]) -> Set[int]:
+        """
+        通过服务名索引获取选中服务当前所在的行号。
+
+        :param selected_apps: 选中的服务名集合。
+        :type selected_apps: Set[str]
+
+        :return: 行号集合。
+        :rtype: Set[int]
+        """
+        return {self.table.row_of(row_id)
+                for app in selected_apps
+                for row_id in self.table.app_index.rows(app)}
+
+    @staticmethod
+    def _get_app_match(name_data: str,
+                       selected_apps: Set[str]) -> bool:
         """
         检查当前行是否与选定的应用服务匹配。
 
         :param name_data: 行中的应用服务名称。
         :type name_data: str
+        :param selected_apps: 选中的服务名集合，为空表示所有服务。
+        :type selected_apps: Set[str]
 
         :return: 如果当前行与选定的应用服务匹配，则返回 True。
         :rtype: bool
         """
-        selected_app = self.filter_app_box.currentData()
-        return True if selected_app == "all" or selected_app == name_data else False
+        return not selected_apps or name_data in selected_apps
 
     def _get_table_match(self,
                          consistency_data: str,
@@ -447,52 +550,16 @@ class FilterBar(QWidget):
         self.table.setUpdatesEnabled(True)
         return match_col
 
-    def _generate_index_key(self, row: int) -> str:
-        """
-        生成索引键。
-
-        此方法根据给定的行号生成一个唯一的索引键。索引键由行中特定列的值组合而成，用于标识表格中的唯一行。
-
-        :param row: 表格中的行号。
-        :type row: int
-
-        :return: 生成的索引键。
-        :rtype: str
-        """
-        name = self.table.item(row, COL_INFO['name']['col']).text()
-        group = self.table.item(row, COL_INFO['group']['col']).text()
-        key = self.table.item(row, COL_INFO['key']['col']).text()
-        return f"{name}+{group}+{key}"
-
     def _reset_styles(self) -> None:
         """
         重置表格样式到记录的状态。
 
-        此方法遍历表格中的所有行，对于每一行，恢复其单元格的背景颜色到初始状态。这通常在过滤条件发生变化或重置时调用。
+        高亮行由表格以行号标识位图记录，还原时只处理被记录的行，不需要遍历整表。这通常在过滤条件发生变化或重置时调用。
 
         :rtype: None
         :return: 无返回值。
         """
-
         try:
-            reset_rows = []
-            # 还原字典为空则跳过
-            if not self.highlight_rows:
-                return
-            # 遍历每行，但跳过隐藏行，因为隐藏行必然没有被更改颜色。
-            # 反过来遍历还原字典并不可行，因为索引键并不储存在表格中，
-            # 而且索引键和行号并不能形成牢固对应关系（行号可变），
-            # 所以遍历所有行，但只操作匹配的单元格，最大程度减少对单元格的操作。
-            for row in range(self.table.rowCount()):
-                if self.table.isRowHidden(row):
-                    continue
-                # 生成当行索引键，并检测是否在还原列表中。
-                elif self._generate_index_key(row) in self.highlight_rows:
-                    # 索引键在还原字典中找到时，向reset_rows插入行数
-                    reset_rows.append(row)
-            # 最后一次性还原单元格本来颜色。
-            self.table.apply_color_to_table(reset_rows)
-            # 完成后，清空还原列表。
-            self.highlight_rows.clear()
+            self.table.clear_highlight()
         except Exception:
-            logger.exception("Error occurred while resetting styles")
\ No newline at end of file
+            logger.exception("Error occurred while resetting styles")
@@ -27,6 +27,13 @@ class GlobalSignals(QObject):
     """
 
     close_all = pyqtSignal()
+    # 一次运行开始和后台线程结束，无论成功与否
+    run_started = pyqtSignal()
+    run_finished = pyqtSignal()
+    # 一次运行结束，参数为各阶段耗时和计数的汇总
+    run_metrics_updated = pyqtSignal(dict)
+    # 一次性能分析结束
+    profile_finished = pyqtSignal()
 
 
 # 创建全局信号的单一实例
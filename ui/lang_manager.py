@@ -3,18 +3,20 @@
 
 本模块主要包含 `LangManager` 类，该类负责语言的获取和更新。通过使用 PyQt5 的信号和槽机制，可以在语言更新时及时通知UI组件。
 
+语言字典冻结为只读映射后按引用分享，各组件更新语言时不再复制整个字典。
+
 :author: assassing
 :contact: https://github.com/hxz393
 :copyright: Copyright 2023, hxz393. 保留所有权利。
 """
 
-import copy
 import logging
-from typing import Dict, Optional
+from typing import Mapping, Optional
 
 from PyQt5.QtCore import QObject, pyqtSignal
 
 from config.lang_dict_all import LANG_DICTS
+from lib.freeze_data import freeze_data
 from module.get_lang_dict import get_lang_dict
 
 logger = logging.getLogger(__name__)
@@ -26,24 +28,35 @@ class LangManager(QObject):
 
     此类继承自 QObject，可发出语言更新的信号。它通过 `get_lang_dict` 函数获取当前语言字典，并提供了更新语言的功能。
 
-    :ivar _lang_dict: 当前使用的语言字典。
-    :vartype _lang_dict: dict
+    :ivar _lang_dict: 当前使用的只读语言字典。
+    :vartype _lang_dict: Mapping[str, str]
     """
     lang_updated = pyqtSignal()
 
     def __init__(self):
         super().__init__()
-        self._lang_dict = get_lang_dict()
+        self._lang_dict = freeze_data(get_lang_dict())
+        # 语言字典的版本号，每次切换语言加一
+        self._version = 0
+
+    def get_version(self) -> int:
+        """
+        获取语言字典的版本号。使用者可以据此判断由语言文字生成的缓存是否过期。
+
+        :return: 版本号。
+        :rtype: int
+        """
+        return self._version
 
-    def get_lang(self) -> Optional[Dict[str, str]]:
+    def get_lang(self) -> Optional[Mapping[str, str]]:
         """
-        获取当前使用的语言字典的副本。
+        获取当前使用的语言字典。
 
-        :return: 当前语言字典的深拷贝。
-        :rtype: Optional[Dict[str, str]]
+        :return: 当前语言字典的只读映射。
+        :rtype: Optional[Mapping[str, str]]
         """
         try:
-            return copy.deepcopy(self._lang_dict)
+            return self._lang_dict
         except Exception:
             logger.exception("Failed to retrieve language dictionary.")
             return None
@@ -59,7 +72,8 @@ class LangManager(QObject):
         :return: 无返回值。
         """
         try:
-            self._lang_dict = LANG_DICTS.get(new_lang, "English")
+            self._lang_dict = freeze_data(LANG_DICTS.get(new_lang, LANG_DICTS["English"]))
+            self._version += 1
             self.lang_updated.emit()
             logger.info(f"Language changed to {new_lang}")
         except Exception:
@@ -0,0 +1,126 @@
+"""
+这个模块提供了进程内的日志接收器。
+
+`LogSink` 在根日志记录器上挂一个处理器，把格式化后的日志记录放进有上限的环形缓冲区，并发出 `records_added` 信号。日志对话框跟随日志时挂上处理器，停止跟随后取下，不跟随时没有任何开销。
+
+日志可能在子线程中产生，信号会排队送到界面线程。处理器每条记录都发信号，接收方应合并处理，再用 `records_since` 一次取出所有新记录。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import List, Tuple
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from config.settings import LOG_LINES
+
+
+class LogSink(QObject):
+    """
+    把日志记录放入环形缓冲区并发出信号。
+
+    :param capacity: 缓冲区最多保存的记录数。
+    :type capacity: int
+
+    :example:
+    >>> sink = LogSink(capacity=2)
+    >>> sink.attach()
+    >>> for i in range(3):
+    ...     logging.getLogger('demo').warning(f'message {i}')
+    >>> sink.detach()
+    >>> records, sequence = sink.records_since(0)
+    >>> [record.rsplit(' - ', 1)[-1] for record in records], sequence
+    (['message 1', 'message 2'], 3)
+    """
+    records_added = pyqtSignal()
+
+    def __init__(self, capacity: int = LOG_LINES):
+        super().__init__()
+        self._records: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        # 已接收的记录总数，用作记录序号
+        self.sequence = 0
+        self.handler = _SinkHandler(self)
+
+    def attach(self) -> None:
+        """
+        把处理器挂到根日志记录器，格式和过滤器与已有的处理器相同，被限流的日志同样不会进入缓冲区。
+
+        处理器排在最前面，一条记录先进入缓冲区再写入文件。因此读到文件中的记录时，它一定已经在缓冲区里。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        root = logging.getLogger()
+        if self.handler in root.handlers:
+            return
+        formatter = next((handler.formatter for handler in root.handlers if handler.formatter is not None), None)
+        self.handler.setFormatter(formatter)
+        self.handler.filters = [log_filter for handler in root.handlers for log_filter in handler.filters]
+        root.handlers.insert(0, self.handler)
+
+    def detach(self) -> None:
+        """
+        从根日志记录器取下处理器。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        logging.getLogger().removeHandler(self.handler)
+
+    def records_since(self, sequence: int) -> Tuple[List[str], int]:
+        """
+        取出指定序号之后的记录。已经被挤出缓冲区的记录无法取出。
+
+        :param sequence: 上次取出时得到的序号。
+        :type sequence: int
+        :rtype: Tuple[List[str], int]
+        :return: 新记录和当前序号。
+        """
+        with self._lock:
+            count = min(self.sequence - sequence, len(self._records))
+            records = list(self._records)[len(self._records) - count:] if count > 0 else []
+            return records, self.sequence
+
+    def _put(self, text: str) -> None:
+        """
+        放入一条记录并发出信号。由处理器调用。
+
+        :param text: 格式化后的日志记录。
+        :type text: str
+        :rtype: None
+        :return: 无返回值。
+        """
+        with self._lock:
+            self._records.append(text)
+            self.sequence += 1
+        try:
+            self.records_added.emit()
+        except RuntimeError:
+            # 程序退出时 Qt 对象可能已经销毁
+            pass
+
+
+class _SinkHandler(logging.Handler):
+    """
+    把格式化后的记录交给 `LogSink` 的日志处理器。
+    """
+
+    def __init__(self, sink: LogSink):
+        super().__init__()
+        self._sink = sink
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._sink._put(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+# 创建日志接收器的单一实例
+log_sink = LogSink()
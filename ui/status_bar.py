@@ -3,17 +3,31 @@
 
 主要包含 `StatusBar` 类，负责创建和管理状态栏。此类通过 `LangManager` 接收语言更新，并相应地更新状态栏的显示信息。
 
+运行结束后，状态栏右侧显示本次运行的总耗时、最慢的几个阶段和内存峰值，鼠标悬停时显示全部阶段、各环境明细、计数和峰值。
+
+运行期间，`ResourceSampler` 在后台线程中定时采样进程的内存和 CPU 占用，峰值记入本次运行的汇总。采样不依赖界面事件循环，界面线程填充表格、着色和过滤时的内存峰值同样能记录下来。状态栏另用定时器显示最近一次采样、当前阶段和各环境取结果的速度，界面线程忙碌时显示会暂停，但不影响峰值记录。内存峰值超过 `RESOURCE_RSS_WARNING_MB` 时文字变红，并记录一条警告日志。
+
 :author: assassing
 :contact: https://github.com/hxz393
 :copyright: Copyright 2023, hxz393. 保留所有权利。
 """
 
 import logging
+from typing import Any, Dict, Optional
+
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QStatusBar, QLabel
+
+from config.settings import RESOURCE_SAMPLE_INTERVAL, RESOURCE_RSS_WARNING_MB
+from lib.resource_sampler import ResourceSampler
+from lib.run_metrics import RunMetrics, metrics
+from ui.global_signals import global_signals
 from ui.lang_manager import LangManager
 
 logger = logging.getLogger(__name__)
 
+MEGABYTE = 1024 * 1024
+
 
 class StatusBar(QStatusBar):
     """
@@ -27,6 +41,12 @@ class StatusBar(QStatusBar):
         super().__init__()
         self.lang_manager = lang_manager
         self.lang_manager.lang_updated.connect(self.update_lang)
+        global_signals.run_metrics_updated.connect(self.show_run_metrics)
+        global_signals.run_started.connect(self.start_monitor)
+        global_signals.run_finished.connect(self.stop_monitor)
+        self.run_summary: Optional[Dict[str, Any]] = None
+        self.resource_sampler = ResourceSampler(RESOURCE_SAMPLE_INTERVAL / 1000, self._record_peaks)
+        self.rss_warned = False
         self.initUI()
 
     def initUI(self) -> None:
@@ -38,6 +58,14 @@ class StatusBar(QStatusBar):
         """
         self.label = QLabel()
         self.addPermanentWidget(self.label)
+        self.resource_label = QLabel()
+        self.resource_label.hide()
+        self.addPermanentWidget(self.resource_label)
+        self.metrics_label = QLabel()
+        self.addPermanentWidget(self.metrics_label)
+        self.resource_timer = QTimer(self)
+        self.resource_timer.setInterval(RESOURCE_SAMPLE_INTERVAL)
+        self.resource_timer.timeout.connect(self.show_resources)
         self.update_lang()
 
     def update_lang(self) -> None:
@@ -49,6 +77,8 @@ class StatusBar(QStatusBar):
         """
         self.lang = self.lang_manager.get_lang()
         self.show_message(self.lang['main_1'])
+        if self.run_summary is not None:
+            self.show_run_metrics(self.run_summary)
 
     def show_message(self, message: str) -> None:
         """
@@ -66,3 +96,102 @@ class StatusBar(QStatusBar):
             self.label.setText(message)
         except Exception:
             logger.exception("Error while displaying message on status bar.")
+
+    def show_run_metrics(self, summary: Dict[str, Any]) -> None:
+        """
+        显示一次运行的耗时汇总。
+
+        :param summary: `RunMetrics.summary` 返回的汇总。
+        :type summary: Dict[str, Any]
+        :rtype: None
+        :return: 无返回值。
+        """
+        try:
+            self.run_summary = summary
+            slowest = ', '.join(RunMetrics.format_summary(summary, limit=3))
+            peak_rss = summary.get('peaks', {}).get('rss_mb')
+            if peak_rss is not None:
+                slowest += f", {self.lang['ui.status_bar_4'].format(peak_rss)}"
+            self.metrics_label.setText(f"{self.lang['ui.status_bar_1'].format(summary['total_seconds'])} ({slowest})")
+            self.metrics_label.setToolTip('\n'.join(RunMetrics.format_summary(summary)))
+        except Exception:
+            logger.exception("Error while displaying run metrics on status bar.")
+
+    def start_monitor(self) -> None:
+        """
+        开始采样资源占用，在一次运行开始时调用。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        try:
+            self.rss_warned = False
+            self.resource_label.setStyleSheet('')
+            self.resource_label.setToolTip('')
+            self.resource_label.setText('')
+            self.resource_label.show()
+            self.resource_sampler.start()
+            self.resource_timer.start()
+        except Exception:
+            logger.exception("Error while starting resource monitor.")
+
+    def stop_monitor(self) -> None:
+        """
+        停止采样并隐藏资源占用，在后台线程结束时调用。停止时最后采样一次，峰值在保存运行汇总之前已经记录完整。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        try:
+            self.resource_timer.stop()
+            self.resource_sampler.stop()
+            self.resource_label.hide()
+        except Exception:
+            logger.exception("Error while stopping resource monitor.")
+
+    def show_resources(self) -> None:
+        """
+        显示最近一次采样的内存和 CPU 占用、当前阶段和各环境取结果的速度。
+
+        取结果的速度是各环境已读取的行数除以 fetch 阶段的耗时，取结果期间按进行中的耗时实时计算。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        try:
+            rss, cpu_percent = self.resource_sampler.latest
+            parts = []
+            stage, env_name = metrics.current_stage
+            if stage:
+                parts.append(f"{stage} ({env_name})" if env_name else stage)
+            parts.append(self.lang['ui.status_bar_2'].format(rss / MEGABYTE, cpu_percent))
+            summary = metrics.summary()
+            for env, rows in summary['counters'].get('fetched_rows', {}).get('environments', {}).items():
+                seconds = metrics.elapsed('fetch', env)
+                if seconds:
+                    parts.append(self.lang['ui.status_bar_3'].format(env, rows / seconds))
+            self.resource_label.setText(' | '.join(parts))
+
+            peak_rss = summary['peaks'].get('rss_mb', 0)
+            if peak_rss > RESOURCE_RSS_WARNING_MB and not self.rss_warned:
+                self.rss_warned = True
+                self.resource_label.setStyleSheet('color: red')
+                self.resource_label.setToolTip(self.lang['ui.status_bar_5'])
+                logger.warning(f"Memory usage {peak_rss:.0f} MB exceeds {RESOURCE_RSS_WARNING_MB} MB")
+        except Exception:
+            logger.exception("Error while displaying resource usage.")
+
+    @staticmethod
+    def _record_peaks(rss: int, cpu_percent: float) -> None:
+        """
+        把一次采样记入本次运行的峰值，在采样线程中调用。
+
+        :param rss: 常驻内存字节数。
+        :type rss: int
+        :param cpu_percent: CPU 占用百分比。
+        :type cpu_percent: float
+        :rtype: None
+        :return: 无返回值。
+        """
+        metrics.peak('rss_mb', round(rss / MEGABYTE, 1))
+        metrics.peak('cpu_percent', round(cpu_percent, 1))
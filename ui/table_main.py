@@ -16,16 +16,19 @@ from PyQt5.QtCore import Qt, QPoint, pyqtSignal
 from PyQt5.QtGui import QBrush, QColor, QKeyEvent
 from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QMenu, QAction, QHeaderView
 
-from config.settings import COL_INFO, COLOR_SKIP, COLOR_CONSISTENCY_FULLY, COLOR_CONSISTENCY_PARTIALLY, COLOR_EMPTY, COLOR_DEFAULT
+from config.settings import COL_INFO, COLOR_SKIP, COLOR_CONSISTENCY_FULLY, COLOR_CONSISTENCY_PARTIALLY, COLOR_EMPTY, COLOR_DEFAULT, COLOR_HIGHLIGHT
 from lib.log_time import log_time
-from ui.action_copy import ActionCopy
-from ui.action_save import ActionSave
-from ui.action_skip import ActionSkip
-from ui.action_unskip import ActionUnskip
+from lib.row_bitmap import RowBitmap
+from lib.run_metrics import metrics
+from module.app_index import AppIndex
+from module.result_store import ResultStore, COLUMN_KEYS
+from ui.action_registry import action_registry
 from ui.config_manager import ConfigManager
 from ui.lang_manager import LangManager
 
 logger = logging.getLogger(__name__)
+# 行号标识储存在服务名单元格中，排序后也不会改变
+ROW_ID_ROLE = Qt.UserRole + 1
 
 
 class TableMain(QTableWidget):
@@ -45,7 +48,6 @@ class TableMain(QTableWidget):
     :copyright: Copyright 2023, hxz393. 保留所有权利。
     """
     status_updated = pyqtSignal(str)
-    filter_updated = pyqtSignal(list)
 
     def __init__(self,
                  lang_manager: LangManager,
@@ -54,18 +56,15 @@ class TableMain(QTableWidget):
         self.lang_manager = lang_manager
         self.lang_manager.lang_updated.connect(self.update_lang)
         self.config_manager = config_manager
-        # 实例化用到的组件
-        self.actionCopy = ActionCopy(self.lang_manager, self)
-        self.actionSave = ActionSave(self.lang_manager, self)
-        self.actionSkip = ActionSkip(self.lang_manager, self.config_manager, self)
-        self.actionUnskip = ActionUnskip(self.lang_manager, self.config_manager, self)
-        # 手动连接实例化的组件信号到转发函数
-        self.actionCopy.status_updated.connect(self.forward_status)
-        self.actionSave.status_updated.connect(self.forward_status)
-        self.actionSkip.status_updated.connect(self.forward_status)
-        self.actionSkip.filter_updated.connect(self.forward_filter)
-        self.actionUnskip.status_updated.connect(self.forward_status)
-        self.actionUnskip.filter_updated.connect(self.forward_filter)
+        # 表格数据的列式存储，行号标识即存储中的序号
+        self.result_store = ResultStore()
+        # 行号标识到服务名单元格的映射，用于在排序后找到当前行
+        self._row_anchors = []
+        # 被搜索高亮的行号标识
+        self.highlight_rows = RowBitmap()
+        # 服务名索引，随插入行增量维护
+        self.app_index = AppIndex()
+        # 复制、保存、忽略等动作与主窗口共用，在使用时从注册表获取
         self.initUI()
 
     def initUI(self) -> None:
@@ -145,22 +144,22 @@ class TableMain(QTableWidget):
         # 重新应用到表头
         self.setHorizontalHeaderLabels(self.column_headers)
         # 定义数据和显示映射的字典
-        consistency_status_mapping = {
+        self.consistency_status_mapping = {
             "inconsistent": self.lang['ui.action_start_8'],
             "fully": self.lang['ui.action_start_9'],
             "partially": self.lang['ui.action_start_10'],
             "unknown": self.lang['ui.action_start_13'],
         }
-        skip_status_mapping = {
+        self.skip_status_mapping = {
             "no": self.lang['ui.action_start_11'],
             "yes": self.lang['ui.action_start_12'],
             "unknown": self.lang['ui.action_start_13'],
         }
         for row in range(self.rowCount()):
             # 更新忽略状态文字
-            self._update_item_text(row, "skip", skip_status_mapping)
+            self._update_item_text(row, "skip", self.skip_status_mapping)
             # 更新一致性状态文字
-            self._update_item_text(row, "consistency", consistency_status_mapping)
+            self._update_item_text(row, "consistency", self.consistency_status_mapping)
 
     def _update_item_text(self,
                           row: int,
@@ -200,7 +199,7 @@ class TableMain(QTableWidget):
         :return: 无返回值。
         """
         if event.key() == Qt.Key_C and (event.modifiers() & Qt.ControlModifier):
-            self.actionCopy.action_copy()
+            action_registry.get('copy').action_copy()
         else:
             super().keyPressEvent(event)
 
@@ -215,16 +214,16 @@ class TableMain(QTableWidget):
         :return: 无返回值。
         """
         menu = QMenu(self)
-        menu.addAction(self.actionCopy.action_copy)
+        menu.addAction(action_registry.get('copy').action_copy)
         separator = QAction(menu)
         separator.setSeparator(True)
         menu.addAction(separator)
-        menu.addAction(self.actionSkip.action_skip)
-        menu.addAction(self.actionUnskip.action_unskip)
+        menu.addAction(action_registry.get('skip').action_skip)
+        menu.addAction(action_registry.get('unskip').action_unskip)
         sep = QAction(menu)
         sep.setSeparator(True)
         menu.addAction(sep)
-        menu.addAction(self.actionSave.action_save)
+        menu.addAction(action_registry.get('save').action_save)
         menu.exec_(self.viewport().mapToGlobal(pos))
 
     def _header_context_menu(self, pos: QPoint) -> None:
@@ -277,6 +276,9 @@ class TableMain(QTableWidget):
         :return: 无返回值。
         """
         row_position = 0
+        # 出错时把存储和行号锚点恢复到这个长度，保证行号标识与它们一一对应
+        store_length = len(self.result_store)
+        anchor_count = len(self._row_anchors)
         try:
             # 获取最后行数
             row_position = self.rowCount()
@@ -284,10 +286,60 @@ class TableMain(QTableWidget):
             self.insertRow(row_position)
             # 插入单元格数据
             self._fill_row_data(row_position, data)
+            # 写入存储，并记录行号标识
+            row_id = self.result_store.append([user_data for _, user_data in data])
+            anchor = self.item(row_position, COL_INFO['name']['col'])
+            anchor.setData(ROW_ID_ROLE, row_id)
+            self._row_anchors.append(anchor)
+            # 更新服务名索引
+            self.app_index.add(anchor.text(),
+                               row_id,
+                               data[COL_INFO['consistency']['col']][1],
+                               data[COL_INFO['skip']['col']][1])
         except Exception:
             logger.exception(f"Error occurred while adding a new row at position {row_position}")
+            self.result_store.truncate(store_length)
+            del self._row_anchors[anchor_count:]
             self.removeRow(row_position)
 
+    def load_store(self, store: ResultStore) -> None:
+        """
+        直接用已有的存储填充表格，例如从快照读取的存储。存储成为表格的存储，不再逐行复制和重新编号。
+
+        每个字符串只解码一次，一致性和忽略状态列按当前语言显示。调用前表格应已清空，出错时异常交给调用者处理。
+
+        :param store: 结果存储。
+        :type store: ResultStore
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        self.result_store = store
+        self.setRowCount(len(store))
+        unknown_text = self.lang['ui.action_start_13']
+        text_mappings = {COL_INFO['consistency']['col']: self.consistency_status_mapping,
+                         COL_INFO['skip']['col']: self.skip_status_mapping}
+        name_col = COL_INFO['name']['col']
+        consistency_col = COL_INFO['consistency']['col']
+        skip_col = COL_INFO['skip']['col']
+        # 已解码的字符串，键为字符串编号
+        decoded: Dict[int, str] = {}
+        column_arrays = [store.columns[key] for key in COLUMN_KEYS]
+        for row_id in range(len(store)):
+            data = []
+            for col, column_array in enumerate(column_arrays):
+                code = column_array[row_id]
+                value = decoded.get(code)
+                if value is None:
+                    value = decoded[code] = store.strings[code]
+                mapping = text_mappings.get(col)
+                data.append([mapping.get(value, unknown_text) if mapping else value, value])
+            self._fill_row_data(row_id, data)
+            anchor = self.item(row_id, name_col)
+            anchor.setData(ROW_ID_ROLE, row_id)
+            self._row_anchors.append(anchor)
+            self.app_index.add(data[name_col][1], row_id, data[consistency_col][1], data[skip_col][1])
+
     def _fill_row_data(self,
                        row_position: int,
                        data: List[List[str]]) -> None:
@@ -313,6 +365,7 @@ class TableMain(QTableWidget):
             self.setItem(row_position, column, item)
 
     @log_time
+    @metrics.timed('color')
     def apply_color_to_table(self, rows: List[int] = None) -> None:
         """
         对整个表格进行着色。通常只有初始化时才不带rows参数，以应用到整表。
@@ -373,6 +426,87 @@ class TableMain(QTableWidget):
                 if self.item(row, column).text() == 'None':
                     self.apply_color(row, COLOR_EMPTY, column)
 
+    def row_id(self, row: int) -> int:
+        """
+        获取当前行的行号标识。行号标识在插入时分配，不随排序改变。
+
+        :param row: 当前行号。
+        :type row: int
+
+        :rtype: int
+        :return: 行号标识。
+        """
+        return self.item(row, COL_INFO['name']['col']).data(ROW_ID_ROLE)
+
+    def row_of(self, row_id: int) -> int:
+        """
+        根据行号标识获取当前行号。
+
+        :param row_id: 行号标识。
+        :type row_id: int
+
+        :rtype: int
+        :return: 当前行号。
+        """
+        return self._row_anchors[row_id].row()
+
+    def set_skip_status(self,
+                        row: int,
+                        skip_status: str) -> None:
+        """
+        设置指定行的忽略状态，并同步服务名索引中的计数。
+
+        :param row: 行号。
+        :type row: int
+        :param skip_status: 忽略状态，'yes' 或 'no'。
+        :type skip_status: str
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        item = self.item(row, COL_INFO['skip']['col'])
+        old_status = item.data(Qt.UserRole)
+        item.setData(Qt.UserRole, skip_status)
+        item.setData(Qt.DisplayRole, self.skip_status_mapping.get(skip_status, self.lang['ui.action_start_13']))
+        self.app_index.update_skip(self.item(row, COL_INFO['name']['col']).text(), old_status, skip_status)
+        self.result_store.set_value(self.row_id(row), 'skip', skip_status)
+
+    def highlight_cells(self,
+                        row: int,
+                        columns: List[int]) -> None:
+        """
+        高亮指定行中的单元格，并记录到高亮位图。
+
+        :param row: 行号。
+        :type row: int
+        :param columns: 要高亮的列号列表。
+        :type columns: List[int]
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        self.highlight_rows.add(self.row_id(row))
+        for column in columns:
+            self.apply_color(row, COLOR_HIGHLIGHT, column)
+
+    def clear_highlight(self) -> None:
+        """
+        还原所有高亮行的颜色，并清空高亮位图。
+
+        只处理被记录的行，耗时与高亮行数成正比，不会触及其他行。
+
+        :rtype: None
+        :return: 无返回值。
+        """
+        try:
+            for row_id in self.highlight_rows:
+                self._process_row_for_color(self.row_of(row_id))
+        except Exception:
+            logger.exception("Error occurred while clearing highlight")
+            self.status_updated.emit(self.lang['label_status_error'])
+        finally:
+            self.highlight_rows.clear()
+
     def apply_color(self,
                     row: int,
                     color: str,
@@ -419,44 +553,14 @@ class TableMain(QTableWidget):
             self.clearContents()
             # 将行数设置为0，从而删除所有行
             self.setRowCount(0)
+            # 行号标识和高亮记录随行一起清空。存储换成新对象，仍在使用旧数据的对比结果不受影响
+            self.result_store = ResultStore()
+            self._row_anchors.clear()
+            self.highlight_rows.clear()
+            self.app_index.clear()
         except Exception:
             logger.exception("Error occurred while clearing the table.")
             self.status_updated.emit(self.lang['label_status_error'])
         finally:
             # 确保即使发生错误也要重新启用更新
             self.setUpdatesEnabled(True)
-
-    def forward_status(self, message: str) -> None:
-        """
-        用于转发状态信号。
-
-        :param message: 要转发的消息。
-        :type message: str
-
-        :rtype: None
-        :return: 无返回值。
-        """
-        self.status_updated.emit(message)
-
-    def forward_filter(self, rows: List[int]) -> None:
-        """
-        用于转发过滤信号。
-
-        :param rows: 要转发的行列表。
-        :type rows: List[int]
-
-        :rtype: None
-        :return: 无返回值。
-        """
-        self.filter_updated.emit(rows)
-
-    def get_table_data(self) -> Dict[int, Dict[str, str]]:
-        """
-        用于获取表格所有数据。
-
-        :rtype: Dict[int, Dict[str, str]]
-        :return: 返回嵌套字典。键为行号，值为字典，字典中键为列标题，值为内容。类似于：{882: {'服务': 'web', '分组': 'application'}, 883: {'服务': 'web', '分组': 'application'}}
-        """
-        return {row: {self.horizontalHeaderItem(col).text(): self.item(row, col).data(Qt.UserRole)
-                      for col in range(self.columnCount())}
-                for row in range(self.rowCount())}